@@ -0,0 +1,14 @@
+"""ML GeNN benchmarks
+
+Run end-to-end benchmarks of conversion, compilation and evaluation with:
+
+    python -m benchmarks.run --output results.json
+
+and microbenchmarks of individual synapse classes with:
+
+    python -m benchmarks.synapses --output synapse_results.json
+
+and the time taken to import ML GeNN with:
+
+    python -m benchmarks.import_time --output import_time_results.json
+"""
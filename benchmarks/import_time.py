@@ -0,0 +1,83 @@
+"""Benchmark the time taken to import ML GeNN
+
+Each repeat imports ML GeNN in a fresh interpreter and measures how long the
+import takes and which heavy optional dependencies it pulled in. If
+--max-time is specified, the benchmark fails if the median import time
+exceeds it so it can guard against import-time regressions.
+
+Example:
+    python -m benchmarks.import_time --repeats 10 --max-time 2.0 \\
+        --output import_time_results.json
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import numpy as np
+from argparse import ArgumentParser
+from datetime import datetime
+
+# Modules which should only be imported when they are used
+LAZY_MODULES = ['tensorflow', 'matplotlib', 'tqdm']
+
+IMPORT_SCRIPT = '''
+import json, sys
+from time import perf_counter
+start = perf_counter()
+import {module}
+import_time = perf_counter() - start
+from ml_genn.layers.model_registry import _models
+print(json.dumps({{
+    'import_time': import_time,
+    'lazy_modules_imported': [m for m in {lazy_modules!r} if m in sys.modules],
+    'genn_models_created': sorted(n for n, m in _models.items() if m._model is not None),
+}}))
+'''
+
+
+def measure_import(module):
+    """Import module in a fresh interpreter and return dictionary of results"""
+
+    script = IMPORT_SCRIPT.format(module=module, lazy_modules=LAZY_MODULES)
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark ML GeNN import time')
+    parser.add_argument('--module', default='ml_genn')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-time', type=float, default=None)
+    parser.add_argument('--output', default='import_time_results.json')
+    args = parser.parse_args()
+
+    results = [measure_import(args.module) for _ in range(args.repeats)]
+    import_times = [r['import_time'] for r in results]
+    median_time = float(np.median(import_times))
+    print('import {}: median {:.3f}s, min {:.3f}s'.format(
+        args.module, median_time, min(import_times)))
+    print('\tlazy modules imported: {}'.format(results[-1]['lazy_modules_imported']))
+    print('\tGeNN models created: {}'.format(results[-1]['genn_models_created']))
+
+    # Write results with enough metadata to compare runs
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'platform': platform.platform(),
+            'python_version': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'arguments': {k: v for k, v in vars(args).items()},
+            'median_import_time': median_time,
+            'results': results,
+        }, f, indent=4)
+
+    if args.max_time is not None and median_time > args.max_time:
+        sys.exit('median import time {:.3f}s exceeds maximum {:.3f}s'.format(
+            median_time, args.max_time))
+
+
+if __name__ == '__main__':
+    main()
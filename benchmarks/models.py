@@ -0,0 +1,101 @@
+"""Synthetic Keras models for benchmarking
+
+Each function returns an untrained TensorFlow model with randomly initialised
+weights, together with the shape of its input and its number of classes.
+"""
+
+from tensorflow.keras import models, layers
+
+
+def dense_mlp(name='dense_mlp'):
+    """Small fully-connected MLP"""
+
+    input_shape = (784,)
+    tf_model = models.Sequential([
+        layers.Dense(256, activation='relu', use_bias=False, input_shape=input_shape),
+        layers.Dense(128, activation='relu', use_bias=False),
+        layers.Dense(10, activation='relu', use_bias=False),
+    ], name=name)
+    return tf_model, input_shape, 10
+
+
+def simple_cnn(name='simple_cnn'):
+    """Topology of examples/simple_cnn.py"""
+
+    input_shape = (28, 28, 1)
+    tf_model = models.Sequential([
+        layers.Conv2D(16, 5, padding='valid', activation='relu', use_bias=False, input_shape=input_shape),
+        layers.AveragePooling2D(2),
+        layers.Conv2D(8, 5, padding='valid', activation='relu', use_bias=False),
+        layers.AveragePooling2D(2),
+        layers.Flatten(),
+        layers.Dense(128, activation='relu', use_bias=False),
+        layers.Dense(64, activation='relu', use_bias=False),
+        layers.Dense(10, activation='relu', use_bias=False),
+    ], name=name)
+    return tf_model, input_shape, 10
+
+
+def vgg(name='vgg'):
+    """VGG-style stack of 3x3 convolutions on 32x32 RGB input"""
+
+    input_shape = (32, 32, 3)
+    tf_model = models.Sequential([
+        layers.Conv2D(64, 3, padding='same', activation='relu', use_bias=False, input_shape=input_shape),
+        layers.Conv2D(64, 3, padding='same', activation='relu', use_bias=False),
+        layers.AveragePooling2D(2),
+
+        layers.Conv2D(128, 3, padding='same', activation='relu', use_bias=False),
+        layers.Conv2D(128, 3, padding='same', activation='relu', use_bias=False),
+        layers.AveragePooling2D(2),
+
+        layers.Conv2D(256, 3, padding='same', activation='relu', use_bias=False),
+        layers.Conv2D(256, 3, padding='same', activation='relu', use_bias=False),
+        layers.Conv2D(256, 3, padding='same', activation='relu', use_bias=False),
+        layers.AveragePooling2D(2),
+
+        layers.Flatten(),
+        layers.Dense(512, activation='relu', use_bias=False),
+        layers.Dense(10, activation='relu', use_bias=False),
+    ], name=name)
+    return tf_model, input_shape, 10
+
+
+def pool_dense(name='pool_dense'):
+    """Convolution followed by pooled dense layers"""
+
+    input_shape = (28, 28, 1)
+    tf_model = models.Sequential([
+        layers.Conv2D(32, 3, padding='same', activation='relu', use_bias=False, input_shape=input_shape),
+        layers.AveragePooling2D(2),
+        layers.Flatten(),
+        layers.Dense(128, activation='relu', use_bias=False),
+        layers.Dense(10, activation='relu', use_bias=False),
+    ], name=name)
+    return tf_model, input_shape, 10
+
+
+def pool_conv(name='pool_conv'):
+    """Stack of pooled convolutions"""
+
+    input_shape = (32, 32, 3)
+    tf_model = models.Sequential([
+        layers.Conv2D(32, 3, padding='same', activation='relu', use_bias=False, input_shape=input_shape),
+        layers.AveragePooling2D(2),
+        layers.Conv2D(64, 3, padding='same', activation='relu', use_bias=False),
+        layers.AveragePooling2D(2),
+        layers.Conv2D(64, 3, padding='same', activation='relu', use_bias=False),
+        layers.GlobalAveragePooling2D(),
+        layers.Dense(10, activation='relu', use_bias=False),
+    ], name=name)
+    return tf_model, input_shape, 10
+
+
+# Benchmark models in order of increasing size
+MODELS = {
+    'dense_mlp': dense_mlp,
+    'pool_dense': pool_dense,
+    'simple_cnn': simple_cnn,
+    'pool_conv': pool_conv,
+    'vgg': vgg,
+}
@@ -0,0 +1,145 @@
+"""Benchmark conversion, compilation and evaluation of ML GeNN models
+
+For every combination of model, converter, connectivity type and batch size,
+this measures the time taken to convert the Keras model (including any
+converter pre- and post-compilation work such as SpikeNorm threshold
+calibration), to build and to load the GeNN model, and the throughput of
+Model.evaluate. With --prefetch, the throughput of Model.evaluate when
+prefetching batches on a background thread is also measured. Results are
+written as JSON so runs can be compared over time.
+
+Example:
+    python -m benchmarks.run --models dense_mlp simple_cnn --batch-sizes 1 32 \\
+        --output results.json
+"""
+
+import json
+import os
+import platform
+import numpy as np
+import tensorflow as tf
+from argparse import ArgumentParser
+from datetime import datetime
+from itertools import product
+from time import perf_counter
+
+from ml_genn import Model
+from ml_genn.converters import ConverterType, DataNorm, FewSpike, Simple, SpikeNorm
+from ml_genn.layers import ConnectivityType
+
+from benchmarks.models import MODELS
+
+
+def build_converter(converter, x_norm, input_type, K, norm_time):
+    if converter == 'few-spike':
+        return FewSpike(K=K, norm_data=[x_norm])
+    elif converter == 'data-norm':
+        return DataNorm(norm_data=[x_norm], input_type=input_type)
+    elif converter == 'spike-norm':
+        return SpikeNorm(norm_data=[x_norm], norm_time=norm_time, input_type=input_type)
+    else:
+        return Simple(input_type=input_type)
+
+
+def run_benchmark(model, converter, connectivity_type, batch_size, args):
+    """Benchmark a single configuration and return dictionary of results"""
+
+    rng = np.random.default_rng(args.seed)
+
+    # Create model with random weights and random data
+    name = '{}_{}_{}_{}'.format(model, converter, connectivity_type, batch_size).replace('-', '_')
+    tf.random.set_seed(args.seed)
+    tf_model, input_shape, n_classes = MODELS[model](name=name)
+    x = rng.uniform(size=(args.n_samples,) + input_shape).astype(np.float32)
+    y = rng.integers(n_classes, size=args.n_samples)
+    x_norm = x[:args.n_norm_samples]
+
+    # Convert, build and load model
+    # **NOTE** build and load times are recorded by Model.compile
+    convert_start = perf_counter()
+    mlg_model = Model.convert_tf_model(
+        tf_model, converter=build_converter(converter, x_norm, args.input_type,
+                                            args.K, args.norm_time),
+        connectivity_type=connectivity_type, dt=args.dt, batch_size=batch_size,
+        rng_seed=args.seed, backend=args.backend)
+    convert_time = perf_counter() - convert_start
+
+    # Evaluate
+    time = args.K * args.dt if converter == 'few-spike' else args.time
+    eval_start = perf_counter()
+    mlg_model.evaluate([x], [y], time)
+    eval_time = perf_counter() - eval_start
+
+    # Evaluate again, prefetching batches
+    prefetch_results = {}
+    if args.prefetch:
+        eval_start = perf_counter()
+        mlg_model.evaluate([x], [y], time, prefetch=True)
+        prefetch_eval_time = perf_counter() - eval_start
+        prefetch_results = {'prefetch_eval_time': prefetch_eval_time,
+                            'prefetch_samples_per_second': args.n_samples / prefetch_eval_time}
+
+    return dict({
+        'model': model,
+        'converter': converter,
+        'connectivity_type': connectivity_type,
+        'batch_size': batch_size,
+        'n_samples': args.n_samples,
+        'presentation_time': time,
+        'convert_time': convert_time - mlg_model.build_time - mlg_model.load_time,
+        'build_time': mlg_model.build_time,
+        'load_time': mlg_model.load_time,
+        'eval_time': eval_time,
+        'samples_per_second': args.n_samples / eval_time,
+    }, **prefetch_results)
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark ML GeNN models')
+    parser.add_argument('--models', nargs='+', default=list(MODELS.keys()),
+                        choices=list(MODELS.keys()))
+    parser.add_argument('--converters', nargs='+', default=[c.value for c in ConverterType],
+                        choices=[c.value for c in ConverterType])
+    parser.add_argument('--connectivity-types', nargs='+', default=['procedural'],
+                        choices=[c.value for c in ConnectivityType])
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 32])
+    parser.add_argument('--backend', default='SingleThreadedCPU')
+    parser.add_argument('--input-type', default='poisson')
+    parser.add_argument('--n-samples', type=int, default=256)
+    parser.add_argument('--n-norm-samples', type=int, default=64)
+    parser.add_argument('--dt', type=float, default=1.0)
+    parser.add_argument('--time', type=float, default=100.0)
+    parser.add_argument('--norm-time', type=float, default=100.0)
+    parser.add_argument('--K', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--prefetch', action='store_true')
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    results = []
+    for config in product(args.models, args.converters,
+                          args.connectivity_types, args.batch_sizes):
+        print('benchmarking model: {}, converter: {}, connectivity: {}, batch size: {}'.format(*config))
+        result = run_benchmark(*config, args)
+        print('\tconvert: {:.2f}s, build: {:.2f}s, load: {:.2f}s, {:.1f} samples/s'.format(
+            result['convert_time'], result['build_time'], result['load_time'],
+            result['samples_per_second']))
+        if args.prefetch:
+            print('\tprefetch: {:.1f} samples/s'.format(result['prefetch_samples_per_second']))
+        results.append(result)
+
+    # Write results with enough metadata to compare runs
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'platform': platform.platform(),
+            'python_version': platform.python_version(),
+            'tensorflow_version': tf.__version__,
+            'cpu_count': os.cpu_count(),
+            'arguments': {k: v for k, v in vars(args).items()},
+            'results': results,
+        }, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Microbenchmarks of ML GeNN synapse classes
+
+Each benchmark builds a model containing a single population of synapses
+between a spike input layer and an IF layer, compiled with kernel profiling
+on the CPU backend. Input spikes are emitted every timestep by a random
+fraction of input neurons set by the input sparsity. For every synapse class,
+kernel size, stride, padding, connectivity type and input sparsity this
+records connectivity initialisation time, presynaptic update time per
+timestep and the memory allocated by loading the model. Results are written
+as JSON so runs can be compared over time.
+
+Example:
+    python -m benchmarks.synapses --synapses conv2d avepool2d_dense \\
+        --output synapse_results.json
+"""
+
+import json
+import os
+import platform
+import numpy as np
+from argparse import ArgumentParser
+from datetime import datetime
+from itertools import product
+
+from ml_genn import Model
+from ml_genn.layers import ConnectivityType, InputLayer, Layer
+from ml_genn.layers import IFNeurons, SpikeInputNeurons
+from ml_genn.layers import (AvePool2DConv2DSynapses, AvePool2DDenseSynapses,
+                            Conv2DSynapses, DenseSynapses)
+
+
+def _get_rss():
+    """Get resident set size (bytes) of this process (Linux only)"""
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def dense_configs(args):
+    for units in args.units:
+        yield {'input_shape': (args.input_size, args.input_size, args.channels),
+               'units': units, 'connectivity_type': 'dense'}
+
+
+def conv2d_configs(args):
+    for kernel, stride, padding, connectivity in product(
+            args.kernel_sizes, args.strides, args.paddings, args.connectivity_types):
+        yield {'input_shape': (args.input_size, args.input_size, args.channels),
+               'filters': args.filters, 'conv_size': kernel, 'conv_strides': stride,
+               'conv_padding': padding, 'connectivity_type': connectivity}
+
+
+def avepool2d_dense_configs(args):
+    for pool, units, connectivity in product(
+            args.pool_sizes, args.units, args.connectivity_types):
+        yield {'input_shape': (args.input_size, args.input_size, args.channels),
+               'pool_size': pool, 'units': units, 'connectivity_type': connectivity}
+
+
+def avepool2d_conv2d_configs(args):
+    for pool, kernel, stride, padding, connectivity in product(
+            args.pool_sizes, args.kernel_sizes, args.strides, args.paddings,
+            args.connectivity_types):
+        yield {'input_shape': (args.input_size, args.input_size, args.channels),
+               'filters': args.filters, 'pool_size': pool, 'conv_size': kernel,
+               'conv_strides': stride, 'conv_padding': padding,
+               'connectivity_type': connectivity}
+
+
+def create_synapses(synapses, config):
+    if synapses == 'dense':
+        return DenseSynapses(config['units'])
+    elif synapses == 'conv2d':
+        return Conv2DSynapses(config['filters'], config['conv_size'],
+                              config['conv_strides'], config['conv_padding'],
+                              config['connectivity_type'])
+    elif synapses == 'avepool2d_dense':
+        return AvePool2DDenseSynapses(config['units'], config['pool_size'],
+                                      connectivity_type=config['connectivity_type'])
+    elif synapses == 'avepool2d_conv2d':
+        return AvePool2DConv2DSynapses(config['filters'], config['pool_size'],
+                                       config['conv_size'], conv_strides=config['conv_strides'],
+                                       conv_padding=config['conv_padding'],
+                                       connectivity_type=config['connectivity_type'])
+
+
+# Synapse classes and functions generating the configurations to benchmark them with
+SYNAPSES = {
+    'dense': dense_configs,
+    'conv2d': conv2d_configs,
+    'avepool2d_dense': avepool2d_dense_configs,
+    'avepool2d_conv2d': avepool2d_conv2d_configs,
+}
+
+
+def run_benchmark(synapses, config, sparsities, index, args):
+    """Build and load a single-population model and benchmark it at each input sparsity"""
+
+    rng = np.random.default_rng(args.seed)
+
+    # Create single-population model
+    input_layer = InputLayer('input', config['input_shape'], neurons=SpikeInputNeurons())
+    output_layer = Layer('output', neurons=IFNeurons(threshold=np.inf))
+    syn = create_synapses(synapses, config)
+    output_layer.connect([input_layer], [syn])
+    syn.set_weights(rng.uniform(-1.0, 1.0, size=syn.weights.shape))
+    mlg_model = Model([input_layer], [output_layer],
+                      name='synapse_benchmark_{}_{}'.format(synapses, index))
+
+    # Build and load, measuring memory allocated by loading
+    rss_start = _get_rss()
+    mlg_model.compile(batch_size=1, rng_seed=args.seed, kernel_profiling=True,
+                      backend=args.backend)
+    rss_end = _get_rss()
+
+    kernel_times = mlg_model.get_kernel_times()
+    result = {
+        'synapses': synapses,
+        'config': config,
+        'build_time': mlg_model.build_time,
+        'load_time': mlg_model.load_time,
+        'init_time': kernel_times['init_time'],
+        'init_sparse_time': kernel_times['init_sparse_time'],
+        'load_memory': (None if rss_start is None or rss_end is None
+                        else rss_end - rss_start),
+        'presynaptic_update_time': {},
+    }
+
+    # Measure presynaptic update time at each input sparsity
+    for sparsity in sparsities:
+        x = (rng.uniform(size=(1,) + config['input_shape']) < sparsity).astype(np.float32)
+        mlg_model.reset()
+        mlg_model.set_input_batch([x])
+
+        start_time = mlg_model.get_kernel_times()['presynaptic_update_time']
+        mlg_model.step_time(args.n_timesteps)
+        end_time = mlg_model.get_kernel_times()['presynaptic_update_time']
+        result['presynaptic_update_time'][str(sparsity)] = (end_time - start_time) / args.n_timesteps
+
+    return result
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark ML GeNN synapse classes')
+    parser.add_argument('--synapses', nargs='+', default=list(SYNAPSES.keys()),
+                        choices=list(SYNAPSES.keys()))
+    parser.add_argument('--connectivity-types', nargs='+', default=[c.value for c in ConnectivityType],
+                        choices=[c.value for c in ConnectivityType])
+    parser.add_argument('--kernel-sizes', nargs='+', type=int, default=[3, 5])
+    parser.add_argument('--strides', nargs='+', type=int, default=[1, 2])
+    parser.add_argument('--paddings', nargs='+', default=['valid', 'same'])
+    parser.add_argument('--pool-sizes', nargs='+', type=int, default=[2])
+    parser.add_argument('--sparsities', nargs='+', type=float, default=[0.01, 0.1, 0.5])
+    parser.add_argument('--input-size', type=int, default=32)
+    parser.add_argument('--channels', type=int, default=16)
+    parser.add_argument('--filters', type=int, default=32)
+    parser.add_argument('--units', nargs='+', type=int, default=[128])
+    parser.add_argument('--n-timesteps', type=int, default=100)
+    parser.add_argument('--backend', default='SingleThreadedCPU')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='synapse_benchmark_results.json')
+    args = parser.parse_args()
+
+    results = []
+    for synapses in args.synapses:
+        for i, config in enumerate(SYNAPSES[synapses](args)):
+            print('benchmarking {} synapses: {}'.format(synapses, config))
+            result = run_benchmark(synapses, config, args.sparsities, i, args)
+            print('\tinit sparse: {:.4f}s, presynaptic update: {}'.format(
+                result['init_sparse_time'], result['presynaptic_update_time']))
+            results.append(result)
+
+    # Write results with enough metadata to compare runs
+    with open(args.output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'platform': platform.platform(),
+            'python_version': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'arguments': {k: v for k, v in vars(args).items()},
+            'results': results,
+        }, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
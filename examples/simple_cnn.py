@@ -49,12 +49,13 @@ if __name__ == '__main__':
     converter = args.build_converter(x_norm, K=8, norm_time=500)
 
     # Convert and compile ML GeNN model
+    time = 8 if args.converter == 'few-spike' else 500
     mlg_model = Model.convert_tf_model(
         tf_model, converter=converter, connectivity_type=args.connectivity_type,
         dt=args.dt, batch_size=args.batch_size, rng_seed=args.rng_seed, 
-        kernel_profiling=args.kernel_profiling)
+        kernel_profiling=args.kernel_profiling,
+        spike_recording_time=time if args.save_samples else None)
 
-    time = 8 if args.converter == 'few-spike' else 500
     mlg_eval_start_time = perf_counter()
     acc, spk_i, spk_t = mlg_model.evaluate([x_test], [y_test], time, save_samples=args.save_samples)
     print("MLG evaluation:%f" % (perf_counter() - mlg_eval_start_time))
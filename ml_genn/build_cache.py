@@ -0,0 +1,198 @@
+"""ML GeNN build cache
+
+This module provides the ``BuildCache`` class which stores built GeNN models
+in a cache directory, keyed by a hash of everything which affects the code
+GeNN generates, so models with the same architecture only have to be built
+once. Least recently used builds are evicted when the cache is full.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from ml_genn.describe import describe_object, describe_value
+
+# Increment if anything about how keys are calculated changes
+CACHE_FORMAT_VERSION = 1
+
+# Attributes of neurons and synapses which don't affect generated code
+# **NOTE** thresholds and gating are extra global parameters and weights
+# are variables or variable initialisation extra global parameters
+_RUNTIME_ATTRIBUTES = {'threshold', 'active', 'weights'}
+
+_source_hash = None
+
+
+def _get_source_hash():
+    """Get hash of ML GeNN source code so library changes invalidate the cache"""
+
+    global _source_hash
+    if _source_hash is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        source_hash = hashlib.sha256()
+        for root, dirs, files in os.walk(package_dir):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith('.py'):
+                    with open(os.path.join(root, f), 'rb') as source:
+                        source_hash.update(f.encode('utf-8'))
+                        source_hash.update(source.read())
+        _source_hash = source_hash.hexdigest()
+    return _source_hash
+
+
+def _get_pygenn_version():
+    try:
+        from importlib.metadata import version
+        return version('pygenn')
+    except Exception:
+        return None
+
+
+def calc_build_key(mlg_model, precision, compile_kwargs):
+    """Calculate hash of everything affecting the code GeNN generates for a model
+
+    Args:
+    mlg_model       --  ML GeNN model whose layers have been compiled
+    precision       --  GeNN model precision
+    compile_kwargs  --  dictionary of arguments passed to Model.compile
+
+    Returns:
+    hexadecimal key string
+    """
+
+    graph = []
+    for layer in mlg_model.layers:
+        graph.append({
+            'name': layer.name,
+            'class': type(layer).__name__,
+            'shape': describe_value(layer.shape),
+            'output': layer in mlg_model.outputs,
+            'neurons': describe_object(layer.neurons, _RUNTIME_ATTRIBUTES),
+            'upstream_synapses': [dict(describe_object(s, _RUNTIME_ATTRIBUTES),
+                                       source=s.source().name)
+                                  for s in layer.upstream_synapses]})
+
+    # Spike recording buffers are sized when model is loaded so
+    # only whether recording is enabled affects generated code
+    kwargs = dict(compile_kwargs)
+    kwargs['spike_recording_time'] = kwargs['spike_recording_time'] is not None
+
+    description = {
+        'format': CACHE_FORMAT_VERSION,
+        'source': _get_source_hash(),
+        'pygenn': _get_pygenn_version(),
+        'name': mlg_model.name,
+        'precision': precision,
+        'compile_kwargs': {k: (describe_value(v) if describe_value(v) is not None else repr(v))
+                           for k, v in sorted(kwargs.items())},
+        'graph': graph}
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class BuildCache(object):
+    """Directory of built GeNN models with least recently used eviction"""
+
+    def __init__(self, path, max_entries=16, min_evict_age=600.0):
+        """Open (and create if required) a build cache
+
+        Args:
+        path           --  cache directory
+
+        Keyword args:
+        max_entries    --  maximum number of builds to keep (default: 16)
+        min_evict_age  --  time (seconds) since a build was last used before it can
+                           be evicted, so builds other processes are about to load
+                           are never removed (default: 600.0)
+        """
+
+        self.path = path
+        self.max_entries = max_entries
+        self.min_evict_age = min_evict_age
+        os.makedirs(path, exist_ok=True)
+
+    def get_entry_path(self, key):
+        """Get directory a build is stored in"""
+
+        return os.path.join(self.path, key)
+
+    def contains(self, key):
+        """Does cache contain a complete build"""
+
+        return os.path.isfile(os.path.join(self.get_entry_path(key), 'complete'))
+
+    def build(self, key, g_model):
+        """Build GeNN model into cache if it isn't already present
+
+        Args:
+        key      --  key calculated with calc_build_key
+        g_model  --  GeNN model to build
+
+        Returns:
+        directory model was built in, to pass to GeNNModel.load
+        """
+
+        entry_path = self.get_entry_path(key)
+        try:
+            # Mark entry as most recently used, protecting it from eviction while it is loaded
+            os.utime(os.path.join(entry_path, 'complete'))
+            return entry_path
+        except OSError:
+            pass
+
+        # Build in temporary directory and move into place when complete
+        # so other processes never load a partial build
+        build_path = tempfile.mkdtemp(prefix='.build_', dir=self.path)
+        try:
+            g_model.build(path_to_model=build_path)
+            open(os.path.join(build_path, 'complete'), 'w').close()
+        except BaseException:
+            shutil.rmtree(build_path, ignore_errors=True)
+            raise
+
+        try:
+            os.rename(build_path, entry_path)
+        except OSError:
+            # Another process completed the same build first so
+            # keep its entry, which it may already be loading
+            shutil.rmtree(build_path, ignore_errors=True)
+            if not self.contains(key):
+                raise
+
+        self.evict(keep=key)
+        return entry_path
+
+    def evict(self, keep=None):
+        """Remove least recently used builds until cache is no larger than max_entries
+
+        Builds used within the last min_evict_age seconds are never removed.
+        """
+
+        entries = []
+        for key in os.listdir(self.path):
+            if key != keep:
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.get_entry_path(key),
+                                                                  'complete')), key))
+                except OSError:
+                    pass
+
+        # Keep newest entries (including the one to keep)
+        entries.sort(reverse=True)
+        now = time.time()
+        for mtime, key in entries[max(self.max_entries - (keep is not None), 0):]:
+            if (now - mtime) < self.min_evict_age:
+                continue
+
+            # Move entry out of place before removing it so a partially
+            # removed entry is never mistaken for a complete build
+            evict_path = tempfile.mkdtemp(prefix='.evict_', dir=self.path)
+            try:
+                os.rename(self.get_entry_path(key), os.path.join(evict_path, key))
+            except OSError:
+                # Another process evicted entry first
+                pass
+            shutil.rmtree(evict_path, ignore_errors=True)
@@ -0,0 +1,226 @@
+"""ML GeNN evaluation callbacks
+
+This module provides the ``Callback`` base class, whose methods are called by
+``Model.evaluate`` at points during evaluation, the ``TimingCallback`` class
+which records how long each host-side phase of evaluation takes and the
+``KernelTimingCallback`` class which records a timeline of GeNN kernel times.
+"""
+
+import json
+import numpy as np
+from time import perf_counter
+
+# Host-side phases of evaluating each batch, timed by Model.evaluate
+PHASES = ['input', 'simulation', 'readout', 'spikes', 'accuracy']
+
+
+class Callback(object):
+    """Base class for evaluation callbacks
+
+    Subclasses override any of the following methods. on_step is only called
+    if uses_on_step returns True (by default, if on_step is overridden) as
+    calling it forces the model to be stepped one timestep at a time.
+    """
+
+    def uses_on_step(self):
+        """Whether on_step should be called after each timestep"""
+
+        return type(self).on_step is not Callback.on_step
+
+    def set_model(self, mlg_model):
+        """Called before evaluation starts with the model being evaluated"""
+
+        self.mlg_model = mlg_model
+
+    def on_batch_begin(self, batch, logs):
+        """Called before a batch is simulated
+
+        Args:
+        batch  --  index of batch
+        logs   --  dictionary containing batch_n, the number of samples in batch
+                   (0 for batches only simulated to flush the pipeline)
+        """
+
+        pass
+
+    def on_batch_end(self, batch, logs):
+        """Called after a batch has been simulated and its results read out
+
+        Args:
+        batch  --  index of batch
+        logs   --  dictionary containing batch_n, timesteps (number of timesteps batch
+                   was simulated for), accuracy (running list of accuracies for each
+                   output layer) and the wall time (seconds) spent in each of the
+                   '<phase>_time' host-side phases: input, simulation, readout,
+                   spikes and accuracy
+        """
+
+        pass
+
+    def on_step(self, timestep):
+        """Called after each timestep is simulated"""
+
+        pass
+
+    def on_eval_end(self, logs):
+        """Called after evaluation ends
+
+        Args:
+        logs  --  dictionary containing accuracy (list of accuracies for each
+                  output layer) and mean_timesteps
+        """
+
+        pass
+
+
+class TimingCallback(Callback):
+    """Record wall time spent in each host-side phase of evaluating each batch"""
+
+    def __init__(self):
+        self.batch_times = {p: [] for p in PHASES}
+
+    def set_model(self, mlg_model):
+        super(TimingCallback, self).set_model(mlg_model)
+        self.batch_times = {p: [] for p in PHASES}
+
+    def on_batch_end(self, batch, logs):
+        for p in PHASES:
+            self.batch_times[p].append(logs[p + '_time'])
+
+    def get_batch_times(self):
+        """Get dictionary of arrays of time (seconds) spent in each phase of each batch"""
+
+        return {p: np.asarray(t) for p, t in self.batch_times.items()}
+
+    def get_total_times(self):
+        """Get dictionary of total time (seconds) spent in each phase"""
+
+        return {p: float(np.sum(t)) for p, t in self.batch_times.items()}
+
+    def summary(self):
+        """Print total and mean per-batch time spent in each phase"""
+
+        total_times = self.get_total_times()
+        total = sum(total_times.values())
+        n_batches = len(self.batch_times[PHASES[0]])
+        print('{:<12}{:>12}{:>16}{:>8}'.format('phase', 'total (s)', 'per batch (ms)', '%'))
+        for p in PHASES:
+            print('{:<12}{:>12.4f}{:>16.4f}{:>8.1f}'.format(
+                p, total_times[p], 1000.0 * total_times[p] / max(n_batches, 1),
+                100.0 * total_times[p] / total if total > 0.0 else 0.0))
+
+
+class KernelTimingCallback(Callback):
+    """Record a timeline of GeNN kernel times
+
+    The cumulative GeNN kernel timing counters are snapshotted at the start
+    and end of each batch and, optionally, every interval timesteps, and the
+    time spent in each kernel between snapshots is recorded. The model must
+    be compiled with kernel_profiling=True.
+    """
+
+    def __init__(self, interval=None):
+        """Create a kernel timing callback
+
+        Keyword args:
+        interval  --  number of timesteps between snapshots within each batch
+                      (default: None, meaning only snapshot at batch boundaries)
+        """
+
+        self.interval = interval
+        self.records = []
+
+    def uses_on_step(self):
+        return self.interval is not None
+
+    def set_model(self, mlg_model):
+        super(KernelTimingCallback, self).set_model(mlg_model)
+        if not mlg_model.g_model.timing_enabled:
+            raise RuntimeError('kernel timing requires model compiled with kernel_profiling=True')
+
+        self.kernels = list(mlg_model.get_kernel_times().keys())
+        self.records = []
+        self._batch = None
+        self._start_wall = None
+        self._start_timestep = 0
+        self._start_times = None
+
+    def on_batch_begin(self, batch, logs):
+        self._batch = batch
+        self._snapshot_start(0)
+
+    def on_step(self, timestep):
+        if (timestep % self.interval) == 0:
+            self._record(timestep)
+
+    def on_batch_end(self, batch, logs):
+        if logs['timesteps'] > self._start_timestep:
+            self._record(logs['timesteps'])
+
+    def get_table(self):
+        """Get timeline as a structured NumPy array
+
+        Each row contains the batch index, the first and last timestep within the
+        batch, the wall clock start and end time (seconds) and the time (seconds)
+        spent in each kernel between consecutive snapshots.
+        """
+
+        dtype = ([('batch', np.int64), ('start_timestep', np.int64),
+                  ('end_timestep', np.int64), ('start_wall', np.float64),
+                  ('end_wall', np.float64)]
+                 + [(k, np.float64) for k in self.kernels])
+        return np.array([tuple(r) for r in self.records], dtype=dtype)
+
+    def save_table(self, filename):
+        """Save timeline table as a .npy file"""
+
+        np.save(filename, self.get_table())
+
+    def get_chrome_trace(self):
+        """Get timeline in Chrome trace event format
+
+        Each interval between snapshots is shown on a 'host' track and the time
+        spent in each kernel during it on a track per kernel, starting at the wall
+        clock start of the interval. The resulting dictionary can be saved as JSON
+        and loaded in chrome://tracing or Perfetto.
+        """
+
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 0, 'tid': t,
+                   'args': {'name': n}}
+                  for t, n in enumerate(['host'] + self.kernels)]
+        origin = self.records[0][3] if self.records else 0.0
+        for batch, start_timestep, end_timestep, start_wall, end_wall, *times in self.records:
+            ts = (start_wall - origin) * 1E6
+            args = {'batch': int(batch), 'start_timestep': int(start_timestep),
+                    'end_timestep': int(end_timestep)}
+            events.append({'name': 'batch {}'.format(batch), 'ph': 'X', 'pid': 0,
+                           'tid': 0, 'ts': ts, 'dur': (end_wall - start_wall) * 1E6,
+                           'args': args})
+            for t, (kernel, time) in enumerate(zip(self.kernels, times)):
+                if time > 0.0:
+                    events.append({'name': kernel, 'ph': 'X', 'pid': 0, 'tid': t + 1,
+                                   'ts': ts, 'dur': time * 1E6, 'args': args})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save_chrome_trace(self, filename):
+        """Save timeline in Chrome trace event format as JSON"""
+
+        with open(filename, 'w') as f:
+            json.dump(self.get_chrome_trace(), f)
+
+    def _snapshot_start(self, timestep):
+        self._start_wall = perf_counter()
+        self._start_timestep = timestep
+        self._start_times = self.mlg_model.get_kernel_times()
+
+    def _record(self, timestep):
+        end_wall = perf_counter()
+        end_times = self.mlg_model.get_kernel_times()
+        self.records.append(
+            [self._batch, self._start_timestep, timestep, self._start_wall, end_wall]
+            + [end_times[k] - self._start_times[k] for k in self.kernels])
+
+        self._start_wall = end_wall
+        self._start_timestep = timestep
+        self._start_times = end_times
@@ -1,7 +1,8 @@
-import tensorflow as tf
 import numpy as np
 from collections import namedtuple
 
+from ml_genn.data import load_data
+from ml_genn.norm_cache import calc_norm_key, describe_keras_graph, get_norm_cache
 from ml_genn.layers import InputType
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
@@ -13,13 +14,22 @@ from ml_genn.layers import IFInputNeurons
 PreCompileOutput = namedtuple('PreCompileOutput', ['thresholds'])
 
 class DataNorm(object):
-    def __init__(self, norm_data, input_type=InputType.POISSON):
-        self.norm_data = norm_data
+    def __init__(self, norm_data=None, input_type=InputType.POISSON, max_activations=None,
+                 norm_chunk_size=256, norm_percentile=100.0, norm_cache_dir=None):
+        if norm_data is None and max_activations is None:
+            raise ValueError('either normalisation data or maximum activations must be provided')
+
+        self.norm_data = (None if norm_data is None
+                          else [load_data(x) for x in norm_data])
         self.input_type = InputType(input_type)
+        self.max_activations = max_activations
+        self.norm_chunk_size = norm_chunk_size
+        self.norm_percentile = norm_percentile
+        self.norm_cache_dir = norm_cache_dir
 
     def validate_tf_layer(self, tf_layer):
-        if tf_layer.activation != tf.keras.activations.relu:
-            raise NotImplementedError('{} activation not supported'.format(type(tf_layer.activation)))
+        if tf_layer.activation != 'relu':
+            raise NotImplementedError('{} activation not supported'.format(tf_layer.activation))
         if tf_layer.use_bias == True:
             raise NotImplementedError('bias tensors not supported')
 
@@ -36,22 +46,38 @@ class DataNorm(object):
             return IFInputNeurons()
 
     def create_neurons(self, tf_layer, pre_compile_output):
-        return IFNeurons(threshold=pre_compile_output.thresholds[tf_layer])
-
-    def pre_compile(self, tf_model):
-        # Get output functions for weighted layers.
-        idx = [i for i, layer in enumerate(tf_model.layers)
-               if len(layer.get_weights()) > 0]
-        weighted_layers = [tf_model.layers[i] for i in idx]
-        get_outputs = tf.keras.backend.function(
-            tf_model.inputs, [layer.output for layer in weighted_layers])
-
-        # Find the maximum activation in each layer, given input data.
-        max_activation = np.array([np.max(out) for out in get_outputs(self.norm_data)],
+        return IFNeurons(threshold=pre_compile_output.thresholds[tf_layer.name])
+
+    def pre_compile(self, graph):
+        weighted_layers = graph.get_weighted_layers()
+
+        # Find the maximum activation in each layer, given input data,
+        # unless maximum activations have been precomputed
+        # **NOTE** activations are calculated in chunks of norm data so
+        # only one chunk's activations are ever in memory at once
+        max_activations = self.max_activations
+        if max_activations is None:
+            # If a normalisation cache is configured, try and
+            # read maximum activations calculated previously
+            norm_cache = get_norm_cache(self.norm_cache_dir)
+            if norm_cache is not None:
+                key = calc_norm_key(
+                    'DataNorm', {'percentile': self.norm_percentile,
+                                 'graph': describe_keras_graph(graph)},
+                    [w for l in graph.layers for w in l.get_weights()], self.norm_data)
+                max_activations = norm_cache.get(key)
+
+            if max_activations is None:
+                max_activations = graph.get_max_activations(
+                    weighted_layers, self.norm_data, chunk_size=self.norm_chunk_size,
+                    percentile=self.norm_percentile)
+                if norm_cache is not None:
+                    norm_cache.put(key, 'DataNorm', {n: float(a) for n, a in max_activations.items()})
+        max_activation = np.array([max_activations[l.name] for l in weighted_layers],
                                   dtype=np.float64)
 
         # Find the maximum weight in each layer.
-        max_weights = np.array([np.max(w) for w in tf_model.get_weights()],
+        max_weights = np.array([np.max(l.get_weights()[0]) for l in weighted_layers],
                                dtype=np.float64)
 
         # Compute scale factors and normalize weights.
@@ -64,7 +90,7 @@ class DataNorm(object):
             print('layer <{}> threshold: {}'.format(layer.name, threshold))
 
         # Build dictionary of thresholds for each layer
-        thresholds = {layer: threshold for layer, threshold
+        thresholds = {layer.name: threshold for layer, threshold
                       in zip(weighted_layers, applied_factors)}
 
         return PreCompileOutput(thresholds=thresholds)
@@ -1,71 +1,145 @@
 import numpy as np
-import tensorflow as tf
 from collections import namedtuple
 
+from ml_genn.data import array_max, load_data
+from ml_genn.norm_cache import calc_norm_key, describe_keras_graph, get_norm_cache
 from ml_genn.layers import FSReluNeurons
 from ml_genn.layers import FSReluInputNeurons
 
 # Because we want the converter class to be reusable, we don't want the
 # normalisation data to be a member, instead we encapsulate it in a tuple
-PreCompileOutput = namedtuple('PreCompileOutput', ['max_activations', 'max_input'])
+PreCompileOutput = namedtuple('PreCompileOutput', ['max_activations', 'max_input',
+                                                   'alphas', 'input_alpha'])
 
 class FewSpike(object):
-    def __init__(self, K=10, alpha=25, signed_input=False, norm_data=None):
+    def __init__(self, K=10, alpha=25, signed_input=False, norm_data=None,
+                 max_activations=None, max_input=None, norm_chunk_size=256,
+                 norm_percentile=100.0, norm_cache_dir=None):
         self.K = K
         self.alpha = alpha
         self.signed_input = signed_input
-        self.norm_data = norm_data
+        self.norm_data = (None if norm_data is None
+                          else [load_data(x) for x in norm_data])
+        self.max_activations = max_activations
+        self.max_input = max_input
+        self.norm_chunk_size = norm_chunk_size
+        self.norm_percentile = norm_percentile
+        self.norm_cache_dir = norm_cache_dir
 
     def validate_tf_layer(self, tf_layer):
-        if tf_layer.activation != tf.keras.activations.relu:
-            raise NotImplementedError('{} activation not supported'.format(type(tf_layer.activation)))
+        if tf_layer.activation != 'relu':
+            raise NotImplementedError('{} activation not supported'.format(tf_layer.activation))
         if tf_layer.use_bias == True:
             raise NotImplementedError('bias tensors not supported')
 
     def create_input_neurons(self, pre_compile_output):
-        alpha = (self.alpha if pre_compile_output.max_input is None 
-                 else float(np.ceil(pre_compile_output.max_input)))
-        return FSReluInputNeurons(self.K, alpha, self.signed_input)
+        return FSReluInputNeurons(self.K, pre_compile_output.input_alpha,
+                                  self.signed_input)
 
     def create_neurons(self, tf_layer, pre_compile_output):
         # Lookup optimised alpha value for neuron
-        alpha = (float(np.ceil(pre_compile_output.max_activations[tf_layer]))
-                 if tf_layer in pre_compile_output.max_activations 
-                 else self.alpha)
-        return FSReluNeurons(self.K, alpha)
+        return FSReluNeurons(self.K, pre_compile_output.alphas[tf_layer.name])
     
-    def pre_compile(self, tf_model):
+    def pre_compile(self, graph):
+        # Use any precomputed maximum activations and input
+        max_activations = ({} if self.max_activations is None
+                           else dict(self.max_activations))
+        max_input = self.max_input
+
         # If any normalisation data was provided
         if self.norm_data is not None:
-            # Get weighted layers
-            weighted_layers = [l for l in tf_model.layers
-                               if len(l.get_weights()) > 0]
+            # Get weighted layers whose maximum activation isn't already known
+            weighted_layers = [l for l in graph.get_weighted_layers()
+                               if l.name not in max_activations]
 
-            # Get output functions for weighted layers.
-            get_outputs = tf.keras.backend.function(
-                tf_model.inputs, [l.output for l in weighted_layers])
+            # If a normalisation cache is configured, try and read
+            # statistics of normalisation data calculated previously
+            # **NOTE** K and alpha don't affect these statistics so aren't part of the key
+            norm_cache = get_norm_cache(self.norm_cache_dir)
+            norm_stats = None
+            if norm_cache is not None:
+                key = calc_norm_key(
+                    'FewSpike', {'percentile': self.norm_percentile,
+                                 'signed_input': self.signed_input,
+                                 'layers': [l.name for l in weighted_layers],
+                                 'max_input': max_input is None,
+                                 'graph': describe_keras_graph(graph)},
+                    [w for l in graph.layers for w in l.get_weights()], self.norm_data)
+                norm_stats = norm_cache.get(key)
 
-            # Get output given input data.
-            outputs = get_outputs(self.norm_data)
+            if norm_stats is None:
+                # Calculate maximum activation in each layer, streamed over chunks of input data
+                norm_stats = {'max_activations': {}, 'max_input': None}
+                if len(weighted_layers) > 0:
+                    norm_stats['max_activations'] = {
+                        n: float(a) for n, a in graph.get_max_activations(
+                            weighted_layers, self.norm_data, chunk_size=self.norm_chunk_size,
+                            percentile=self.norm_percentile).items()}
 
-            # Build dictionary of maximum activation in each layer
-            max_activations = {l: np.max(out)
-                               for l, out in zip(weighted_layers, outputs)}
+                # Use input data range to directly set maximum input
+                if max_input is None:
+                    norm_stats['max_input'] = float(max(array_max(x, absolute=self.signed_input)
+                                                    for x in self.norm_data))
 
-            # Use input data range to directly set maximum input
-            if self.signed_input:
-                max_input = np.amax(np.abs(self.norm_data))
-            else:
-                max_input = np.amax(self.norm_data)
+                if norm_cache is not None:
+                    norm_cache.put(key, 'FewSpike', norm_stats)
 
-            # Return results of normalisation in tuple
-            return PreCompileOutput(max_activations=max_activations,
-                                    max_input=max_input)
+            max_activations.update(norm_stats['max_activations'])
+            if max_input is None:
+                max_input = norm_stats['max_input']
+
+        # Return results of normalisation and resultant alphas in tuple
+        alphas = self._calc_alphas(graph, max_activations, max_input)
+        return PreCompileOutput(max_activations=max_activations,
+                                max_input=max_input, alphas=alphas,
+                                input_alpha=alphas[graph.inputs[0].name])
+
+    def _calc_alphas(self, graph, max_activations, max_input):
+        # Get optimised alpha value for each input and weighted layer
+        alphas = {l.name: (self.alpha if max_input is None
+                           else float(np.ceil(max_input)))
+                  for l in graph.inputs}
+        for l in graph.get_weighted_layers():
+            alphas[l.name] = (float(np.ceil(max_activations[l.name]))
+                              if l.name in max_activations else self.alpha)
+
+        # **NOTE** FS ReLU neurons decode all their input with the same alpha so
+        # layers which provide input to the same layer, for example through an
+        # Add layer, need the same alpha. Find groups of such layers (including
+        # indirectly, through layers shared between several targets)
+        groups = {n: n for n in alphas}
+        def find_group(n):
+            while groups[n] != n:
+                n = groups[n]
+            return n
+
+        for l in graph.get_weighted_layers():
+            sources = self._get_sources(graph, l, alphas)
+            for s in sources[1:]:
+                groups[find_group(s)] = find_group(sources[0])
+
+        # Use largest alpha in each group
+        group_alphas = {}
+        for n, a in alphas.items():
+            g = find_group(n)
+            group_alphas[g] = max(group_alphas.get(g, a), a)
+        return {n: group_alphas[find_group(n)] for n in alphas}
+
+    @staticmethod
+    def _get_sources(graph, layer, alphas):
+        # Find layers with neurons which provide input to layer,
+        # passing through layers without neurons e.g. Add and pooling
+        sources = []
+        pending = list(layer.inbound_names)
+        while len(pending) > 0:
+            name = pending.pop()
+            if name in alphas:
+                if name not in sources:
+                    sources.append(name)
+            else:
+                pending.extend(graph.get_layer(name).inbound_names)
+        return sources
 
-        # Otherwise, return empty normalisation output tuple
-        else:
-            return PreCompileOutput(max_activations={}, max_input=None)
-    
     def post_compile(self, mlg_model):
         # do not allow multiple input or output layers
         if len(mlg_model.inputs) > 1 or len(mlg_model.outputs) > 1:
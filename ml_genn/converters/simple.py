@@ -1,5 +1,3 @@
-import tensorflow as tf
-
 from ml_genn.layers import InputType
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
@@ -11,8 +9,8 @@ class Simple(object):
         self.input_type = InputType(input_type)
 
     def validate_tf_layer(self, tf_layer):
-        if tf_layer.activation != tf.keras.activations.relu:
-            raise NotImplementedError('{} activation not supported'.format(type(tf_layer.activation)))
+        if tf_layer.activation != 'relu':
+            raise NotImplementedError('{} activation not supported'.format(tf_layer.activation))
         if tf_layer.use_bias == True:
             raise NotImplementedError('bias tensors not supported')
 
@@ -31,7 +29,7 @@ class Simple(object):
     def create_neurons(self, tf_layer, pre_compile_output):
         return IFNeurons(threshold=1.0)
 
-    def pre_compile(self, tf_model):
+    def pre_compile(self, graph):
         pass
 
     def post_compile(self, mlg_model):
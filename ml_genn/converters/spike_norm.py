@@ -1,22 +1,28 @@
-import tensorflow as tf
+import os
+import tempfile
 import numpy as np
-from tqdm import tqdm
 
+from ml_genn.data import load_data
+from ml_genn.describe import describe_object, get_params
+from ml_genn.norm_cache import calc_norm_key, get_norm_cache
 from ml_genn.layers import InputType
+from ml_genn.layers import InputLayer
+from ml_genn.layers import Layer
 from ml_genn.layers import IFNeurons
 from ml_genn.layers import SpikeInputNeurons
 from ml_genn.layers import PoissonInputNeurons
 from ml_genn.layers import IFInputNeurons
 
 class SpikeNorm(object):
-    def __init__(self, norm_data, norm_time, input_type=InputType.POISSON):
-        self.norm_data = norm_data
+    def __init__(self, norm_data, norm_time, input_type=InputType.POISSON, norm_cache_dir=None):
+        self.norm_data = [load_data(x) for x in norm_data]
         self.norm_time = norm_time
         self.input_type = InputType(input_type)
+        self.norm_cache_dir = norm_cache_dir
 
     def validate_tf_layer(self, tf_layer):
-        if tf_layer.activation != tf.keras.activations.relu:
-            raise NotImplementedError('{} activation not supported'.format(type(tf_layer.activation)))
+        if tf_layer.activation != 'relu':
+            raise NotImplementedError('{} activation not supported'.format(tf_layer.activation))
         if tf_layer.use_bias == True:
             raise NotImplementedError('bias tensors not supported')
 
@@ -33,55 +39,156 @@ class SpikeNorm(object):
             return IFInputNeurons()
 
     def create_neurons(self, tf_layer, pre_compile_output):
+        # **NOTE** only the neurons of calibration models track their maximum
+        # input so the converted model runs inference with plain IF neurons
         return IFNeurons(threshold=1.0)
 
-    def pre_compile(self, tf_model):
+    def pre_compile(self, graph):
         pass
 
     def post_compile(self, mlg_model):
-        g_model = mlg_model.g_model
-        n_samples = self.norm_data[0].shape[0]
+        from tqdm import tqdm
 
-        # Set layer thresholds high initially
-        for layer in mlg_model.layers[1:]:
-            layer.neurons.set_threshold(np.inf)
-
-        # For each weighted layer
-        for layer in mlg_model.layers[1:]:
-            threshold = np.float64(0.0)
-
-            # For each sample presentation
-            progress = tqdm(total=n_samples)
-            for batch_start in range(0, n_samples, g_model.batch_size):
-                batch_end = min(batch_start + g_model.batch_size, n_samples)
-                batch_n = batch_end - batch_start
-                batch_data = [x[batch_start:batch_end]
-                              for x in self.norm_data]
-
-                # Set new input
-                mlg_model.reset()
-                mlg_model.set_input_batch(batch_data)
-
-                # Main simulation loop
-                while g_model.t < self.norm_time:
-                    # Step time
-                    mlg_model.step_time()
-
-                    # Get maximum activation
-                    nrn = layer.neurons.nrn
-                    nrn.pull_var_from_device('Vmem')
-                    if nrn.vars['Vmem'].view.ndim == 1:
-                        output_view = nrn.vars['Vmem'].view[np.newaxis]
-                    else:
-                        output_view = nrn.vars['Vmem'].view[:batch_n]
-                    threshold = np.max([threshold, output_view.max()])
-                    output_view[:] = np.float64(0.0)
-                    nrn.push_var_to_device('Vmem')
-
-                progress.update(batch_n)
-
-            progress.close()
-
-            # Update this layer's threshold
-            print('layer <{}> threshold: {}'.format(layer.name, threshold))
-            layer.neurons.set_threshold(threshold)
+        n_samples = self.norm_data[0].shape[0]
+        n_steps = mlg_model._get_num_timesteps(self.norm_time)
+        weighted_layers = [l for l in mlg_model.layers if len(l.upstream_synapses) > 0]
+
+        # If a normalisation cache is configured and thresholds
+        # have been calibrated previously, use them directly
+        norm_cache = get_norm_cache(self.norm_cache_dir)
+        if norm_cache is not None:
+            key = self._calc_norm_key(mlg_model)
+            thresholds = norm_cache.get(key)
+            if thresholds is not None:
+                for layer in weighted_layers:
+                    print('layer <{}> threshold: {} (cached)'.format(
+                        layer.name, thresholds[layer.name]))
+                    layer.neurons.set_threshold(thresholds[layer.name])
+                return
+
+        # Calibrate in a copy of the model whose neurons track their maximum
+        # input and can be gated off, compiled like the converted model but
+        # without recording spikes or readouts. Unless a build cache is configured (so later
+        # calibrations of the same architecture can reuse it), build it in a
+        # temporary directory which is removed once calibration is complete
+        calib_model, calib_layers = self._create_calibration_model(mlg_model)
+        compile_kwargs = dict(mlg_model._compile_kwargs, spike_recording_time=None,
+                              device_readout_time=None, kernel_profiling=False)
+        build_dir = None
+        if (compile_kwargs.get('build_cache_dir') is None
+                and os.environ.get('ML_GENN_BUILD_CACHE') is None):
+            build_dir = tempfile.TemporaryDirectory()
+            compile_kwargs['build_cache_dir'] = build_dir.name
+
+        try:
+            calib_model.compile(**compile_kwargs)
+            batch_size = calib_model.g_model.batch_size
+
+            # For each weighted layer
+            for layer in weighted_layers:
+                # Gate off all layers which don't provide input to this layer
+                # **NOTE** gated layers never spike so, as well as skipping their
+                # neuron updates, no synaptic input is propagated from them. This
+                # layer and those downstream of it have infinite thresholds so
+                # can't spike either, leaving only the prefix of the network active
+                upstream = self._get_upstream_layers(calib_layers[layer])
+                for l in calib_model.layers:
+                    if l not in calib_model.inputs:
+                        l.neurons.set_active(l in upstream)
+
+                # For each sample presentation
+                threshold = np.float64(0.0)
+                progress = tqdm(total=n_samples)
+                for batch_start in range(0, n_samples, batch_size):
+                    batch_end = min(batch_start + batch_size, n_samples)
+                    batch_n = batch_end - batch_start
+                    batch_data = [x[batch_start:batch_end] for x in self.norm_data]
+
+                    # Set new input
+                    calib_model.reset()
+                    calib_model.set_input_batch(batch_data)
+
+                    # Simulate batch and get maximum input of each neuron
+                    # **NOTE** maximum is tracked on device so timesteps can be stepped in bulk
+                    calib_model.step_time(n_steps)
+                    threshold = np.max([threshold, calib_layers[layer].neurons.get_max_input(
+                        batch_n).max()])
+
+                    progress.update(batch_n)
+
+                progress.close()
+
+                # Update this layer's threshold in converted and calibration model
+                print('layer <{}> threshold: {}'.format(layer.name, threshold))
+                layer.neurons.set_threshold(threshold)
+                calib_layers[layer].neurons.set_threshold(threshold)
+        finally:
+            if build_dir is not None:
+                if calib_model.g_model is not None and calib_model.g_model._loaded:
+                    calib_model.g_model.unload()
+                build_dir.cleanup()
+
+        if norm_cache is not None:
+            norm_cache.put(key, 'SpikeNorm', {l.name: float(l.neurons.threshold)
+                                              for l in weighted_layers})
+
+    @staticmethod
+    def _create_calibration_model(mlg_model):
+        """Create uncompiled copy of model for calibrating thresholds, whose
+        neurons track their maximum input and start with infinite thresholds
+
+        Returns:
+        calib_model   --  calibration model
+        calib_layers  --  dictionary mapping layers of mlg_model to their copies
+        """
+
+        from ml_genn.model import Model
+
+        # **NOTE** layers are topologically sorted so sources are always copied first
+        copies = {}
+        for l in mlg_model.layers:
+            if l in mlg_model.inputs:
+                copies[l] = InputLayer(l.name, l.shape,
+                                       neurons=type(l.neurons)(**get_params(l.neurons)))
+            else:
+                copies[l] = Layer(l.name, neurons=IFNeurons(threshold=np.inf,
+                                                            track_max_input=True))
+                synapses = [type(s)(**get_params(s)) for s in l.upstream_synapses]
+                copies[l].connect([copies[s.source()] for s in l.upstream_synapses], synapses)
+
+                # Share, rather than copy, weights
+                for s, syn in zip(l.upstream_synapses, synapses):
+                    syn.weights = s.weights
+
+        calib_model = Model([copies[l] for l in mlg_model.inputs],
+                            [copies[l] for l in mlg_model.outputs],
+                            name='{}_spike_norm'.format(mlg_model.name))
+        return calib_model, copies
+
+    def _calc_norm_key(self, mlg_model):
+        # **NOTE** thresholds depend on the model architecture and weights, the
+        # number of timesteps inputs are presented for, the timestep and input type.
+        # Thresholds are being calculated and weights are hashed separately
+        exclude = ('threshold', 'weights')
+        graph = [{'name': l.name, 'shape': list(l.shape),
+                  'neurons': describe_object(l.neurons, exclude),
+                  'upstream_synapses': [dict(describe_object(s, exclude), source=s.source().name)
+                                        for s in l.upstream_synapses]}
+                 for l in mlg_model.layers]
+        params = {'norm_time': self.norm_time, 'dt': mlg_model.g_model.dT,
+                  'input_type': self.input_type.value, 'graph': graph}
+        weights = [s.weights for l in mlg_model.layers for s in l.upstream_synapses]
+        return calc_norm_key('SpikeNorm', params, weights, self.norm_data)
+
+    @staticmethod
+    def _get_upstream_layers(layer):
+        # Find layer and all layers it (indirectly) receives input from
+        upstream = {layer}
+        pending = [layer]
+        while len(pending) > 0:
+            for syn in pending.pop().upstream_synapses:
+                source = syn.source()
+                if source not in upstream:
+                    upstream.add(source)
+                    pending.append(source)
+        return upstream
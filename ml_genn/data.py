@@ -0,0 +1,370 @@
+"""ML GeNN data helpers
+
+This module provides helper functions for feeding data to ML GeNN models
+batch by batch, so that datasets never have to be fully materialised.
+"""
+
+import os
+import numpy as np
+from glob import glob
+from queue import Queue
+from threading import Event, Thread
+
+
+def _to_array_list(x):
+    """Convert a single array-like or a list/tuple of array-likes into a list of NumPy arrays"""
+
+    if isinstance(x, (list, tuple)):
+        return [np.asarray(a) for a in x]
+    else:
+        return [np.asarray(x)]
+
+
+class ShardedArray(object):
+    """Read-only array backed by a directory of memory-mapped .npy shards
+
+    Shards are memory-mapped and concatenated along their first axis in
+    filename order. Slicing along the first axis only reads the shards
+    which overlap the slice, so datasets larger than RAM can be used.
+    """
+
+    def __init__(self, path):
+        """Map all .npy shards in a directory
+
+        Args:
+        path  --  directory containing .npy shards
+        """
+
+        filenames = sorted(glob(os.path.join(path, '*.npy')))
+        if len(filenames) == 0:
+            raise ValueError('no .npy shards found in {}'.format(path))
+
+        self.shards = [np.load(f, mmap_mode='r') for f in filenames]
+
+        # Check shards are compatible
+        if not all(s.shape[1:] == self.shards[0].shape[1:] for s in self.shards):
+            raise ValueError('shard shape mismatch in {}'.format(path))
+        if not all(s.dtype == self.shards[0].dtype for s in self.shards):
+            raise ValueError('shard dtype mismatch in {}'.format(path))
+
+        # Calculate index of first sample in each shard
+        self.offsets = np.cumsum([0] + [s.shape[0] for s in self.shards])
+        self.shape = (int(self.offsets[-1]),) + self.shards[0].shape[1:]
+        self.dtype = self.shards[0].dtype
+        self.ndim = len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.shape[0])
+            if step != 1:
+                raise NotImplementedError('strided slicing of sharded arrays not supported')
+
+            # Slice each overlapping shard
+            first = np.searchsorted(self.offsets, start, side='right') - 1
+            parts = []
+            for i in range(max(first, 0), len(self.shards)):
+                if self.offsets[i] >= stop:
+                    break
+                parts.append(self.shards[i][max(start - self.offsets[i], 0):
+                                            stop - self.offsets[i]])
+
+            # Avoid copying if slice lies within a single shard
+            if len(parts) == 1:
+                return parts[0]
+            elif len(parts) == 0:
+                return np.empty((0,) + self.shape[1:], dtype=self.dtype)
+            else:
+                return np.concatenate(parts)
+        elif isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += self.shape[0]
+            if key < 0 or key >= self.shape[0]:
+                raise IndexError('index {} out of range'.format(key))
+            i = np.searchsorted(self.offsets, key, side='right') - 1
+            return self.shards[i][key - self.offsets[i]]
+        else:
+            raise TypeError('sharded arrays only support integer and slice indexing')
+
+    def __array__(self, dtype=None):
+        array = np.concatenate(self.shards)
+        return array if dtype is None else array.astype(dtype)
+
+
+def load_data(data):
+    """Resolve data into an array-like without copying it into memory
+
+    Args:
+    data  --  array-like (including np.memmap), path to a .npy file which
+              will be memory-mapped or path to a directory of .npy shards
+
+    Returns:
+    array-like which supports slicing along the first axis
+    """
+
+    if isinstance(data, (str, os.PathLike)):
+        if os.path.isdir(data):
+            return ShardedArray(data)
+        elif str(data).endswith('.npy'):
+            return np.load(data, mmap_mode='r')
+        else:
+            raise ValueError('{} is not a .npy file or a directory of .npy shards'.format(data))
+    else:
+        return data
+
+
+def array_max(data, absolute=False, chunk_size=1024):
+    """Find the maximum value of an array-like, reading it in chunks
+
+    Args:
+    data        --  array-like which supports slicing along the first axis
+
+    Keyword args:
+    absolute    --  find the maximum absolute value (default: False)
+    chunk_size  --  number of samples to read at once (default: 1024)
+    """
+
+    max_value = None
+    for chunk_start in range(0, data.shape[0], chunk_size):
+        chunk = np.asarray(data[chunk_start:chunk_start + chunk_size])
+        chunk_max = np.amax(np.abs(chunk) if absolute else chunk)
+        max_value = chunk_max if max_value is None else max(max_value, chunk_max)
+    return max_value
+
+
+class QuantileSketch(object):
+    """Streaming, memory-bounded estimate of the distribution of non-negative values
+
+    Values are counted in logarithmically-spaced buckets so any quantile
+    can be estimated to within a fixed relative accuracy, using memory which
+    only depends on the range of values, not how many there are. Values of
+    zero or less (e.g. inactive ReLU units) are counted as zero. The exact
+    maximum is also tracked.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        """Create an empty sketch
+
+        Keyword args:
+        relative_accuracy  --  relative accuracy of quantile estimates (default: 0.01)
+        """
+
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self.count = 0
+        self.zero_count = 0
+        self.max = None
+        self.min_index = 0
+        self.bucket_counts = np.zeros(0, dtype=np.int64)
+
+    def update(self, values):
+        """Add an array of values to the sketch"""
+
+        values = np.asarray(values).ravel()
+        if values.size == 0:
+            return
+
+        values_max = np.amax(values)
+        self.max = values_max if self.max is None else max(self.max, values_max)
+        self.count += values.size
+
+        positive = values[values > 0.0].astype(np.float64)
+        self.zero_count += values.size - positive.size
+        if positive.size == 0:
+            return
+
+        # Calculate bucket index of each value
+        indices = np.ceil(np.log(positive) / np.log(self.gamma)).astype(np.int64)
+
+        # Grow buckets to cover new index range
+        num_buckets = len(self.bucket_counts)
+        min_index = (int(np.amin(indices)) if num_buckets == 0
+                     else min(int(np.amin(indices)), self.min_index))
+        max_index = (int(np.amax(indices)) if num_buckets == 0
+                     else max(int(np.amax(indices)), self.min_index + num_buckets - 1))
+        if min_index != self.min_index or max_index - min_index + 1 != num_buckets:
+            bucket_counts = np.zeros(max_index - min_index + 1, dtype=np.int64)
+            offset = self.min_index - min_index
+            bucket_counts[offset:offset + num_buckets] = self.bucket_counts
+            self.bucket_counts = bucket_counts
+            self.min_index = min_index
+
+        self.bucket_counts += np.bincount(indices - self.min_index,
+                                          minlength=len(self.bucket_counts))
+
+    def percentile(self, q):
+        """Estimate the q-th percentile (0-100) of the values added to the sketch"""
+
+        if self.count == 0:
+            raise ValueError('cannot calculate percentile of empty sketch')
+
+        # Return exact maximum rather than an estimate of it
+        if q >= 100.0:
+            return float(self.max)
+
+        rank = (q / 100.0) * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        # Find bucket containing rank and return its midpoint
+        cumulative_counts = self.zero_count + np.cumsum(self.bucket_counts)
+        bucket = np.searchsorted(cumulative_counts, rank, side='right')
+        value = 2.0 * self.gamma ** (self.min_index + bucket) / (self.gamma + 1.0)
+        return float(min(value, self.max))
+
+
+def array_batches(data, labels, batch_size):
+    """Iterate through arrays in (data_batch, label_batch) chunks
+
+    Args:
+    data        --  list of data arrays for each input layer
+    labels      --  list of label arrays for each output layer (or None)
+    batch_size  --  number of samples in each chunk
+    """
+
+    n_samples = data[0].shape[0]
+    for batch_start in range(0, n_samples, batch_size):
+        batch_end = min(batch_start + batch_size, n_samples)
+        batch_data = [x[batch_start:batch_end] for x in data]
+        batch_labels = (None if labels is None
+                        else [y[batch_start:batch_end] for y in labels])
+        yield batch_data, batch_labels
+
+
+def batch_dataset(dataset, batch_size):
+    """Re-chunk an iterable of (data_batch, label_batch) chunks into batches
+
+    Chunks may be of any size and are concatenated or split so that every
+    batch but the last contains exactly batch_size samples. Data and label
+    batches may either be a single array-like (for models with a single input
+    or output layer) or a list of array-likes. Chunks without labels can be
+    provided by setting label_batch to None. Any array-like which NumPy can
+    convert, including TensorFlow tensors, is supported so Python generators
+    and tf.data.Dataset objects can be passed directly.
+
+    Args:
+    dataset     --  iterable of (data_batch, label_batch) chunks
+    batch_size  --  number of samples in each batch
+
+    Returns:
+    iterator of (data_batch, label_batch) tuples, each a list of NumPy arrays
+    (label_batch is None if chunks have no labels)
+    """
+
+    pending = None
+    n_data = None
+    has_labels = None
+    for data_chunk, label_chunk in dataset:
+        arrays = _to_array_list(data_chunk)
+        if n_data is None:
+            n_data = len(arrays)
+            has_labels = label_chunk is not None
+        elif len(arrays) != n_data or (label_chunk is not None) != has_labels:
+            raise ValueError('inconsistent chunk structure in dataset')
+        if has_labels:
+            arrays += _to_array_list(label_chunk)
+
+        # Check all arrays in chunk have the same number of samples
+        chunk_n = arrays[0].shape[0]
+        if not all(a.shape[0] == chunk_n for a in arrays):
+            raise ValueError('sample count mismatch in data and labels arrays')
+
+        # Prepend any samples left over from previous chunks
+        if pending is not None:
+            arrays = [np.concatenate([p, a]) for p, a in zip(pending, arrays)]
+            pending = None
+
+        # Yield as many full batches as possible
+        n = arrays[0].shape[0]
+        batch_start = 0
+        while (n - batch_start) >= batch_size:
+            batch_end = batch_start + batch_size
+            batch = [a[batch_start:batch_end] for a in arrays]
+            yield batch[:n_data], (batch[n_data:] if has_labels else None)
+            batch_start = batch_end
+
+        # Stash remaining samples
+        if batch_start < n:
+            pending = [a[batch_start:] for a in arrays]
+
+    # Yield final partial batch
+    if pending is not None:
+        yield pending[:n_data], (pending[n_data:] if has_labels else None)
+
+
+class BatchPrefetcher(object):
+    """Prepare batches on a background thread
+
+    A worker thread iterates through batches and stages the data of each one
+    into one of a fixed set of reusable staging buffers while the main thread
+    consumes the previous one. Once the main thread has finished with a staged
+    batch, it must return its staging buffers with release. If the main thread
+    stops consuming batches before they are exhausted, it must call close.
+    """
+
+    def __init__(self, batches, stage, num_buffers=2, buffers=None):
+        """Start prefetching batches
+
+        Args:
+        batches      --  iterator of (data_batch, label_batch) tuples
+        stage        --  function taking a data batch and the staging buffers to reuse
+                         (None the first time each set is used) and returning the
+                         staging buffers the data was copied into
+
+        Keyword args:
+        num_buffers  --  number of sets of staging buffers (default: 2)
+        buffers      --  list of existing sets of staging buffers to use
+                         (default: None, meaning stage allocates num_buffers sets)
+        """
+
+        self._free = Queue()
+        self._ready = Queue()
+        self._stop = Event()
+        for staging in ([None] * num_buffers if buffers is None else buffers):
+            self._free.put(staging)
+
+        self._thread = Thread(target=self._prefetch, args=(batches, stage),
+                              daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        """Iterate through (staging, batch_n, label_batch) tuples"""
+
+        while True:
+            item = self._ready.get()
+            if item is None:
+                break
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+
+        self._thread.join()
+
+    def release(self, staging):
+        """Return staging buffers so they can be reused for a future batch"""
+
+        self._free.put(staging)
+
+    def close(self):
+        """Stop prefetching batches"""
+
+        self._stop.set()
+
+        # Wake worker thread if it is waiting for free staging buffers
+        self._free.put(None)
+
+    def _prefetch(self, batches, stage):
+        try:
+            for batch_data, batch_labels in batches:
+                staging = self._free.get()
+                if self._stop.is_set():
+                    return
+                staging = stage(batch_data, staging)
+                self._ready.put((staging, batch_data[0].shape[0], batch_labels))
+        except BaseException as ex:
+            self._ready.put(ex)
+        else:
+            self._ready.put(None)
@@ -0,0 +1,66 @@
+"""ML GeNN object descriptions
+
+This module provides functions which describe the neurons and synapses of
+ML GeNN models in JSON-serialisable form. They are used to save models, to
+key caches of builds and normalisation results and to recreate copies of
+neurons and synapses.
+"""
+
+import numpy as np
+from enum import Enum
+from inspect import signature
+
+
+def get_params(obj):
+    """Get JSON-serialisable constructor parameters of neurons or synapses
+
+    Passing these to the object's class creates an equivalent, unconnected object.
+    """
+
+    def to_json(value):
+        if isinstance(value, Enum):
+            return value.value
+        elif isinstance(value, (tuple, list)):
+            return [to_json(v) for v in value]
+        elif isinstance(value, np.generic):
+            return value.item()
+        else:
+            return value
+
+    # **NOTE** neurons and synapses store constructor parameters in attributes of the same name
+    return {p.name: to_json(getattr(obj, p.name))
+            for p in signature(type(obj).__init__).parameters.values()
+            if p.name != 'self' and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)}
+
+
+def describe_value(value):
+    """Convert attribute value into a JSON-serialisable description (or None to skip it)"""
+
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    elif isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    elif isinstance(value, np.integer):
+        return int(value)
+    elif isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, (tuple, list)):
+        return [describe_value(v) for v in value]
+    else:
+        return None
+
+
+def describe_object(obj, exclude=()):
+    """Describe class and attributes of neurons or synapses
+
+    Args:
+    obj      --  neurons or synapses to describe
+
+    Keyword args:
+    exclude  --  names of attributes to leave out of description (default: ())
+    """
+
+    attributes = {k: describe_value(v) for k, v in vars(obj).items()
+                  if not k.startswith('_') and k not in exclude}
+    return {'class': '{}.{}'.format(type(obj).__module__, type(obj).__name__),
+            'attributes': {k: v for k, v in sorted(attributes.items()) if v is not None}}
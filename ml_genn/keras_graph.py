@@ -0,0 +1,259 @@
+"""ML GeNN Keras model graphs
+
+This module provides the ``KerasGraph`` class which describes the layers of a
+Keras model, how they are connected and their weights, independently of
+TensorFlow. Graphs can be created from live TensorFlow models or read directly
+from Keras HDF5 files with h5py, so models can be converted by processes which
+do not have TensorFlow installed.
+"""
+
+import json
+import numpy as np
+
+from ml_genn.data import QuantileSketch, array_batches
+
+
+def _get_tuple(config, key):
+    value = config[key]
+    if value is None or isinstance(value, (list, tuple)):
+        return None if value is None else tuple(value)
+    else:
+        return (value, value)
+
+
+class KerasLayer(object):
+    """Description of a single Keras layer"""
+
+    def __init__(self, class_name, config, inbound_names, weights):
+        self.class_name = class_name
+        self.config = config
+        self.name = config['name']
+        self.inbound_names = inbound_names
+        self.outbound_names = []
+        self.weights = weights
+
+    def get_weights(self):
+        return self.weights
+
+    @property
+    def activation(self):
+        return self.config.get('activation')
+
+    @property
+    def use_bias(self):
+        return self.config.get('use_bias', False)
+
+    @property
+    def units(self):
+        return self.config['units']
+
+    @property
+    def filters(self):
+        return self.config['filters']
+
+    @property
+    def kernel_size(self):
+        return _get_tuple(self.config, 'kernel_size')
+
+    @property
+    def strides(self):
+        return _get_tuple(self.config, 'strides')
+
+    @property
+    def pool_size(self):
+        return _get_tuple(self.config, 'pool_size')
+
+    @property
+    def padding(self):
+        return self.config['padding']
+
+    @property
+    def input_shape(self):
+        shape = self.config.get('batch_input_shape', self.config.get('batch_shape'))
+        return tuple(shape[1:])
+
+
+class KerasGraph(object):
+    """Description of the layers of a Keras model and how they are connected"""
+
+    def __init__(self, model_config, get_weights, tf_model=None):
+        """Create a graph from a Keras model configuration
+
+        Args:
+        model_config  --  Keras model configuration dictionary (with
+                          'class_name' and 'config' keys) as saved in HDF5 files
+        get_weights   --  function returning list of weight arrays given a layer name
+
+        Keyword args:
+        tf_model      --  TensorFlow model graph describes, used to calculate layer
+                          activations (default: None)
+        """
+
+        class_name = model_config['class_name']
+        config = model_config['config']
+        self.name = config['name'] if isinstance(config, dict) else 'sequential'
+        self.tf_model = tf_model
+        self.layers = []
+
+        if class_name == 'Sequential':
+            layer_configs = config['layers'] if isinstance(config, dict) else config
+
+            # **NOTE** Sequential models built with an input_shape argument
+            # don't always store their InputLayer so recreate it
+            if layer_configs[0]['class_name'] != 'InputLayer':
+                first_config = layer_configs[0]['config']
+                self.layers.append(KerasLayer('InputLayer', {
+                    'name': first_config['name'] + '_input',
+                    'batch_input_shape': first_config.get('batch_input_shape',
+                                                          first_config.get('batch_shape'))},
+                    [], []))
+
+            # Connect each layer to the previous one
+            for l in layer_configs:
+                inbound_names = [self.layers[-1].name] if self.layers else []
+                self.layers.append(self._create_layer(l, inbound_names, get_weights))
+
+            self.input_names = [self.layers[0].name]
+            self.output_names = [self.layers[-1].name]
+
+        elif class_name in ('Functional', 'Model'):
+            for l in config['layers']:
+                # **NOTE** layers called more than once are not supported so
+                # combine the inbound layers of all nodes
+                inbound_names = [inbound[0] for node in l['inbound_nodes'] for inbound in node]
+                self.layers.append(self._create_layer(l, inbound_names, get_weights))
+
+            self.input_names = [i[0] for i in config['input_layers']]
+            self.output_names = [o[0] for o in config['output_layers']]
+
+        else:
+            raise NotImplementedError('{} models not supported'.format(class_name))
+
+        # Link layers to their outbound layers
+        self._layer_lookup = {l.name: l for l in self.layers}
+        for layer in self.layers:
+            for name in layer.inbound_names:
+                outbound_names = self._layer_lookup[name].outbound_names
+                if layer.name not in outbound_names:
+                    outbound_names.append(layer.name)
+
+    @staticmethod
+    def _create_layer(layer_config, inbound_names, get_weights):
+        if layer_config['class_name'] in ('Sequential', 'Functional', 'Model'):
+            raise NotImplementedError('nested models not supported')
+
+        return KerasLayer(layer_config['class_name'], layer_config['config'],
+                          inbound_names, get_weights(layer_config['config']['name']))
+
+    @staticmethod
+    def from_tf_model(tf_model):
+        """Create a graph from a TensorFlow Keras model"""
+
+        model_config = {'class_name': tf_model.__class__.__name__,
+                        'config': tf_model.get_config()}
+        if model_config['class_name'] not in ('Sequential', 'Functional', 'Model'):
+            model_config['class_name'] = 'Functional'
+
+        return KerasGraph(model_config, lambda name: tf_model.get_layer(name).get_weights(),
+                          tf_model=tf_model)
+
+    @staticmethod
+    def from_h5(path):
+        """Read a graph from a Keras HDF5 file saved with Model.save
+
+        Args:
+        path  --  path to HDF5 file
+        """
+
+        import h5py
+
+        with h5py.File(path, 'r') as f:
+            if 'model_config' not in f.attrs:
+                raise ValueError('HDF5 file does not contain a model configuration')
+
+            model_config = f.attrs['model_config']
+            if isinstance(model_config, bytes):
+                model_config = model_config.decode('utf-8')
+            model_config = json.loads(model_config)
+
+            # **NOTE** weights are stored in one group per
+            # layer in the order Layer.get_weights returns them
+            model_weights = f['model_weights'] if 'model_weights' in f else f
+
+            def get_weights(name):
+                if name not in model_weights:
+                    return []
+                group = model_weights[name]
+                return [np.asarray(group[n.decode('utf-8') if isinstance(n, bytes) else n])
+                        for n in group.attrs['weight_names']]
+
+            return KerasGraph(model_config, get_weights)
+
+    def get_layer(self, name):
+        return self._layer_lookup[name]
+
+    @property
+    def inputs(self):
+        return [self._layer_lookup[n] for n in self.input_names]
+
+    @property
+    def outputs(self):
+        return [self._layer_lookup[n] for n in self.output_names]
+
+    def get_weighted_layers(self):
+        """Get list of layers with weights, in model order"""
+
+        return [l for l in self.layers if len(l.get_weights()) > 0]
+
+    def get_layer_outputs(self, layers, data):
+        """Calculate outputs of layers given input data
+
+        Args:
+        layers  --  list of layers to calculate outputs of
+        data    --  list of data for each input layer
+
+        Returns:
+        list of output arrays for each layer
+        """
+
+        return self._get_outputs_function(layers)([np.asarray(x) for x in data])
+
+    def get_max_activations(self, layers, data, chunk_size=256, percentile=100.0):
+        """Calculate maximum (or percentile) activation of layers given input data
+
+        Input data is processed in chunks and only streaming statistics of
+        each layer's activations are kept, so peak memory usage is bounded
+        by the activations of a single chunk.
+
+        Args:
+        layers      --  list of layers to calculate maximum activations of
+        data        --  list of data for each input layer
+
+        Keyword args:
+        chunk_size  --  number of samples to calculate activations of at once (default: 256)
+        percentile  --  percentile (0-100) of activations to use as the maximum, values
+                        below 100 give robust normalisation (default: 100.0, the exact maximum)
+
+        Returns:
+        dictionary of maximum activation of each layer, keyed by layer name
+        """
+
+        get_outputs = self._get_outputs_function(layers)
+
+        sketches = [QuantileSketch() for _ in layers]
+        for chunk, _ in array_batches(data, None, chunk_size):
+            outputs = get_outputs([np.asarray(x) for x in chunk])
+            for sketch, out in zip(sketches, outputs):
+                sketch.update(out)
+
+        return {l.name: s.percentile(percentile) for l, s in zip(layers, sketches)}
+
+    def _get_outputs_function(self, layers):
+        if self.tf_model is None:
+            raise RuntimeError('calculating layer outputs requires a TensorFlow model: '
+                               'provide precomputed activations to the converter instead')
+
+        import tensorflow as tf
+
+        return tf.keras.backend.function(
+            self.tf_model.inputs, [self.tf_model.get_layer(l.name).output for l in layers])
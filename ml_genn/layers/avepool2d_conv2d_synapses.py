@@ -6,13 +6,14 @@ from pygenn.genn_model import (init_connectivity, init_var,
 from pygenn.genn_wrapper import NO_DELAY
 from pygenn.genn_wrapper.StlContainers import UnsignedIntVector
 
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers import ConnectivityType, PadMode
 from ml_genn.layers.base_synapses import BaseSynapses
 from ml_genn.layers.weight_update_models import signed_static_pulse
 from ml_genn.layers.helper import _get_param_2d
 
-avepool2d_conv2d_init = create_custom_sparse_connect_init_snippet_class(
-    'avepool2d_conv2d',
+avepool2d_conv2d_init = register_model(
+    create_custom_sparse_connect_init_snippet_class, 'avepool2d_conv2d',
 
     param_names=[
         'pool_kh', 'pool_kw',
@@ -171,7 +172,7 @@ class AvePool2DConv2DSynapses(BaseSynapses):
             conv_padh = (conv_kh - 1) // 2
             conv_padw = (conv_kw - 1) // 2
 
-        conn_init = init_connectivity(avepool2d_conv2d_init, {
+        conn_init = init_connectivity(avepool2d_conv2d_init.get(), {
             'pool_kh': pool_kh, 'pool_kw': pool_kw,
             'pool_sh': pool_sh, 'pool_sw': pool_sw,
             'pool_padh': pool_padh, 'pool_padw': pool_padw,
@@ -184,9 +185,16 @@ class AvePool2DConv2DSynapses(BaseSynapses):
 
         conn = ('PROCEDURAL_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL
                 else 'SPARSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = signed_static_pulse.get() if self.source().neurons.signed_spikes else 'StaticPulse'
         wu_var = {'g': init_var('Kernel', {})}
         wu_var_egp = {'g': {'kernel': self.weights.flatten() / (pool_kh * pool_kw)}}
 
-        super(AvePool2DConv2DSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
+        super(AvePool2DConv2DSynapses, self).compile(mlg_model, name, conn, self.delay, wu_model, {}, wu_var,
                                                      {}, {}, 'DeltaCurr', {}, {}, conn_init, wu_var_egp)
+
+    def push_weights(self):
+        pool_kh, pool_kw = self.pool_size
+        self._push_var_init_egp('g', 'kernel', self.weights.flatten() / (pool_kh * pool_kw))
+
+        # **NOTE** kernel is only used to initialise sparse weights
+        return self.connectivity_type != ConnectivityType.PROCEDURAL
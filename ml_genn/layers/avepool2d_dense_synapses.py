@@ -4,13 +4,14 @@ from pygenn.genn_model import create_custom_init_var_snippet_class
 from pygenn.genn_model import init_var
 from pygenn.genn_wrapper import NO_DELAY
 
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers import ConnectivityType, PadMode
 from ml_genn.layers.base_synapses import BaseSynapses
 from ml_genn.layers.weight_update_models import signed_static_pulse
 from ml_genn.layers.helper import _get_param_2d
 
-avepool2d_dense_init = create_custom_init_var_snippet_class(
-    'avepool2d_dense_big_pool',
+avepool2d_dense_init = register_model(
+    create_custom_init_var_snippet_class, 'avepool2d_dense_big_pool',
 
     param_names=[
         'pool_kh', 'pool_kw',
@@ -116,7 +117,7 @@ class AvePool2DDenseSynapses(BaseSynapses):
 
         dense_ih, dense_iw, dense_ic = self.pool_output_shape
 
-        wu_var_init = init_var(avepool2d_dense_init, {
+        wu_var_init = init_var(avepool2d_dense_init.get(), {
             'pool_kh': pool_kh, 'pool_kw': pool_kw,
             'pool_sh': pool_sh, 'pool_sw': pool_sw,
             'pool_padh': pool_padh, 'pool_padw': pool_padw,
@@ -127,9 +128,15 @@ class AvePool2DDenseSynapses(BaseSynapses):
 
         conn = ('DENSE_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL 
                 else 'DENSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = signed_static_pulse.get() if self.source().neurons.signed_spikes else 'StaticPulse'
         wu_var = {'g': wu_var_init}
         wu_var_egp = {'g': {'weights': self.weights.flatten()}}
 
-        super(AvePool2DDenseSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
+        super(AvePool2DDenseSynapses, self).compile(mlg_model, name, conn, self.delay, wu_model, {}, wu_var,
                                                     {}, {}, 'DeltaCurr', {}, {}, None, wu_var_egp)
+
+    def push_weights(self):
+        self._push_var_init_egp('g', 'weights', self.weights.flatten())
+
+        # **NOTE** weights are only used to initialise dense weights
+        return self.connectivity_type != ConnectivityType.PROCEDURAL
@@ -1,3 +1,4 @@
+import numpy as np
 from weakref import ref
 from six import iteritems
 
@@ -7,6 +8,7 @@ class BaseSynapses(object):
         self.source = None
         self.target = None
         self.weights = None
+        self.delay = 0
         self.syn = None
 
     def connect(self, source, target):
@@ -15,9 +17,61 @@ class BaseSynapses(object):
         source.downstream_synapses.append(self)
         target.upstream_synapses.append(self)
 
-    def set_weights(self, weights):
+    def set_weights(self, weights, push=True):
+        weights = np.asarray(weights)
+        if weights.shape != self.weights.shape:
+            raise ValueError('weights shape {} does not match synapse weights shape {}'.format(
+                weights.shape, self.weights.shape))
+
         self.weights[:] = weights
 
+        # If model is loaded, update device copy of weights
+        if push and self.syn is not None and self.syn._model._loaded:
+            if self.push_weights():
+                self.syn._model.reinitialise()
+
+    def push_weights(self):
+        """Copy weights to the loaded GeNN model
+
+        Returns:
+        True if the GeNN model must be reinitialised for the new weights to take effect
+        """
+
+        raise NotImplementedError('synapses do not support updating weights of loaded models')
+
+    def _push_var_init_egp(self, var, egp, values):
+        """Copy values of a variable initialisation extra global parameter to the loaded GeNN model
+
+        **NOTE** PyGeNN only provides helpers for pushing population extra global parameters.
+        GeNN names the extra global parameters of variable initialisation snippets by appending
+        the variable name to the parameter name (e.g. 'kernelg' for the 'kernel' parameter used
+        to initialise 'g') and generates push<parameter><population>ToDevice functions for them,
+        which SharedLibraryModel.push_extra_global_param looks up by name.
+
+        Args:
+        var     --  name of variable
+        egp     --  name of extra global parameter of variable's initialisation snippet
+        values  --  array of values to copy
+        """
+
+        var_data = self.syn.vars.get(var)
+        if var_data is None or egp not in var_data.extra_global_params:
+            raise RuntimeError('synapse population <{}> has no variable initialisation '
+                               'parameter <{}> for variable <{}>'.format(self.syn.name, egp, var))
+
+        # **NOTE** PyGeNN creates views of these parameters using the same symbol naming
+        egp_data = var_data.extra_global_params[egp]
+        if egp_data.view is None:
+            raise RuntimeError('variable initialisation parameter <{}> for variable <{}> of '
+                               'synapse population <{}> is not loaded'.format(egp, var, self.syn.name))
+        egp_data.view[:] = values
+
+        try:
+            self.syn._model._slm.push_extra_global_param(self.syn.name, egp + var, len(values))
+        except RuntimeError as ex:
+            raise RuntimeError('unable to push GeNN symbol push{}{}ToDevice: {}'.format(
+                egp + var, self.syn.name, ex))
+
     def get_weights(self):
         return self.weights.copy()
 
@@ -6,13 +6,14 @@ from pygenn.genn_model import (init_connectivity, init_var,
 from pygenn.genn_wrapper import NO_DELAY
 from pygenn.genn_wrapper.StlContainers import UnsignedIntVector
 
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers import ConnectivityType, PadMode
 from ml_genn.layers.base_synapses import BaseSynapses
 from ml_genn.layers.weight_update_models import signed_static_pulse
 from ml_genn.layers.helper import _get_param_2d
 
-conv2d_init = create_custom_sparse_connect_init_snippet_class(
-    'conv2d',
+conv2d_init = register_model(
+    create_custom_sparse_connect_init_snippet_class, 'conv2d',
 
     param_names=[
         'conv_kh', 'conv_kw',
@@ -120,7 +121,7 @@ class Conv2DSynapses(BaseSynapses):
             conv_padh = (conv_kh - 1) // 2
             conv_padw = (conv_kw - 1) // 2
 
-        conn_init = init_connectivity(conv2d_init, {
+        conn_init = init_connectivity(conv2d_init.get(), {
             'conv_kh': conv_kh, 'conv_kw': conv_kw,
             'conv_sh': conv_sh, 'conv_sw': conv_sw,
             'conv_padh': conv_padh, 'conv_padw': conv_padw,
@@ -129,9 +130,15 @@ class Conv2DSynapses(BaseSynapses):
 
         conn = ('PROCEDURAL_PROCEDURALG' if self.connectivity_type == ConnectivityType.PROCEDURAL
                 else 'SPARSE_INDIVIDUALG')
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = signed_static_pulse.get() if self.source().neurons.signed_spikes else 'StaticPulse'
         wu_var = {'g': init_var('Kernel', {})}
         wu_var_egp = {'g': {'kernel': self.weights.flatten()}}
 
-        super(Conv2DSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
+        super(Conv2DSynapses, self).compile(mlg_model, name, conn, self.delay, wu_model, {}, wu_var,
                                             {}, {}, 'DeltaCurr', {}, {}, conn_init, wu_var_egp)
+
+    def push_weights(self):
+        self._push_var_init_egp('g', 'kernel', self.weights.flatten())
+
+        # **NOTE** kernel is only used to initialise sparse weights
+        return self.connectivity_type != ConnectivityType.PROCEDURAL
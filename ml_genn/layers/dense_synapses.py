@@ -24,8 +24,17 @@ class DenseSynapses(BaseSynapses):
 
     def compile(self, mlg_model, name):
         conn = 'DENSE_INDIVIDUALG'
-        wu_model = signed_static_pulse if self.source().neurons.signed_spikes else 'StaticPulse'
+        wu_model = signed_static_pulse.get() if self.source().neurons.signed_spikes else 'StaticPulse'
         wu_var = {'g': self.weights.flatten()}
 
-        super(DenseSynapses, self).compile(mlg_model, name, conn, 0, wu_model, {}, wu_var,
+        super(DenseSynapses, self).compile(mlg_model, name, conn, self.delay, wu_model, {}, wu_var,
                                            {}, {}, 'DeltaCurr', {}, {}, None, {})
+
+    def push_weights(self):
+        # **NOTE** PyGeNN copies the values variables were created with back into
+        # their views when models are reinitialised so update these values too
+        weights = self.weights.flatten()
+        self.syn.vars['g'].set_values(weights)
+        self.syn.vars['g'].view[:] = weights
+        self.syn.push_var_to_device('g')
+        return False
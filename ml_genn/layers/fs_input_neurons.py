@@ -1,9 +1,10 @@
 from pygenn.genn_model import create_dpf_class, create_custom_neuron_class
 from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.input_neurons import InputNeurons
 
-fs_relu_input_model = create_custom_neuron_class(
-    'fs_relu_input',
+fs_relu_input_model = register_model(
+    create_custom_neuron_class, 'fs_relu_input',
     param_names=['K', 'alpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]))())],
     var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
@@ -29,8 +30,8 @@ fs_relu_input_model = create_custom_neuron_class(
     ''',
     is_auto_refractory_required=False)
 
-fs_relu_signed_input_model = create_custom_neuron_class(
-    'fs_relu_signed_input',
+fs_relu_signed_input_model = register_model(
+    create_custom_neuron_class, 'fs_relu_signed_input',
     param_names=['K', 'alpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]//2))())],
     var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
@@ -72,8 +73,8 @@ class FSReluInputNeurons(InputNeurons):
         self.signed_input = signed_input
 
     def compile(self, mlg_model, layer):
-        model = (fs_relu_signed_input_model if self.signed_input 
-                 else fs_relu_input_model)
+        model = (fs_relu_signed_input_model.get() if self.signed_input
+                 else fs_relu_input_model.get())
         params = {'K' : self.K, 'alpha': self.alpha}
         vars = {'input': 0.0, 'Vmem': 0.0}
 
@@ -1,11 +1,13 @@
 import numpy as np
 from pygenn.genn_model import create_dpf_class, create_custom_neuron_class
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.fs_input_neurons import FSReluInputNeurons
 from ml_genn.layers.neurons import Neurons
+from ml_genn.layers.helper import _get_top_k
 
 # Standard FS ReLU model where upstream neurons are FS ReLU or FS unsigned input
-fs_relu_model = create_custom_neuron_class(
-    'fs_relu',
+fs_relu_model = register_model(
+    create_custom_neuron_class, 'fs_relu',
     param_names=['K', 'alpha', 'upstreamAlpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]))()),
                     ("upstreamScale", create_dpf_class(lambda pars, dt: pars[2] * 2**(-pars[0]))())],
@@ -41,8 +43,8 @@ fs_relu_model = create_custom_neuron_class(
     is_auto_refractory_required=False)
 
 # FS ReLU model where upstream neurons are FS signed input
-fs_relu_upstream_signed_input_model = create_custom_neuron_class(
-    'fs_relu_upstream_signed_input',
+fs_relu_upstream_signed_input_model = register_model(
+    create_custom_neuron_class, 'fs_relu_upstream_signed_input',
     param_names=['K', 'alpha', 'upstreamAlpha'],
     derived_params=[("scale", create_dpf_class(lambda pars, dt: pars[1] * 2**(-pars[0]))()),
                     ("upstreamScale", create_dpf_class(lambda pars, dt: pars[2] * 2**(-pars[0]//2))())],
@@ -132,8 +134,8 @@ class FSReluNeurons(Neurons):
             upstream_alpha = self.alpha
 
         # Pick model based on whether upstream neurons are signed or not
-        model = (fs_relu_upstream_signed_input_model if upstream_signed == True
-                 else fs_relu_model)
+        model = (fs_relu_upstream_signed_input_model.get() if upstream_signed == True
+                 else fs_relu_model.get())
 
         params = {'K': self.K, 'alpha': self.alpha, 
                   'upstreamAlpha': upstream_alpha}
@@ -146,10 +148,22 @@ class FSReluNeurons(Neurons):
         raise NotImplementedError('FS neurons do not have '
                                   'overridable thresholds')
 
-    def get_predictions(self, batch_n):
+    def get_decided(self, batch_n, margin=None, confidence=None):
+        raise NotImplementedError('FS neurons do not support '
+                                  'early exit')
+
+    def get_scores(self, batch_n):
         self.nrn.pull_var_from_device('Fx')
         if self.nrn.vars['Fx'].view.ndim == 1:
             output_view = self.nrn.vars['Fx'].view[np.newaxis]
         else:
             output_view = self.nrn.vars['Fx'].view[:batch_n]
-        return output_view.argmax(axis=1)
+        return output_view
+
+    def get_predictions(self, batch_n):
+        # **NOTE** unlike IF spike counts, Fx is real-valued so neuron IDs can't be
+        # encoded into the value a neuron reduction finds the maximum of
+        return self.get_scores(batch_n).argmax(axis=1)
+
+    def get_top_k(self, batch_n, k):
+        return _get_top_k(self.get_scores(batch_n), k)
@@ -1,3 +1,4 @@
+import numpy as np
 
 def _get_param_2d(name, param, default=None):
 
@@ -18,3 +19,13 @@ def _get_param_2d(name, param, default=None):
 
     else:
         raise TypeError('{}: incorrect type: {}'.format(name, type(param)))
+
+def _get_top_k(scores, k):
+
+    # Partially sort to find k highest scores of each sample, then sort them
+    k = min(k, scores.shape[1])
+    neg_scores = -scores.astype(np.float64)
+    indices = np.argpartition(neg_scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(neg_scores, indices, axis=1), axis=1, kind='stable')
+    indices = np.take_along_axis(indices, order, axis=1)
+    return indices, np.take_along_axis(scores, indices, axis=1)
@@ -1,9 +1,10 @@
 from pygenn.genn_model import create_custom_neuron_class
 from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.input_neurons import InputNeurons
 
-if_input_model = create_custom_neuron_class(
-    'if_input',
+if_input_model = register_model(
+    create_custom_neuron_class, 'if_input',
     var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE), ('Vmem', 'scalar')],
     sim_code='''
     if ($(t) == 0.0) {
@@ -24,7 +25,7 @@ if_input_model = create_custom_neuron_class(
 class IFInputNeurons(InputNeurons):
 
     def compile(self, mlg_model, layer):
-        model = if_input_model
+        model = if_input_model.get()
         vars = {'input': 0.0, 'Vmem': 0.0}
 
         super(IFInputNeurons, self).compile(mlg_model, layer, model, {}, vars, {})
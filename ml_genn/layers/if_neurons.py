@@ -1,9 +1,11 @@
 import numpy as np
 from pygenn.genn_model import create_custom_neuron_class
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.neurons import Neurons
+from ml_genn.layers.helper import _get_top_k
 
-if_model = create_custom_neuron_class(
-    'if',
+if_model = register_model(
+    create_custom_neuron_class, 'if',
     var_name_types=[('Vmem', 'scalar'), ('nSpk', 'unsigned int')],
     extra_global_params=[('Vthr', 'scalar')],
     sim_code='''
@@ -24,29 +26,159 @@ if_model = create_custom_neuron_class(
     is_auto_refractory_required=False,
 )
 
+# IF neuron which also tracks the maximum input it receives in a single timestep
+# and can be gated off at runtime, so it neither integrates input nor spikes
+# **NOTE** used to calibrate thresholds without reading Vmem every timestep
+if_max_input_model = register_model(
+    create_custom_neuron_class, 'if_max_input',
+    var_name_types=[('Vmem', 'scalar'), ('nSpk', 'unsigned int'), ('VmemMax', 'scalar')],
+    extra_global_params=[('Vthr', 'scalar'), ('Active', 'int')],
+    sim_code='''
+    if ($(t) == 0.0) {
+        // Reset state at t = 0
+        $(Vmem) = 0.0;
+        $(nSpk) = 0;
+        $(VmemMax) = 0.0;
+    }
+    if ($(Active)) {
+        const scalar input = $(Isyn) * DT;
+        $(VmemMax) = fmax($(VmemMax), input);
+        $(Vmem) += input;
+    }
+    ''',
+    threshold_condition_code='''
+    $(Active) && $(Vmem) >= $(Vthr)
+    ''',
+    reset_code='''
+    $(Vmem) = 0.0;
+    $(nSpk) += 1;
+    ''',
+    is_auto_refractory_required=False,
+)
+
+# **NOTE** neuron reductions are only available in newer versions of GeNN
+try:
+    from pygenn.genn_model import create_custom_custom_update_class, create_var_ref
+    from pygenn.genn_wrapper.Models import VarAccess_REDUCE_NEURON_MAX, VarAccessMode_READ_ONLY
+
+    if_argmax_readout_model = register_model(
+        create_custom_custom_update_class, 'if_argmax_readout',
+        param_names=['numNeurons'],
+        var_name_types=[('maxScore', 'scalar', VarAccess_REDUCE_NEURON_MAX)],
+        var_refs=[('nSpk', 'unsigned int', VarAccessMode_READ_ONLY)],
+        update_code='''
+        // Encode spike count and neuron ID so the maximum identifies the first, most active neuron
+        $(maxScore) = ((scalar)$(nSpk) * $(numNeurons)) + ($(numNeurons) - 1.0 - (scalar)$(id));
+        ''')
+except ImportError:
+    if_argmax_readout_model = None
+
+# Largest integer which can be exactly represented in single-precision
+MAX_EXACT_SCORE = 2 ** 24
+
 class IFNeurons(Neurons):
+    supports_early_exit = True
 
-    def __init__(self, threshold=1.0):
+    def __init__(self, threshold=1.0, track_max_input=False):
         super(IFNeurons, self).__init__()
         self.threshold = threshold
+        self.track_max_input = track_max_input
+        self.active = True
+        self.readout = None
 
     def compile(self, mlg_model, layer):
-        model = if_model
-        vars = {'Vmem': 0.0, 'nSpk': 0}
-        egp = {'Vthr': self.threshold}
+        if self.track_max_input:
+            model = if_max_input_model.get()
+            vars = {'Vmem': 0.0, 'nSpk': 0, 'VmemMax': 0.0}
+            egp = {'Vthr': self.threshold, 'Active': int(self.active)}
+        else:
+            model = if_model.get()
+            vars = {'Vmem': 0.0, 'nSpk': 0}
+            egp = {'Vthr': self.threshold}
 
         super(IFNeurons, self).compile(mlg_model, layer, model, {}, vars, egp)
+        self.readout = None
+
+    def compile_readout(self, mlg_model, layer, n_steps):
+        # Only add readout if it is supported and scores encoded
+        # after n_steps timesteps can be represented exactly
+        if (if_argmax_readout_model is None
+                or (n_steps + 1) * self.nrn.size >= MAX_EXACT_SCORE):
+            return
+
+        # Add custom update to find most active neuron on device
+        name = '{}_readout'.format(layer.name)
+        self.readout = mlg_model.g_model.add_custom_update(
+            name, name, if_argmax_readout_model.get(),
+            {'numNeurons': self.nrn.size}, {'maxScore': 0.0},
+            {'nSpk': create_var_ref(self.nrn, 'nSpk')})
+        self.readout_g_model = mlg_model.g_model
 
     def set_threshold(self, threshold):
         self.threshold = threshold
 
         if self.nrn is not None:
             self.nrn.extra_global_params['Vthr'].view[:] = threshold
-    
-    def get_predictions(self, batch_n):
+
+    def set_active(self, active):
+        # Gate neuron updates on or off (only supported when tracking maximum input)
+        if not self.track_max_input:
+            raise RuntimeError('neurons were not created with track_max_input=True')
+
+        self.active = active
+
+        if self.nrn is not None:
+            self.nrn.extra_global_params['Active'].view[:] = int(active)
+
+    def get_scores(self, batch_n):
         self.nrn.pull_var_from_device('nSpk')
         if self.nrn.vars['nSpk'].view.ndim == 1:
             output_view = self.nrn.vars['nSpk'].view[np.newaxis]
         else:
             output_view = self.nrn.vars['nSpk'].view[:batch_n]
-        return output_view.argmax(axis=1)
\ No newline at end of file
+        return output_view
+
+    def get_max_input(self, batch_n):
+        # Get maximum input each neuron has received in a single timestep since t = 0
+        if not self.track_max_input:
+            raise RuntimeError('neurons were not created with track_max_input=True')
+
+        self.nrn.pull_var_from_device('VmemMax')
+        if self.nrn.vars['VmemMax'].view.ndim == 1:
+            return self.nrn.vars['VmemMax'].view[np.newaxis]
+        else:
+            return self.nrn.vars['VmemMax'].view[:batch_n]
+
+    def get_predictions(self, batch_n):
+        # If readout is available and encoded scores can be represented
+        # exactly, find most active neuron on device and only pull result
+        n = self.nrn.size
+        if (self.readout is not None and
+                (self.readout_g_model.timestep + 1) * n < MAX_EXACT_SCORE):
+            self.readout_g_model.custom_update(self.readout.name)
+            self.readout.pull_var_from_device('maxScore')
+            max_score = np.rint(np.atleast_1d(
+                self.readout.vars['maxScore'].view)[:batch_n]).astype(np.int64)
+            return (n - 1) - (max_score % n)
+        else:
+            return self.get_scores(batch_n).argmax(axis=1)
+
+    def get_top_k(self, batch_n, k):
+        return _get_top_k(self.get_scores(batch_n), k)
+
+    def get_decided(self, batch_n, margin=None, confidence=None):
+        # A single output neuron has no competitors so every sample is decided
+        output_view = self.get_scores(batch_n).astype(np.int64)
+        if output_view.shape[1] == 1:
+            return np.ones(output_view.shape[0], dtype=bool)
+
+        # Find highest and second highest spike count of each sample
+        top_two = np.partition(output_view, -2, axis=1)[:, -2:]
+
+        decided = np.ones(output_view.shape[0], dtype=bool)
+        if margin is not None:
+            decided &= (top_two[:, 1] - top_two[:, 0]) >= margin
+        if confidence is not None:
+            total = output_view.sum(axis=1)
+            decided &= (total > 0) & (top_two[:, 1] >= confidence * total)
+        return decided
@@ -13,7 +13,7 @@ class InputLayer(BaseLayer):
         super(InputLayer, self).__init__(name, neurons)
         self.shape = shape
 
-    def set_input_batch(self, data_batch):
+    def get_input_view(self):
         nrn = self.neurons.nrn
         if nrn.vars['input'].view.ndim == 1:
             input_view = nrn.vars['input'].view[np.newaxis]
@@ -24,6 +24,9 @@ class InputLayer(BaseLayer):
         if len(input_view.shape) == 1:
             input_view = input_view.reshape(1, -1)
 
+        return input_view
+
+    def check_input_batch(self, data_batch, input_view):
         # Check batch dimension
         if data_batch.shape[0] > input_view.shape[0]:
             raise ValueError('data batch {} > input batch {}'.format(data_batch.shape[0], input_view.shape[0]))
@@ -32,5 +35,26 @@ class InputLayer(BaseLayer):
         if data_batch.shape[1:] != self.shape:
             raise ValueError('data shape {} != input shape {}'.format(data_batch.shape[1:], self.shape))
 
+    def set_input_batch(self, data_batch):
+        input_view = self.get_input_view()
+        self.check_input_batch(data_batch, input_view)
+
         input_view[:data_batch.shape[0]] = data_batch.reshape(data_batch.shape[0], -1)
-        nrn.push_var_to_device('input')
+        self.neurons.nrn.push_var_to_device('input')
+
+    def stage_input_batch(self, data_batch, staging=None):
+        # Allocate contiguous staging buffer matching input view if required
+        input_view = self.get_input_view()
+        if staging is None:
+            staging = np.empty(input_view.shape, dtype=input_view.dtype)
+        self.check_input_batch(data_batch, input_view)
+
+        staging[:data_batch.shape[0]] = data_batch.reshape(data_batch.shape[0], -1)
+        return staging
+
+    def set_staged_input_batch(self, staging, batch_n):
+        # If batch wasn't staged directly into input view, copy it there
+        input_view = self.get_input_view()
+        if not np.may_share_memory(staging, input_view):
+            input_view[:batch_n] = staging[:batch_n]
+        self.neurons.nrn.push_var_to_device('input')
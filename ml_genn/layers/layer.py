@@ -17,12 +17,25 @@ class Layer(BaseLayer):
         for source, synapse in zip(sources, synapses):
             synapse.connect(source, self)
 
-    def set_weights(self, weights):
+    def set_weights(self, weights, push=True):
         if len(weights) != len(self.upstream_synapses):
             raise ValueError('weight matrix list and upsteam synapse list length mismatch')
 
         for synapse, w in zip(self.upstream_synapses, weights):
-            synapse.set_weights(w)
+            synapse.set_weights(w, push=False)
+
+        # If model is loaded, update device copies of weights
+        # **NOTE** reinitialise model once, even if several synapses require it
+        if push and self.upstream_synapses and self.upstream_synapses[0].syn is not None:
+            g_model = self.upstream_synapses[0].syn._model
+            if g_model._loaded and self.push_weights():
+                g_model.reinitialise()
+
+    def push_weights(self):
+        reinitialise = False
+        for synapse in self.upstream_synapses:
+            reinitialise |= synapse.push_weights()
+        return reinitialise
 
     def get_weights(self):
         return [synapse.get_weights() for synapse in self.upstream_synapses]
@@ -0,0 +1,51 @@
+"""Registry of custom GeNN models
+
+Creating custom GeNN model classes is relatively slow so, rather than creating
+them when layer modules are imported, layer modules register the function and
+arguments used to create each model and it is only created the first time a
+layer using it is compiled.
+"""
+
+_models = {}
+
+
+class RegisteredModel(object):
+    """Custom GeNN model which is created on first use"""
+
+    def __init__(self, create, name, args, kwargs):
+        self.name = name
+        self._create = create
+        self._args = args
+        self._kwargs = kwargs
+        self._model = None
+
+    def get(self):
+        """Get custom GeNN model, creating it if required"""
+
+        if self._model is None:
+            self._model = self._create(self.name, *self._args, **self._kwargs)
+        return self._model
+
+
+def register_model(create, name, *args, **kwargs):
+    """Register a custom GeNN model
+
+    Args:
+    create  --  PyGeNN function used to create model e.g. create_custom_neuron_class
+    name    --  name of model
+    args    --  additional arguments to pass to create
+    kwargs  --  additional keyword arguments to pass to create
+
+    Returns:
+    RegisteredModel whose get method returns the created model
+    """
+
+    model = RegisteredModel(create, name, args, kwargs)
+    _models[name] = model
+    return model
+
+
+def get_model(name):
+    """Get registered custom GeNN model by name, creating it if required"""
+
+    return _models[name].get()
@@ -1,4 +1,6 @@
 from ml_genn.layers.base_neurons import BaseNeurons
 
 class Neurons(BaseNeurons):
-    pass
+
+    def compile_readout(self, mlg_model, layer, n_steps):
+        pass
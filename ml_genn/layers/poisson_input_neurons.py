@@ -1,9 +1,10 @@
 from pygenn.genn_model import create_custom_neuron_class
 from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.input_neurons import InputNeurons
 
-poisson_input_model = create_custom_neuron_class(
-    'poisson_input',
+poisson_input_model = register_model(
+    create_custom_neuron_class, 'poisson_input',
     var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE)],
     sim_code='''
     const bool spike = $(gennrand_uniform) >= exp(-fabs($(input)) * DT);
@@ -21,7 +22,7 @@ class PoissonInputNeurons(InputNeurons):
         self.signed_spikes = signed_spikes
 
     def compile(self, mlg_model, layer):
-        model = poisson_input_model
+        model = poisson_input_model.get()
         vars = {'input': 0.0}
 
         super(PoissonInputNeurons, self).compile(mlg_model, layer, 
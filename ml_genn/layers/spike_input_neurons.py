@@ -1,9 +1,10 @@
 from pygenn.genn_model import create_custom_neuron_class
 from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY_DUPLICATE
+from ml_genn.layers.model_registry import register_model
 from ml_genn.layers.input_neurons import InputNeurons
 
-spike_input_model = create_custom_neuron_class(
-    'spike_input',
+spike_input_model = register_model(
+    create_custom_neuron_class, 'spike_input',
     var_name_types=[('input', 'scalar', VarAccess_READ_ONLY_DUPLICATE)],
     sim_code='''
     const bool spike = $(input) != 0.0;
@@ -21,7 +22,7 @@ class SpikeInputNeurons(InputNeurons):
         self.signed_spikes = signed_spikes
 
     def compile(self, mlg_model, layer):
-        model = spike_input_model
+        model = spike_input_model.get()
         vars = {'input': 0.0}
 
         super(SpikeInputNeurons, self).compile(mlg_model, layer, 
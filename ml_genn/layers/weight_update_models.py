@@ -1,8 +1,9 @@
 from pygenn.genn_model import create_custom_weight_update_class
 from pygenn.genn_wrapper.Models import VarAccess_READ_ONLY
+from ml_genn.layers.model_registry import register_model
 
-signed_static_pulse = create_custom_weight_update_class(
-    'signed_static_pulse',
+signed_static_pulse = register_model(
+    create_custom_weight_update_class, 'signed_static_pulse',
     var_name_types=[("g", "scalar", VarAccess_READ_ONLY)],
     sim_code='''
     $(addToInSyn, $(g));
@@ -15,18 +15,29 @@ Example:
 
         ml_genn_model = Model.convert_tf_model(tensorflow_model)
         ml_genn_model.evaluate([test_data], [test_labels], 300.0)
+
+    Models saved in Keras HDF5 files can also be converted without
+    TensorFlow by calling ``convert_keras_h5`` with the path to the file.
 """
 
 import os
+import multiprocessing
 import numpy as np
-import tensorflow as tf
-from tqdm import tqdm
+from collections import deque
+from itertools import chain, repeat
+from time import perf_counter
 from pygenn.genn_model import GeNNModel
 
+from ml_genn.build_cache import BuildCache, calc_build_key
 from ml_genn.converters import Simple
+from ml_genn.data import array_batches, batch_dataset, load_data, BatchPrefetcher
+from ml_genn.keras_graph import KerasGraph
+from ml_genn.spike_recording import EvaluateResult, SpikeRecording
+from ml_genn.stepping import load_step_time_n
 
 from ml_genn.layers import InputLayer
 from ml_genn.layers import Layer
+from ml_genn.layers import IFNeurons
 
 from ml_genn.layers import DenseSynapses
 from ml_genn.layers import AvePool2DDenseSynapses
@@ -71,6 +82,11 @@ class Model(object):
         self.inputs = inputs
         self.outputs = outputs
         self.g_model = None
+        self._step_time_n = None
+        self.num_recording_timesteps = None
+        self.mean_timesteps = None
+        self.build_time = None
+        self.load_time = None
 
         # Construct topologically sorted list of layers
         new_layers = set(inputs)
@@ -91,17 +107,41 @@ class Model(object):
 
 
     def compile(self, dt=1.0, batch_size=1, rng_seed=0, reuse_genn_model=False,
-                kernel_profiling=False, **genn_kwargs):
+                kernel_profiling=False, spike_recording_time=None,
+                device_readout_time=None, build_cache_dir=None,
+                build_cache_size=16, **genn_kwargs):
         """Compile this ML GeNN model into a GeNN model
 
         Keyword args:
-        dt                --  model integration time step (default: 1.0)
-        batch_size        --  number of models to run concurrently (default: 1)
-        rng_seed          --  GeNN RNG seed (default: 0, meaning seed will be randomised at runtime)
-        reuse_genn_model  --  Reuse existing compiled GeNN model (default: False)
-        kernel_profiling  --  Build model with kernel profiling code (default: False)
+        dt                    --  model integration time step (default: 1.0)
+        batch_size            --  number of models to run concurrently (default: 1)
+        rng_seed              --  GeNN RNG seed (default: 0, meaning seed will be randomised at runtime)
+        reuse_genn_model      --  Reuse existing compiled GeNN model (default: False)
+        kernel_profiling      --  Build model with kernel profiling code (default: False)
+        spike_recording_time  --  sample presentation time (msec) to allocate on-device spike
+                                  recording buffers for (default: None, meaning spikes are
+                                  not recorded on device)
+        device_readout_time   --  sample presentation time (msec) to compile on-device
+                                  readouts of output layers' predictions for, where
+                                  supported (default: None, meaning predictions are
+                                  always read out on the host)
+        build_cache_dir       --  directory to cache built GeNN models in, keyed by a hash of
+                                  the model graph and build options (default: None, meaning
+                                  use $ML_GENN_BUILD_CACHE if set, otherwise build the model
+                                  in the working directory)
+        build_cache_size      --  maximum number of built models to keep in the cache,
+                                  least recently used are evicted first (default: 16)
         """
 
+        # Store arguments so worker processes can load the same model
+        self._compile_kwargs = dict(dt=dt, batch_size=batch_size, rng_seed=rng_seed,
+                                    kernel_profiling=kernel_profiling,
+                                    spike_recording_time=spike_recording_time,
+                                    device_readout_time=device_readout_time,
+                                    build_cache_dir=build_cache_dir,
+                                    build_cache_size=build_cache_size,
+                                    **genn_kwargs)
+
         # Define GeNN model
         self.g_model = GeNNModel('float', self.name, **genn_kwargs)
         self.g_model.dT = dt
@@ -109,20 +149,95 @@ class Model(object):
         self.g_model._model.set_seed(rng_seed)
         self.g_model.timing_enabled = kernel_profiling
 
+        # Calculate key identifying the code GeNN will generate for this model
+        self._set_synapse_delays()
+        self._build_key = self._get_build_key(self._compile_kwargs)
+
         # Prepare each layer
         for layer in self.layers:
             layer.compile_neurons(self)
         for layer in self.layers:
             layer.compile_synapses(self)
 
+        # Add on-device readouts of output layers' predictions
+        if device_readout_time is not None:
+            n_readout_steps = self._get_num_timesteps(device_readout_time)
+            for layer in self.outputs:
+                layer.neurons.compile_readout(self, layer, n_readout_steps)
+
+        # Enable on-device spike recording
+        if spike_recording_time is not None:
+            for layer in self.layers:
+                layer.neurons.nrn.spike_recording_enabled = True
+
         # Build and load GeNN model
-        if os.name == 'nt':
-            model_exists = os.path.isfile("./runner_Release.dll")
+        if build_cache_dir is None:
+            build_cache_dir = os.environ.get('ML_GENN_BUILD_CACHE')
+        build_start = perf_counter()
+        if build_cache_dir is not None:
+            # **NOTE** build cache keys include everything baked into generated code
+            # so, unlike reuse_genn_model, a stale build is never loaded
+            path_to_model = BuildCache(build_cache_dir, build_cache_size).build(
+                self._build_key, self.g_model)
+        else:
+            path_to_model = './'
+            if os.name == 'nt':
+                model_exists = os.path.isfile("./runner_Release.dll")
+            else:
+                model_exists = os.path.isfile('./' + self.name + '_CODE/librunner.so')
+            if not reuse_genn_model or not model_exists:
+                self.g_model.build()
+        load_start = perf_counter()
+        if spike_recording_time is None:
+            self.num_recording_timesteps = None
+            self.g_model.load(path_to_model=path_to_model)
         else:
-            model_exists = os.path.isfile('./' + self.name + '_CODE/librunner.so')
-        if not reuse_genn_model or not model_exists:
-            self.g_model.build()
-        self.g_model.load()
+            self.num_recording_timesteps = self._get_num_timesteps(spike_recording_time)
+            self.g_model.load(path_to_model=path_to_model,
+                              num_recording_timesteps=self.num_recording_timesteps)
+        self._step_time_n = load_step_time_n(path_to_model, self.name)
+
+        # Record how long building and loading took
+        self.build_time = load_start - build_start
+        self.load_time = perf_counter() - load_start
+
+
+    def _set_synapse_delays(self):
+        """Delay synapses from layers on shorter branches of the pipeline so
+        all input to each layer arrives in the same pipeline stage"""
+
+        input_stages, output_stages = self.calc_pipeline_stages()
+        for layer in self.layers:
+            for synapses in layer.upstream_synapses:
+                source = synapses.source()
+                stage_lag = input_stages[layer] - output_stages[source]
+                synapses.delay = stage_lag * source.neurons.K if stage_lag > 0 else 0
+
+
+    def _get_build_key(self, compile_kwargs):
+        """Get key identifying the code GeNN generates when compiling with compile_kwargs"""
+
+        return calc_build_key(self, 'float', {k: v for k, v in compile_kwargs.items()
+                                              if k not in ('build_cache_dir', 'build_cache_size')})
+
+
+    def _can_reuse(self, mlg_model, compile_kwargs):
+        """Can this compiled model be updated with the weights of an uncompiled model"""
+
+        if self.g_model is None or not self.g_model._loaded:
+            return False
+
+        # Any compile arguments specified must match those this model was compiled with
+        reuse_kwargs = {k: v for k, v in self._compile_kwargs.items()
+                        if k not in ('build_cache_dir', 'build_cache_size')}
+        for k, v in compile_kwargs.items():
+            if k not in ('build_cache_dir', 'build_cache_size', 'reuse_genn_model'):
+                if k not in reuse_kwargs or reuse_kwargs[k] != v:
+                    return False
+
+        # Other model must generate the same GeNN code
+        mlg_model._set_synapse_delays()
+        return mlg_model._get_build_key(reuse_kwargs) == self._build_key
 
 
     def set_input_batch(self, data_batch):
@@ -140,15 +255,86 @@ class Model(object):
             self.inputs[i].set_input_batch(data_batch[i])
 
 
+    def stage_input_batch(self, data_batch, staging=None):
+        """Copy a new batch of data into contiguous staging buffers
+
+        This can safely be called from a background thread while the model is
+        being simulated and the staged batch later set with set_staged_input_batch.
+        If the model keeps separate host copies of its variables, the input views
+        returned by get_input_staging can be used as staging buffers so the batch
+        is staged directly into them and only needs pushing to the device.
+
+        Args:
+        data_batch  --  list of data batches for each input layer
+
+        Keyword args:
+        staging     --  list of staging buffers to reuse (default: None, meaning allocate new buffers)
+
+        Returns:
+        list of staging buffers for each input layer
+        """
+
+        # Input sanity check
+        if len(data_batch) != len(self.inputs):
+            raise ValueError('data batch list length and input layer list length mismatch')
+
+        if staging is None:
+            staging = [None] * len(self.inputs)
+        return [l.stage_input_batch(x, s)
+                for l, x, s in zip(self.inputs, data_batch, staging)]
+
+
+    def get_input_staging(self):
+        """Get input views to use as staging buffers for stage_input_batch
+
+        Returns:
+        list of input views for each input layer or None if the host copies of
+        input variables are simulated directly so can't be staged into while
+        the model is being simulated
+        """
+
+        # **NOTE** the CPU backend simulates the host copies of variables
+        if self.g_model.backend_name not in ('CUDA', 'OpenCL'):
+            return None
+        return [l.get_input_view() for l in self.inputs]
+
+
+    def set_staged_input_batch(self, staging, batch_n):
+        """Set model input from a batch of data staged with stage_input_batch
+
+        Args:
+        staging  --  list of staging buffers for each input layer
+        batch_n  --  number of samples in staged batch
+        """
+
+        for layer, s in zip(self.inputs, staging):
+            layer.set_staged_input_batch(s, batch_n)
+
+
     def step_time(self, iterations=1):
         """Iterate the GeNN model a given number of steps
 
+        Where supported, all iterations are simulated in a single native call
+        which releases the GIL, so other Python threads run in the meantime.
+
         Keyword args:
         iterations  --  number of iterations (default: 1)
         """
 
-        for i in range(iterations):
-            self.g_model.step_time()
+        if self._step_time_n is None:
+            for i in range(iterations):
+                self.g_model.step_time()
+        else:
+            if not self.g_model._loaded:
+                raise RuntimeError('GeNN model has to be loaded before stepping')
+            self._step_time_n(iterations)
+
+
+    def _get_num_timesteps(self, time):
+        """Get number of timesteps required to simulate for a given time"""
+
+        # **NOTE** round first so float error in time / dt doesn't add a timestep
+        return int(np.ceil(np.round(time / self.g_model.dT, 6)))
 
 
     def reset(self):
@@ -158,24 +344,85 @@ class Model(object):
         self.g_model.t = 0.0
 
 
-    def evaluate(self, data, labels, time, save_samples=[]):
+    def set_weights(self, weights):
+        """Set weights of layers, updating the loaded GeNN model without rebuilding it
+
+        Args:
+        weights  --  dictionary mapping layer names to lists of weight arrays for
+                     each of the layer's upstream synapses
+        """
+
+        layers = {l.name: l for l in self.layers}
+        for name in weights.keys():
+            if name not in layers:
+                raise ValueError('model has no layer named <{}>'.format(name))
+
+        for name, w in weights.items():
+            layers[name].set_weights(w, push=False)
+
+        # If model is loaded, update device copies of weights,
+        # reinitialising model once if any synapses require it
+        if self.g_model is not None and self.g_model._loaded:
+            reinitialise = False
+            for name in weights.keys():
+                reinitialise |= layers[name].push_weights()
+            if reinitialise:
+                self.g_model.reinitialise()
+
+
+    def get_weights(self):
+        """Get weights of layers
+
+        Returns:
+        dictionary mapping layer names to lists of weight arrays for
+        each of the layer's upstream synapses
+        """
+
+        return {l.name: l.get_weights() for l in self.layers if l.upstream_synapses}
+
+
+    def evaluate(self, data, labels, time, save_samples=[], prefetch=False,
+                 early_exit_interval=None, early_exit_margin=None,
+                 early_exit_confidence=None, callbacks=[]):
         """Evaluate the accuracy of a GeNN model
 
         Args:
-        data          --  list of data for each input layer
-        labels        --  list of labels for each output layer
+        data          --  list of data for each input layer (arrays, np.memmaps, paths
+                          to .npy files or paths to directories of .npy shards)
+        labels        --  list of labels for each output layer (in the same forms as data)
         time          --  sample presentation time (msec)
 
         Keyword args:
-        save_samples  --  list of sample indices to save spikes for (default: [])
+        save_samples           --  list of sample indices to save spikes for (default: [])
+        prefetch               --  prepare the next batch on a background thread while
+                                   the current batch is simulated (default: False)
+        early_exit_interval    --  number of timesteps between checks of whether every
+                                   sample in the batch has been classified with enough
+                                   certainty to end its presentation early (default: None,
+                                   meaning always present samples for the full time)
+        early_exit_margin      --  minimum difference between the two highest output
+                                   spike counts for a sample to be decided (default: None)
+        early_exit_confidence  --  minimum fraction of output spikes emitted by the most
+                                   active output neuron for a sample to be decided (default: None)
+        callbacks              --  list of Callback objects to call during evaluation
+                                   (default: [])
+
+        If early exit is enabled, the mean number of timesteps each sample
+        was presented for is stored in Model.mean_timesteps.
 
         Returns:
         accuracy      --  percentage of correctly classified results
         spike_i       --  list of spike indices for each sample index in save_samples
         spike_t       --  list of spike times for each sample index in save_samples
+
+        These are returned as an EvaluateResult tuple whose spikes attribute holds
+        the underlying SpikeRecording, from which spike indices and times are only
+        decoded when accessed.
         """
 
         # Input sanity check
+        data = [load_data(x) for x in data]
+        labels = [load_data(y) for y in labels]
         n_samples = data[0].shape[0]
         save_samples = list(set(save_samples))
         if len(data) != len(self.inputs):
@@ -187,81 +434,468 @@ class Model(object):
         if any(i < 0 or i >= n_samples for i in save_samples):
             raise ValueError('one or more invalid save_samples value')
 
-        n_correct = [0] * len(self.outputs)
-        accuracy = [0] * len(self.outputs)
-        all_spikes = [[[] for i,_ in enumerate(self.layers)] for s in save_samples]
+        batches = array_batches(data, labels, self.g_model.batch_size)
+        result, _ = self._evaluate_batches(batches, time, save_samples, n_samples, prefetch,
+                                           early_exit_interval, early_exit_margin,
+                                           early_exit_confidence, callbacks)
+        return result
+
+
+    def evaluate_batched(self, dataset, time, save_samples=[], prefetch=False,
+                         early_exit_interval=None, early_exit_margin=None,
+                         early_exit_confidence=None, callbacks=[]):
+        """Evaluate the accuracy of a GeNN model on a stream of data
+
+        Unlike evaluate, the dataset is never fully materialised so memory
+        use does not depend on the size of the dataset.
+
+        Args:
+        dataset       --  iterable of (data_batch, label_batch) chunks of any size, e.g. a
+                          Python generator or tf.data.Dataset. Data and label batches are
+                          either lists with an array for each input/output layer or, for
+                          models with a single input/output layer, a single array.
+        time          --  sample presentation time (msec)
+
+        Keyword args:
+        save_samples           --  list of sample indices to save spikes for (default: [])
+        prefetch               --  read and prepare the next batch on a background thread
+                                   while the current batch is simulated (default: False)
+        early_exit_interval    --  number of timesteps between early exit checks (default: None)
+        early_exit_margin      --  minimum output spike count margin for early exit (default: None)
+        early_exit_confidence  --  minimum output spike fraction for early exit (default: None)
+        callbacks              --  list of Callback objects to call during evaluation (default: [])
+
+        See evaluate for details of early exit.
+
+        Returns:
+        accuracy      --  percentage of correctly classified results
+        spike_i       --  list of spike indices for each sample index in save_samples
+        spike_t       --  list of spike times for each sample index in save_samples
+
+        These are returned as an EvaluateResult tuple whose spikes attribute holds
+        the underlying SpikeRecording, from which spike indices and times are only
+        decoded when accessed.
+        """
+
+        save_samples = list(set(save_samples))
+        if any(i < 0 for i in save_samples):
+            raise ValueError('one or more invalid save_samples value')
+
+        batches = batch_dataset(dataset, self.g_model.batch_size)
+        result, _ = self._evaluate_batches(batches, time, save_samples, None, prefetch,
+                                           early_exit_interval, early_exit_margin,
+                                           early_exit_confidence, callbacks)
+        return result
+
+
+    def predict(self, data, time):
+        """Predict the output class of each sample with a GeNN model
+
+        Unlike evaluate, no labels are required and no progress or accuracy
+        is reported, so this is suitable for offline scoring and serving.
+
+        Args:
+        data         --  list of data for each input layer (arrays, np.memmaps, paths
+                         to .npy files or paths to directories of .npy shards)
+        time         --  sample presentation time (msec)
+
+        Returns:
+        predictions  --  list of arrays of predicted class of each sample for each output layer
+        scores       --  list of arrays of output scores (spike counts or FewSpike
+                         outputs) of each sample for each output layer
+        """
+
+        # Input sanity check
+        data = [load_data(x) for x in data]
+        n_samples = data[0].shape[0]
+        if len(data) != len(self.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+        if not all(x.shape[0] == n_samples for x in data):
+            raise ValueError('sample count mismatch in data arrays')
 
-        # Pad number of samples so pipeline can be flushed
+        # Pipeline depth of model
         pipeline_depth = self.calc_pipeline_depth()
-        padded_n_samples = n_samples + (pipeline_depth * self.g_model.batch_size)
 
-        # Process batches
-        progress = tqdm(total=n_samples)
-        for batch_start in range(0, padded_n_samples, self.g_model.batch_size):
-            # If any elements of this batch have data (rather than being entirely pipeline padding)
-            if batch_start < n_samples:
-                batch_end = min(batch_start + self.g_model.batch_size, n_samples)
-                batch_data = [x[batch_start:batch_end] for x in data]
+        scores = [np.empty((n_samples, int(np.prod(o.shape))), dtype=np.float32)
+                  for o in self.outputs]
 
-                save_samples_in_batch = [i for i in save_samples if batch_start <= i < batch_end]
+        # Pad batches so pipeline can be flushed
+        batches = array_batches(data, None, self.g_model.batch_size)
+        padded_batches = chain(batches, repeat(None, pipeline_depth))
 
-                # Set new input
+        # Process batches
+        n_steps = self._get_num_timesteps(time)
+        pipeline_starts = deque()
+        batch_start = 0
+        for batch_i, batch in enumerate(padded_batches):
+            if batch is not None:
+                batch_data, _ = batch
                 self.set_input_batch(batch_data)
+                pipeline_starts.append(batch_start)
+                batch_start += batch_data[0].shape[0]
 
-            # Reset timesteps etc
+            # Reset timesteps etc and simulate batch
             self.reset()
+            self.step_time(n_steps)
+
+            # If first input in batch has passed through, copy out scores
+            if batch_i >= pipeline_depth:
+                pipe_batch_start = pipeline_starts.popleft()
+                pipe_batch_end = min(pipe_batch_start + self.g_model.batch_size, n_samples)
+                for o, s in zip(self.outputs, scores):
+                    s[pipe_batch_start:pipe_batch_end] = o.neurons.get_scores(
+                        pipe_batch_end - pipe_batch_start)
+
+        predictions = [s.argmax(axis=1) for s in scores]
+        return predictions, scores
+
+
+    def evaluate_parallel(self, data, labels, time, num_workers=None, save_samples=[]):
+        """Evaluate the accuracy of a GeNN model using several worker processes
+
+        The dataset is split into contiguous shards, each of which is evaluated
+        by a worker process which loads its own instance of the compiled GeNN
+        model. Workers are forked so this is only supported on POSIX systems
+        and is intended for use with the CPU_ONLY backend. For deterministic
+        input types, results match those of evaluate.
+
+        Args:
+        data          --  list of data for each input layer (arrays, np.memmaps, paths
+                          to .npy files or paths to directories of .npy shards)
+        labels        --  list of labels for each output layer (in the same forms as data)
+        time          --  sample presentation time (msec)
+
+        Keyword args:
+        num_workers   --  number of worker processes (default: None, meaning one per CPU)
+        save_samples  --  list of sample indices to save spikes for (default: [])
+
+        Returns:
+        accuracy      --  percentage of correctly classified results
+        spike_i       --  list of spike indices for each sample index in save_samples
+        spike_t       --  list of spike times for each sample index in save_samples
+
+        Spikes are returned in ascending order of sample index.
+        """
+
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise NotImplementedError('parallel evaluation requires fork support')
+
+        # Input sanity check
+        data = [load_data(x) for x in data]
+        labels = [load_data(y) for y in labels]
+        n_samples = data[0].shape[0]
+        save_samples = sorted(set(save_samples))
+        if len(data) != len(self.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+        if len(labels) != len(self.outputs):
+            raise ValueError('label list length and output layer list length mismatch')
+        if not all(x.shape[0] == n_samples for x in data + labels):
+            raise ValueError('sample count mismatch in data and labels arrays')
+        if any(i < 0 or i >= n_samples for i in save_samples):
+            raise ValueError('one or more invalid save_samples value')
+
+        # Split dataset into contiguous shards
+        if num_workers is None:
+            num_workers = os.cpu_count()
+        num_workers = max(1, min(num_workers, n_samples))
+        shard_starts = [(n_samples * w) // num_workers for w in range(num_workers + 1)]
+
+        # Fork a worker to evaluate each shard
+        context = multiprocessing.get_context('fork')
+        workers = []
+        for start, end in zip(shard_starts[:-1], shard_starts[1:]):
+            recv_conn, send_conn = context.Pipe(duplex=False)
+            worker = context.Process(
+                target=_evaluate_shard,
+                args=(self, send_conn, [x[start:end] for x in data],
+                      [y[start:end] for y in labels], time,
+                      [i - start for i in save_samples if start <= i < end]))
+            worker.start()
+            send_conn.close()
+            workers.append((worker, recv_conn))
+
+        # Gather results
+        results = []
+        for worker, recv_conn in workers:
+            try:
+                result = recv_conn.recv()
+            except EOFError:
+                result = None
+            worker.join()
+            if result is None:
+                result = RuntimeError('worker process exited with code {}'.format(
+                    worker.exitcode))
+            results.append(result)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        # Merge correct counts and spikes
+        n_correct = [sum(shard_n_correct[output_i] for shard_n_correct, _ in results)
+                     for output_i in range(len(self.outputs))]
+        accuracy = [(n / n_samples) * 100 for n in n_correct]
+        spikes = SpikeRecording.concatenate([s for _, s in results], shard_starts[:-1])
+
+        return EvaluateResult(accuracy, spikes)
+
+
+    def _evaluate_batches(self, batches, time, save_samples, n_samples=None, prefetch=False,
+                          early_exit_interval=None, early_exit_margin=None,
+                          early_exit_confidence=None, callbacks=[], progress=True):
+        """Evaluate the accuracy of a GeNN model on an iterator of batches
+
+        Returns:
+        result     --  EvaluateResult tuple of accuracy and spikes
+        n_correct  --  list of number of correctly classified samples for each output layer
+        """
+
+        from tqdm import tqdm
+
+        # Pipeline depth of model
+        pipeline_depth = self.calc_pipeline_depth()
+
+        # Early exit sanity check
+        early_exit = early_exit_interval is not None
+        if early_exit:
+            if early_exit_margin is None and early_exit_confidence is None:
+                raise ValueError('early exit requires a margin or confidence criterion')
+            if pipeline_depth > 0:
+                raise NotImplementedError('early exit not supported for pipelined models')
+            for o in self.outputs:
+                if not getattr(o.neurons, 'supports_early_exit', False):
+                    raise NotImplementedError('early exit not supported for {} output '
+                                              'neurons'.format(type(o.neurons).__name__))
+
+        # If prefetching, stage batches on background thread, directly into
+        # input views if possible so only pushing them is left to this thread
+        if prefetch:
+            input_staging = self.get_input_staging()
+            prefetcher = BatchPrefetcher(
+                batches, self.stage_input_batch,
+                buffers=None if input_staging is None else [input_staging])
+            batches = ((s, labels, n) for s, n, labels in prefetcher)
+
+        n_correct = [0] * len(self.outputs)
+        accuracy = [0] * len(self.outputs)
+        save_sample_index = {s: k for k, s in enumerate(save_samples)}
+        all_spikes = [[[] for i,_ in enumerate(self.layers)] for s in save_samples]
+        spikes = SpikeRecording(save_samples, [l.name for l in self.layers],
+                                [int(np.prod(l.shape)) for l in self.layers],
+                                self.g_model.dT)
+
+        # If spikes are recorded on device for this presentation time, pull
+        # them from the recording buffers once per batch, otherwise fall back
+        # to pulling the current spikes of every layer after every timestep
+        # **NOTE** recording buffers are only full if presentation isn't ended early
+        use_recording = (self.num_recording_timesteps is not None and not early_exit and
+                         self.num_recording_timesteps == self._get_num_timesteps(time))
+
+        # Determine whether every sample in batch has been decided
+        def batch_decided(batch_n):
+            return all(np.all(o.neurons.get_decided(batch_n, early_exit_margin,
+                                                    early_exit_confidence))
+                       for o in self.outputs)
+
+        # Pad batches so pipeline can be flushed
+        pipeline_labels = deque()
+        padded_batches = chain(batches, repeat(None, pipeline_depth))
+
+        # Callbacks which require model to be stepped one timestep at a time
+        step_callbacks = [c for c in callbacks if c.uses_on_step()]
+        for c in callbacks:
+            c.set_model(self)
+
+        # Process batches
+        n_steps = self._get_num_timesteps(time)
+        progress_bar = tqdm(total=n_samples, disable=not progress)
+        batch_start = 0
+        n_complete = 0
+        n_timesteps = 0
+        try:
+            for batch_i, batch in enumerate(padded_batches):
+                input_start = perf_counter()
+
+                # If this batch has data (rather than being entirely pipeline padding)
+                if batch is not None:
+                    if prefetch:
+                        staging, batch_labels, batch_n = batch
+                    else:
+                        batch_data, batch_labels = batch
+                        batch_n = batch_data[0].shape[0]
+                    batch_end = batch_start + batch_n
+                    if batch_labels is None:
+                        raise ValueError('labels are required for evaluation')
+                    if len(batch_labels) != len(self.outputs):
+                        raise ValueError('label list length and output layer list length mismatch')
+
+                    save_samples_in_batch = [i for i in save_samples if batch_start <= i < batch_end]
+
+                    # Set new input
+                    if prefetch:
+                        self.set_staged_input_batch(staging, batch_n)
+                        prefetcher.release(staging)
+                    else:
+                        self.set_input_batch(batch_data)
+                    pipeline_labels.append(batch_labels)
+                else:
+                    batch_n = 0
+                    batch_end = batch_start
+                    save_samples_in_batch = []
+
+                for c in callbacks:
+                    c.on_batch_begin(batch_i, {'batch_n': batch_n})
+
+                # Reset timesteps etc
+                self.reset()
+
+                # Main simulation loop
+                sim_start = perf_counter()
+                spike_time = 0.0
+                save_every_step = not use_recording and len(save_samples_in_batch) > 0
+                if save_every_step or len(step_callbacks) > 0:
+                    # Step one timestep at a time, saving spikes after each
+                    for timestep in range(n_steps):
+                        self.step_time()
+
+                        if save_every_step:
+                            spike_start = perf_counter()
+                            for i in save_samples_in_batch:
+                                k = save_sample_index[i]
+                                lane = i - batch_start
+                                for l, layer in enumerate(self.layers):
+                                    nrn = layer.neurons.nrn
+                                    nrn.pull_current_spikes_from_device()
+                                    all_spikes[k][l].append(np.copy(
+                                        nrn.current_spikes[lane] if self.g_model.batch_size > 1
+                                        else nrn.current_spikes))
+                            spike_time += perf_counter() - spike_start
+
+                        for c in step_callbacks:
+                            c.on_step(self.g_model.timestep)
+
+                        # End presentation if every sample in batch has been decided
+                        if (early_exit and ((timestep + 1) % early_exit_interval) == 0
+                                and batch_decided(batch_n)):
+                            break
+                elif early_exit:
+                    # Step between early exit checks in bulk
+                    while self.g_model.timestep < n_steps:
+                        self.step_time(min(early_exit_interval, n_steps - self.g_model.timestep))
+                        if batch_decided(batch_n):
+                            break
+                else:
+                    self.step_time(n_steps)
 
-            # Main simulation loop
-            while self.g_model.t < time:
-                # Step time
-                self.step_time()
+                batch_timesteps = self.g_model.timestep
+                n_timesteps += batch_timesteps * batch_n
 
-                # Save spikes
-                for i in save_samples_in_batch:
-                    k = save_samples.index(i)
-                    batch_i = i - batch_start
+                # Save spikes from recording buffers
+                recording_start = perf_counter()
+                if use_recording and len(save_samples_in_batch) > 0:
+                    self.g_model.pull_recording_buffers_from_device()
                     for l, layer in enumerate(self.layers):
-                        nrn = layer.neurons.nrn
-                        nrn.pull_current_spikes_from_device()
-                        all_spikes[k][l].append(np.copy(
-                            nrn.current_spikes[batch_i] if self.g_model.batch_size > 1
-                            else nrn.current_spikes))
-
-            # If first input in batch has passed through
-            if batch_start >= (pipeline_depth * self.g_model.batch_size):
-                pipe_batch_start = batch_start - (pipeline_depth * self.g_model.batch_size)
-                pipe_batch_end = min(pipe_batch_start + self.g_model.batch_size, n_samples)
-                batch_labels = [y[pipe_batch_start:pipe_batch_end] for y in labels]
+                        recording = layer.neurons.nrn.spike_recording_data
+                        for i in save_samples_in_batch:
+                            k = save_sample_index[i]
+                            lane = i - batch_start
+                            times, ids = (recording[lane] if self.g_model.batch_size > 1
+                                          else recording)
+                            spikes.set_spikes(k, l, np.rint(times / self.g_model.dT), ids,
+                                              self.num_recording_timesteps)
+                spike_time += perf_counter() - recording_start
+
+                batch_start = batch_end
+
+                # If first input in batch has passed through
+                readout_start = accuracy_start = accuracy_end = perf_counter()
+                if batch_i >= pipeline_depth:
+                    batch_labels = pipeline_labels.popleft()
+                    pipe_batch_n = batch_labels[0].shape[0]
+                    n_complete += pipe_batch_n
+
+                    # Read out predictions
+                    predictions = [o.neurons.get_predictions(pipe_batch_n) for o in self.outputs]
+                    accuracy_start = perf_counter()
+
+                    # Compute accuracy
+                    for output_i in range(len(self.outputs)):
+                        n_correct[output_i] += np.sum(predictions[output_i] == batch_labels[output_i])
+                        accuracy[output_i] = (n_correct[output_i] / n_complete) * 100
+
+                    if early_exit:
+                        progress_bar.set_postfix_str('accuracy: {:2.2f}, timesteps: {:.1f}'.format(
+                            np.mean(accuracy), n_timesteps / n_complete))
+                    else:
+                        progress_bar.set_postfix_str('accuracy: {:2.2f}'.format(np.mean(accuracy)))
+                    progress_bar.update(pipe_batch_n)
+                    accuracy_end = perf_counter()
+
+                if callbacks:
+                    logs = {'batch_n': batch_n, 'timesteps': batch_timesteps,
+                            'accuracy': list(accuracy),
+                            'input_time': sim_start - input_start,
+                            'simulation_time': recording_start - sim_start - spike_time,
+                            'readout_time': accuracy_start - readout_start,
+                            'spikes_time': spike_time,
+                            'accuracy_time': accuracy_end - accuracy_start}
+                    for c in callbacks:
+                        c.on_batch_end(batch_i, logs)
+        finally:
+            # Stop prefetching if batches were not all consumed
+            if prefetch:
+                prefetcher.close()
+
+        progress_bar.close()
+
+        # Calculate mean number of timesteps each sample was presented for
+        self.mean_timesteps = (n_timesteps / n_complete) if n_complete > 0 else 0.0
+
+        if any(i >= n_complete for i in save_samples):
+            raise ValueError('one or more invalid save_samples value')
 
-                # Compute accuracy
-                for output_i in range(len(self.outputs)):
-                    predictions = self.outputs[output_i].neurons.get_predictions(
-                        pipe_batch_end - pipe_batch_start)
-                    n_correct[output_i] += np.sum(predictions == batch_labels[output_i])
-                    accuracy[output_i] = (n_correct[output_i] / pipe_batch_end) * 100
+        # Store spikes pulled every timestep
+        if not use_recording:
+            for k in range(len(save_samples)):
+                for l in range(len(self.layers)):
+                    spikes.set_timestep_spikes(k, l, all_spikes[k][l])
 
-                progress.set_postfix_str('accuracy: {:2.2f}'.format(np.mean(accuracy)))
-                progress.update(pipe_batch_end - pipe_batch_start)
+        for c in callbacks:
+            c.on_eval_end({'accuracy': list(accuracy),
+                           'mean_timesteps': self.mean_timesteps})
 
-        progress.close()
+        return EvaluateResult(accuracy, spikes), [int(n) for n in n_correct]
 
-        # Create spike index and time lists
-        spike_i = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
-        spike_t = [[None for i,_ in enumerate(self.layers)] for s in save_samples]
-        for i in range(len(save_samples)):
-            for j in range(len(self.layers)):
-                spikes = all_spikes[i][j]
-                spike_i[i][j] = np.concatenate(spikes)
-                spike_t[i][j] = np.concatenate([np.ones_like(s) * i * self.g_model.dT for i, s in enumerate(spikes)])
+    def calc_pipeline_stages(self):
+        """Calculate pipeline stage of each layer from the longest path through the model
 
-        return accuracy, spike_i, spike_t
+        Each pipelined layer delays its output by one sample presentation so,
+        for the first batch, a layer's input arrives in the stage of the
+        latest of its upstream layers' outputs.
+
+        Returns:
+        input_stages   --  dictionary of stage in which each layer receives input
+        output_stages  --  dictionary of stage in which each layer emits output
+        """
+
+        input_stages = {}
+        output_stages = {}
+
+        # **NOTE** layers are topologically sorted so upstream stages are always known
+        for layer in self.layers:
+            input_stages[layer] = max((output_stages[s.source()]
+                                       for s in layer.upstream_synapses), default=0)
+            output_stages[layer] = (input_stages[layer] + 1
+                                    if hasattr(layer.neurons, "pipelined")
+                                    else input_stages[layer])
+
+        return input_stages, output_stages
 
     def calc_pipeline_depth(self):
         """Calculate depth of model's pipeline"""
-        # **TODO** this only works for sequential models, branches need to be identified etc with e.g. ResNets
-        return int(sum(hasattr(l.neurons, "pipelined")
-                       for l in self.layers
-                       if l not in self.outputs))
+
+        input_stages, _ = self.calc_pipeline_stages()
+        return max(input_stages[l] for l in self.outputs)
 
     def get_kernel_times(self):
         """Get total kernel run times"""
@@ -291,7 +925,8 @@ class Model(object):
 
     @staticmethod
     def convert_tf_model(tf_model, converter=Simple(),
-                         connectivity_type='procedural', **compile_kwargs):
+                         connectivity_type='procedural', reuse_mlg_model=None,
+                         **compile_kwargs):
         """Create a ML GeNN model from a TensorFlow model
 
         Args:
@@ -300,291 +935,304 @@ class Model(object):
         Keyword args:
         input_type         --  type of input neurons (default: 'poisson')
         connectivity_type  --  type of synapses in GeNN (default: 'procedural')
+        reuse_mlg_model    --  compiled ML GeNN model to update with the converted weights and
+                               thresholds, rather than compiling a new model, if it would generate
+                               identical GeNN code (default: None, meaning always compile new model)
+        compile_kwargs     --  additional arguments to pass through to Model.compile (when reusing
+                               a model, any omitted arguments take the reused model's values)
+        """
+
+        return Model.convert_keras_graph(KerasGraph.from_tf_model(tf_model), converter,
+                                         connectivity_type, reuse_mlg_model, **compile_kwargs)
+
+
+    @staticmethod
+    def convert_keras_h5(path, converter=Simple(),
+                         connectivity_type='procedural', reuse_mlg_model=None,
+                         **compile_kwargs):
+        """Create a ML GeNN model from a Keras HDF5 file without using TensorFlow
+
+        Converters which calculate normalisation statistics by running the
+        TensorFlow model must be given precomputed activations instead.
+
+        Args:
+        path  --  path to HDF5 file saved with tf.keras.Model.save
+
+        Keyword args:
+        connectivity_type  --  type of synapses in GeNN (default: 'procedural')
+        reuse_mlg_model    --  compiled ML GeNN model to update with the converted weights and
+                               thresholds (see convert_tf_model)
         compile_kwargs     --  additional arguments to pass through to Model.compile
         """
 
-        supported_tf_layers = (
-            tf.keras.layers.InputLayer,
-            tf.keras.layers.Dense,
-            tf.keras.layers.Conv2D,
-            tf.keras.layers.AveragePooling2D,
-            tf.keras.layers.GlobalAveragePooling2D,
-            tf.keras.layers.Add,
-            tf.keras.layers.Flatten,
-            tf.keras.layers.Dropout)
-
-        weighted_tf_layers = (
-            tf.keras.layers.Dense,
-            tf.keras.layers.Conv2D)
-
-        ignored_tf_layers = (
-            tf.keras.layers.Add,
-            tf.keras.layers.Flatten,
-            tf.keras.layers.Dropout)
+        return Model.convert_keras_graph(KerasGraph.from_h5(path), converter,
+                                         connectivity_type, reuse_mlg_model, **compile_kwargs)
+
+
+    @staticmethod
+    def convert_keras_graph(graph, converter=Simple(),
+                            connectivity_type='procedural', reuse_mlg_model=None,
+                            **compile_kwargs):
+        """Create a ML GeNN model from a KerasGraph
+
+        Args:
+        graph  --  KerasGraph describing model to be converted
+
+        Keyword args:
+        connectivity_type  --  type of synapses in GeNN (default: 'procedural')
+        reuse_mlg_model    --  compiled ML GeNN model to update with the converted weights and
+                               thresholds (see convert_tf_model)
+        compile_kwargs     --  additional arguments to pass through to Model.compile
+        """
+
+        supported_layers = (
+            'InputLayer',
+            'Dense',
+            'Conv2D',
+            'AveragePooling2D',
+            'GlobalAveragePooling2D',
+            'Add',
+            'Flatten',
+            'Dropout')
+
+        weighted_layers = (
+            'Dense',
+            'Conv2D')
+
+        ignored_layers = (
+            'Add',
+            'Flatten',
+            'Dropout')
+
+        pool_layers = (
+            'AveragePooling2D',
+            'GlobalAveragePooling2D')
 
         # Check model compatibility
-        for tf_layer in tf_model.layers[:-1]:
-            if not isinstance(tf_layer, supported_tf_layers):
+        for layer in graph.layers[:-1]:
+            if layer.class_name not in supported_layers:
                 raise NotImplementedError('{} layers not supported'.format(
-                    tf_layer.__class__.__name__))
-            if isinstance(tf_layer, weighted_tf_layers):
-                converter.validate_tf_layer(tf_layer)
-
-        # only traverse nodes belonging to this model
-        tf_model_nodes = set()
-        for n in tf_model._nodes_by_depth.values():
-            tf_model_nodes.update(n)
-
-        # get inbound and outbound layers
-        tf_in_layers_all = {}
-        tf_out_layers_all = {}
-        for tf_layer in tf_model.layers:
-
-            # find inbound layers
-            tf_in_layers = []
-            for n in tf_layer.inbound_nodes:
-                if n not in tf_model_nodes:
-                    continue
-                if isinstance(n.inbound_layers, list):
-                    tf_in_layers += n.inbound_layers
-                else:
-                    tf_in_layers.append(n.inbound_layers)
-            tf_in_layers_all[tf_layer] = tf_in_layers
-
-            # find outbound layers
-            tf_out_layers = [n.outbound_layer for n in tf_layer.outbound_nodes
-                             if n in tf_model_nodes]
-            tf_out_layers_all[tf_layer] = tf_out_layers
+                    layer.class_name))
+            if layer.class_name in weighted_layers:
+                converter.validate_tf_layer(layer)
 
         # function for traversing upstream layers
-        def traverse_tf_in_layers(in_layers):
-            new_in_layers = set(in_layers)
+        def traverse_in_layers(in_layer_names):
+            new_in_layers = set(in_layer_names)
             final_in_layers = set()
 
             while new_in_layers:
-                layer = new_in_layers.pop()
-                if isinstance(layer, ignored_tf_layers):
-                    new_in_layers.update(tf_in_layers_all[layer])
+                layer = graph.get_layer(new_in_layers.pop())
+                if layer.class_name in ignored_layers:
+                    new_in_layers.update(layer.inbound_names)
                 else:
                     final_in_layers.add(layer)
 
             return final_in_layers
 
-        # function for traversing downstream layers
-        def traverse_tf_out_layers(out_layers):
-            new_out_layers = set(out_layers)
-            final_out_layers = set()
-
-            while new_out_layers:
-                layer = new_out_layers.pop()
-                if isinstance(layer, ignored_tf_layers):
-                    new_out_layers.update(tf_out_layers_all[layer])
-                else:
-                    final_out_layers.add(layer)
-
-            return final_out_layers
-
 
         # Perform any pre-compilation tasks
-        pre_compile_output = converter.pre_compile(tf_model)
+        pre_compile_output = converter.pre_compile(graph)
 
         # configure ML GeNN model build process
         mlg_model_inputs = []
         mlg_model_outputs = []
         mlg_layer_lookup = {}
-        new_tf_layers = set()
-        traversed_tf_layers = set()
-
-        if isinstance(tf_model, tf.keras.models.Sequential):
-            # In TF Sequential models, the InputLayer is not stored in the model object,
-            # so we must traverse back through nodes to find the input layer's outputs.
-            tf_in_layers = tf_in_layers_all[tf_model.layers[0]]
-            assert(len(tf_in_layers) == 1)
-            tf_out_layers = [n.outbound_layer for n in tf_in_layers[0].outbound_nodes
-                             if n in tf_model_nodes]
-            tf_out_layers_all[tf_in_layers[0]] = tf_out_layers
-
-        else:
-            # TF Functional models store all their InputLayers, so no trickery needed.
-            tf_in_layers = [tf_model.get_layer(name) for name in tf_model.input_names]
+        new_layers = set()
+        traversed_layers = set()
 
         # === Input Layers ===
-        for tf_layer in tf_in_layers:
-            new_tf_layers.add(tf_layer)
-
-            print('configuring Input layer <{}>'.format(tf_layer.name))
+        for layer in graph.inputs:
+            new_layers.add(layer.name)
 
-            name = tf_layer.name
-            assert(len(tf_layer.input_shape) == 1)
-            shape = tf_layer.input_shape[0][1:]
+            print('configuring Input layer <{}>'.format(layer.name))
 
             # create layer
-            mlg_layer = InputLayer(name=name, shape=shape,
+            mlg_layer = InputLayer(name=layer.name, shape=layer.input_shape,
                 neurons=converter.create_input_neurons(pre_compile_output))
 
-            mlg_layer_lookup[tf_layer] = mlg_layer
+            mlg_layer_lookup[layer.name] = mlg_layer
             mlg_model_inputs.append(mlg_layer)
 
         # while there are still layers to traverse
-        while new_tf_layers:
-            new_tf_layer = new_tf_layers.pop()
-            traversed_tf_layers.add(new_tf_layer)
+        while new_layers:
+            new_layer = graph.get_layer(new_layers.pop())
+            traversed_layers.add(new_layer.name)
 
-            # get next TF layer to configure
-            for tf_layer in tf_out_layers_all[new_tf_layer]:
-                tf_in_layers = set(tf_in_layers_all[tf_layer])
-                tf_out_layers = set(tf_out_layers_all[tf_layer])
+            # get next layer to configure
+            for layer in [graph.get_layer(n) for n in new_layer.outbound_names]:
 
                 # skip if we still need to configure inbound layers
-                if not traversed_tf_layers.issuperset(tf_in_layers):
+                if not traversed_layers.issuperset(layer.inbound_names):
                     continue
 
                 # add this layer to new layers list
-                new_tf_layers.add(tf_layer)
+                new_layers.add(layer.name)
 
                 # traverse ignored layers to find more inputs
-                tf_in_layers = traverse_tf_in_layers(tf_in_layers)
+                in_layers = traverse_in_layers(layer.inbound_names)
 
                 # configure layer
-                print('configuring {} layer <{}>'.format(
-                    tf_layer.__class__.__name__, tf_layer.name))
+                print('configuring {} layer <{}>'.format(layer.class_name, layer.name))
 
                 # === Dense Layers ===
-                if isinstance(tf_layer, tf.keras.layers.Dense):
-                    name = tf_layer.name
+                if layer.class_name == 'Dense':
                     sources = []
                     synapses = []
                     weights = []
 
                     # create layer
-                    mlg_layer = Layer(name=name, neurons=converter.create_neurons(
-                        tf_layer, pre_compile_output))
+                    mlg_layer = Layer(name=layer.name, neurons=converter.create_neurons(
+                        layer, pre_compile_output))
 
                     # create synapses
-                    for tf_in_layer in tf_in_layers:
+                    for in_layer in in_layers:
 
-                        if isinstance(tf_in_layer, (
-                                tf.keras.layers.AveragePooling2D,
-                                tf.keras.layers.GlobalAveragePooling2D)):
+                        if in_layer.class_name in pool_layers:
 
                             # traverse ignored layers to find more inputs
-                            pool_in_layers = traverse_tf_in_layers(tf_in_layers_all[tf_in_layer])
-
-                            # set pooling or global pooling
-                            if isinstance(tf_in_layer, tf.keras.layers.AveragePooling2D):
-                                pool_size = tf_in_layer.pool_size
-                                pool_strides = tf_in_layer.strides
-                                pool_padding = tf_in_layer.padding
-                            elif isinstance(tf_in_layer, tf.keras.layers.GlobalAveragePooling2D):
-                                pool_size = tf_in_layer.input_shape[1:3]
-                                pool_strides = None
-                                pool_padding = 'valid'
+                            pool_in_layers = traverse_in_layers(in_layer.inbound_names)
 
                             # create connections for all pool layer inputs
                             for pool_in_layer in pool_in_layers:
-                                sources.append(mlg_layer_lookup[pool_in_layer])
+                                source = mlg_layer_lookup[pool_in_layer.name]
+
+                                # set pooling or global pooling
+                                if in_layer.class_name == 'AveragePooling2D':
+                                    pool_size = in_layer.pool_size
+                                    pool_strides = in_layer.strides
+                                    pool_padding = in_layer.padding
+                                else:
+                                    pool_size = source.shape[:2]
+                                    pool_strides = None
+                                    pool_padding = 'valid'
+
+                                sources.append(source)
                                 synapses.append(AvePool2DDenseSynapses(
-                                    units=tf_layer.units,
+                                    units=layer.units,
                                     pool_size=pool_size,
                                     pool_strides=pool_strides,
                                     pool_padding=pool_padding,
                                     connectivity_type=connectivity_type))
-                                weights.append(tf_layer.get_weights()[0])
+                                weights.append(layer.get_weights()[0])
 
                         else:
-                            sources.append(mlg_layer_lookup[tf_in_layer])
-                            synapses.append(DenseSynapses(units=tf_layer.units))
-                            weights.append(tf_layer.get_weights()[0])
+                            sources.append(mlg_layer_lookup[in_layer.name])
+                            synapses.append(DenseSynapses(units=layer.units))
+                            weights.append(layer.get_weights()[0])
 
                     # connect layer and set weights
                     mlg_layer.connect(sources, synapses)
                     mlg_layer.set_weights(weights)
 
-                    mlg_layer_lookup[tf_layer] = mlg_layer
-                    if len(tf_out_layers) == 0:
+                    mlg_layer_lookup[layer.name] = mlg_layer
+                    if len(layer.outbound_names) == 0:
                         # no outbound layers, so it must be an output
                         mlg_model_outputs.append(mlg_layer)
 
                 # === Conv2D Layers ===
-                elif isinstance(tf_layer, tf.keras.layers.Conv2D):
-                    name = tf_layer.name
+                elif layer.class_name == 'Conv2D':
                     sources = []
                     synapses = []
                     weights = []
 
                     # create layer
-                    mlg_layer = Layer(name=name, neurons=converter.create_neurons(
-                        tf_layer, pre_compile_output))
+                    mlg_layer = Layer(name=layer.name, neurons=converter.create_neurons(
+                        layer, pre_compile_output))
 
                     # create synapses
-                    for tf_in_layer in tf_in_layers:
+                    for in_layer in in_layers:
 
-                        if isinstance(tf_in_layer, tf.keras.layers.AveragePooling2D):
+                        if in_layer.class_name == 'AveragePooling2D':
 
                             # traverse ignored layers to find more inputs
-                            pool_in_layers = traverse_tf_in_layers(tf_in_layers_all[tf_in_layer])
+                            pool_in_layers = traverse_in_layers(in_layer.inbound_names)
 
                             # create connections for all pool layer inputs
                             for pool_in_layer in pool_in_layers:
-                                sources.append(mlg_layer_lookup[pool_in_layer])
+                                sources.append(mlg_layer_lookup[pool_in_layer.name])
                                 synapses.append(AvePool2DConv2DSynapses(
-                                    filters=tf_layer.filters,
-                                    pool_size=tf_in_layer.pool_size, conv_size=tf_layer.kernel_size,
-                                    pool_strides=tf_in_layer.strides, conv_strides=tf_layer.strides,
-                                    pool_padding=tf_in_layer.padding, conv_padding=tf_layer.padding,
+                                    filters=layer.filters,
+                                    pool_size=in_layer.pool_size, conv_size=layer.kernel_size,
+                                    pool_strides=in_layer.strides, conv_strides=layer.strides,
+                                    pool_padding=in_layer.padding, conv_padding=layer.padding,
                                     connectivity_type=connectivity_type))
-                                weights.append(tf_layer.get_weights()[0])
+                                weights.append(layer.get_weights()[0])
 
                         else:
-                            sources.append(mlg_layer_lookup[tf_in_layer])
+                            sources.append(mlg_layer_lookup[in_layer.name])
                             synapses.append(Conv2DSynapses(
-                                filters=tf_layer.filters,
-                                conv_size=tf_layer.kernel_size,
-                                conv_strides=tf_layer.strides,
-                                conv_padding=tf_layer.padding,
+                                filters=layer.filters,
+                                conv_size=layer.kernel_size,
+                                conv_strides=layer.strides,
+                                conv_padding=layer.padding,
                                 connectivity_type=connectivity_type))
-                            weights.append(tf_layer.get_weights()[0])
+                            weights.append(layer.get_weights()[0])
 
                     # connect layer and set weights
                     mlg_layer.connect(sources, synapses)
                     mlg_layer.set_weights(weights)
 
-                    mlg_layer_lookup[tf_layer] = mlg_layer
-                    if len(tf_out_layers) == 0:
+                    mlg_layer_lookup[layer.name] = mlg_layer
+                    if len(layer.outbound_names) == 0:
                         # no outbound layers, so it must be an output
                         mlg_model_outputs.append(mlg_layer)
 
                 # === [Global]AveragePooling2D Layers ===
-                elif isinstance(tf_layer, (
-                        tf.keras.layers.AveragePooling2D,
-                        tf.keras.layers.GlobalAveragePooling2D)):
+                elif layer.class_name in pool_layers:
 
                     # do not allow back-to-back pooling layers
-                    for tf_in_layer in tf_in_layers:
-                        if isinstance(tf_in_layer, (
-                                tf.keras.layers.AveragePooling2D,
-                                tf.keras.layers.GlobalAveragePooling2D)):
+                    for in_layer in in_layers:
+                        if in_layer.class_name in pool_layers:
                             raise NotImplementedError(
                                 'back-to-back pooling layers not supported')
 
                     # do not allow pooling layers to be output layers
-                    if len(tf_out_layers) == 0:
+                    if len(layer.outbound_names) == 0:
                         raise NotImplementedError(
                             'output pooling layers not supported')
 
-                    mlg_layer_lookup[tf_layer] = mlg_layer_lookup[next(iter(tf_in_layers))]
+                    mlg_layer_lookup[layer.name] = mlg_layer_lookup[next(iter(in_layers)).name]
 
                 # === Ignored Layers ===
-                elif isinstance(tf_layer, ignored_tf_layers):
+                elif layer.class_name in ignored_layers:
                     pass
 
         # create model
-        mlg_model = Model(mlg_model_inputs, mlg_model_outputs, name=tf_model.name)
-
-        # Compile model
-        mlg_model.compile(**compile_kwargs)
+        mlg_model = Model(mlg_model_inputs, mlg_model_outputs, name=graph.name)
+
+        if reuse_mlg_model is not None and reuse_mlg_model._can_reuse(mlg_model, compile_kwargs):
+            # Copy converted weights and thresholds into reused model
+            # **NOTE** matching build keys mean layers have the same names, types and shapes
+            reused_layers = {l.name: l for l in reuse_mlg_model.layers}
+            for layer in mlg_model.layers:
+                reused_layer = reused_layers[layer.name]
+                if isinstance(layer.neurons, IFNeurons):
+                    reused_layer.neurons.set_threshold(layer.neurons.threshold)
+            reuse_mlg_model.set_weights(mlg_model.get_weights())
+            mlg_model = reuse_mlg_model
+        else:
+            # Compile model
+            mlg_model.compile(**compile_kwargs)
 
         # Perform any post-compilation tasks
         converter.post_compile(mlg_model)
 
         return mlg_model
+
+
+def _evaluate_shard(mlg_model, conn, data, labels, time, save_samples):
+    """Evaluate a shard of a dataset in a worker process forked by Model.evaluate_parallel"""
+
+    try:
+        # Load this process's own instance of the compiled GeNN model
+        mlg_model.compile(reuse_genn_model=True, **mlg_model._compile_kwargs)
+
+        batches = array_batches(data, labels, mlg_model.g_model.batch_size)
+        result, n_correct = mlg_model._evaluate_batches(batches, time, save_samples,
+                                                        data[0].shape[0], progress=False)
+        conn.send((n_correct, result.spikes))
+    except BaseException as ex:
+        conn.send(ex)
+    finally:
+        conn.close()
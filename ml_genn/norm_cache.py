@@ -0,0 +1,119 @@
+"""ML GeNN normalisation cache
+
+This module provides the ``NormCache`` class which stores the results of
+converter normalisation (maximum activations and thresholds) in a cache
+directory, keyed by a hash of the model weights and architecture, the
+normalisation data and the converter parameters which affect the results.
+Reconverting the same model, even from a new process, then reuses the
+results instantly. Each entry is a human-readable JSON file.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import numpy as np
+
+from ml_genn.data import array_batches
+
+# Increment if anything about how keys or entries are calculated changes
+NORM_CACHE_FORMAT_VERSION = 1
+
+
+def _update_array_hash(key_hash, array, chunk_size=1024):
+    """Add shape, type and contents of array-like to hash, reading it in chunks"""
+
+    key_hash.update(repr((tuple(array.shape), str(array.dtype))).encode('utf-8'))
+    for chunk, _ in array_batches([array], None, chunk_size):
+        key_hash.update(np.ascontiguousarray(chunk[0]).tobytes())
+
+
+def describe_keras_graph(graph):
+    """Describe the architecture of a KerasGraph for calc_norm_key"""
+
+    return [{'name': l.name, 'class_name': l.class_name, 'config': l.config,
+             'inbound_names': l.inbound_names} for l in graph.layers]
+
+
+def calc_norm_key(converter, params, weights, norm_data):
+    """Calculate hash of everything affecting the results of normalisation
+
+    Args:
+    converter  --  name of converter
+    params     --  JSON-serialisable dictionary of converter parameters
+                   and model architecture which affect the results
+    weights    --  list of model weight arrays
+    norm_data  --  list of normalisation data array-likes for each input layer
+
+    Returns:
+    hexadecimal key string
+    """
+
+    key_hash = hashlib.sha256()
+    key_hash.update(json.dumps({'format': NORM_CACHE_FORMAT_VERSION,
+                                'converter': converter, 'params': params},
+                               sort_keys=True, default=repr).encode('utf-8'))
+    for w in weights:
+        _update_array_hash(key_hash, np.asarray(w))
+    for x in norm_data:
+        _update_array_hash(key_hash, x)
+    return key_hash.hexdigest()
+
+
+def get_norm_cache(path=None):
+    """Open normalisation cache in path (or $ML_GENN_NORM_CACHE if path is None)
+
+    Returns:
+    NormCache or None if no cache directory is configured
+    """
+
+    if path is None:
+        path = os.environ.get('ML_GENN_NORM_CACHE')
+    return None if path is None else NormCache(path)
+
+
+class NormCache(object):
+    """Directory of converter normalisation results stored as JSON"""
+
+    def __init__(self, path):
+        """Open (and create if required) a normalisation cache
+
+        Args:
+        path  --  cache directory
+        """
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def get_entry_path(self, key):
+        """Get file an entry is stored in"""
+
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        """Get cached normalisation results (or None if key isn't in the cache)"""
+
+        try:
+            with open(self.get_entry_path(key), 'r') as f:
+                return json.load(f)['values']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, converter, values):
+        """Store normalisation results in cache
+
+        Args:
+        key        --  key calculated with calc_norm_key
+        converter  --  name of converter, stored to make entries easier to inspect
+        values     --  JSON-serialisable dictionary of normalisation results
+        """
+
+        # Write to temporary file and move into place so other processes never read a partial entry
+        fd, entry_path = tempfile.mkstemp(prefix='.entry_', suffix='.json', dir=self.path)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'converter': converter, 'values': values}, f, indent=4)
+            os.replace(entry_path, self.get_entry_path(key))
+        except BaseException:
+            os.remove(entry_path)
+            raise
@@ -1,40 +1,219 @@
-from os import mkdir
+"""ML GeNN model saving and loading
+
+This module provides functions to save ML GeNN models to, and load them from,
+a versioned on-disk format. The layer graph, neuron types and parameters and
+synapse configurations are stored as JSON and weights as uncompressed .npy
+blobs, either in a directory or in a single uncompressed zip archive. When
+loading, weights are memory mapped so even very large models are recreated
+almost instantly, without TensorFlow or reconversion.
+
+Example:
+    A converted model can be saved and later loaded and compiled with:
+
+        from ml_genn import save_model, load_model
+
+        save_model(ml_genn_model, 'model_dir')
+        ml_genn_model = load_model('model_dir')
+        ml_genn_model.compile(batch_size=32)
+"""
+
+import json
+import os
+import zipfile
 import numpy as np
 
+from ml_genn.describe import get_params
+
+# Increment if the on-disk format changes in a way older versions can't read
+FORMAT_VERSION = 1
+
+_GRAPH_FILENAME = 'model.json'
+
+
+def _create_object(description):
+    """Create neurons or synapses from class name and constructor parameters"""
+
+    import ml_genn.layers
+    cls = getattr(ml_genn.layers, description['class'], None)
+    if cls is None:
+        raise ValueError('unknown class {}'.format(description['class']))
+    return cls(**description['params'])
+
+
+def _describe_model(model):
+    """Build JSON-serialisable description of model and list of weight arrays to save"""
+
+    from ml_genn.layers import InputLayer
+
+    layers = []
+    weights = []
+    for layer in model.layers:
+        synapses = []
+        for i, s in enumerate(layer.upstream_synapses):
+            filename = 'weights/{}_{}.npy'.format(layer.name, i)
+            synapses.append({'class': type(s).__name__, 'params': get_params(s),
+                             'source': s.source().name, 'weights': filename})
+            weights.append((filename, s.weights))
+
+        layers.append({
+            'name': layer.name,
+            'class': 'InputLayer' if isinstance(layer, InputLayer) else 'Layer',
+            'shape': list(layer.shape),
+            'neurons': {'class': type(layer.neurons).__name__,
+                        'params': get_params(layer.neurons)},
+            'synapses': synapses})
+
+    description = {
+        'format': 'ml_genn',
+        'version': FORMAT_VERSION,
+        'name': model.name,
+        'inputs': [l.name for l in model.inputs],
+        'outputs': [l.name for l in model.outputs],
+        'layers': layers}
+    return description, weights
+
+
+def save_model(model, path, archive=False):
+    """Save a ML GeNN model
+
+    Args:
+    model    --  ML GeNN model to save
+    path     --  directory (or archive file) to save model in
+
+    Keyword args:
+    archive  --  save model as a single uncompressed zip archive rather
+                 than a directory (default: False)
+    """
+
+    description, weights = _describe_model(model)
+    graph = json.dumps(description, indent=4)
+
+    if archive:
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as zf:
+            zf.writestr(_GRAPH_FILENAME, graph)
+            for filename, w in weights:
+                # **NOTE** weights are stored uncompressed so they can be memory mapped
+                with zf.open(filename, 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.ascontiguousarray(w))
+    else:
+        os.makedirs(os.path.join(path, 'weights'))
+        with open(os.path.join(path, _GRAPH_FILENAME), 'w') as f:
+            f.write(graph)
+        for filename, w in weights:
+            np.save(os.path.join(path, filename), w)
+
+
+def _mmap_archive_member(path, info):
+    """Memory map .npy file stored uncompressed in zip archive"""
+
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError('cannot memory map compressed archive member {}'.format(info.filename))
+
+    with open(path, 'rb') as f:
+        # Skip local file header to find start of .npy file
+        # **NOTE** local header extra field can differ from central directory's
+        f.seek(info.header_offset)
+        header = f.read(30)
+        name_length = int.from_bytes(header[26:28], 'little')
+        extra_length = int.from_bytes(header[28:30], 'little')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+
+        # Read .npy header
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            raise ValueError('unsupported .npy version {}'.format(version))
+        offset = f.tell()
+
+    # **NOTE** copy-on-write so weights can be modified without changing file
+    return np.memmap(path, dtype=dtype, mode='c', shape=shape,
+                     order='F' if fortran_order else 'C', offset=offset)
+
+
+def is_saved_model(path):
+    """Is path a directory or archive containing a model saved with save_model"""
+
+    if os.path.isdir(path):
+        return os.path.isfile(os.path.join(path, _GRAPH_FILENAME))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path, 'r') as zf:
+            return _GRAPH_FILENAME in zf.namelist()
+    else:
+        return False
+
+
+def load_model(path, mmap=True):
+    """Load a ML GeNN model saved with save_model
+
+    The model must be compiled before it can be used.
+
+    Args:
+    path  --  directory (or archive file) model was saved in
 
-def save_model(model, path):
-    mkdir(path)
+    Keyword args:
+    mmap  --  memory map weights rather than reading them into memory (default: True)
 
-    with open(path + '/name', 'w') as out_file:
-        out_file.write(model.name + '\n')
+    Returns:
+    ML GeNN model
+    """
 
-    with open(path + '/layer_names', 'w') as out_file:
-        for i in range(len(model.layer_names)):
-            out_file.write(model.layer_names[i] + '\n')
+    from ml_genn.model import Model
+    from ml_genn.layers import InputLayer, Layer
 
-    for i in range(len(model.weight_vals)):
-        np.savetxt(path + '/weight_vals_' + model.layer_names[i], model.weight_vals[i])
+    # Get functions to read graph and weights from directory or archive
+    if os.path.isdir(path):
+        with open(os.path.join(path, _GRAPH_FILENAME), 'r') as f:
+            description = json.load(f)
 
-    for i in range(len(model.weight_conn)):
-        np.savetxt(path + '/weight_conn_' + model.layer_names[i], model.weight_conn[i])
+        def load_weights(filename):
+            return np.load(os.path.join(path, filename), mmap_mode='c' if mmap else None)
+    else:
+        with zipfile.ZipFile(path, 'r') as zf:
+            description = json.loads(zf.read(_GRAPH_FILENAME).decode('utf-8'))
+            members = {i.filename: i for i in zf.infolist()}
 
-    for i in range(len(model.thresholds)):
-        np.savetxt(path + '/threshold_' + model.layer_names[i], model.thresholds[i])
+        def load_weights(filename):
+            if mmap:
+                return _mmap_archive_member(path, members[filename])
+            else:
+                with zipfile.ZipFile(path, 'r') as zf, zf.open(filename) as f:
+                    return np.lib.format.read_array(f)
 
+    if description.get('format') != 'ml_genn':
+        raise ValueError('{} is not a saved ML GeNN model'.format(path))
+    if description['version'] > FORMAT_VERSION:
+        raise ValueError('saved model format version {} is newer than supported version {}'.format(
+            description['version'], FORMAT_VERSION))
 
-def load_model(path):
-    with open(path + '/name', 'r') as in_file:
-        model.name = in_file.read().splitlines()
+    # Recreate layers in (topologically sorted) saved order
+    layers = {}
+    for l in description['layers']:
+        neurons = _create_object(l['neurons'])
+        if l['class'] == 'InputLayer':
+            layer = InputLayer(l['name'], tuple(l['shape']), neurons=neurons)
+        else:
+            layer = Layer(l['name'], neurons=neurons)
+            sources = [layers[s['source']] for s in l['synapses']]
+            synapses = [_create_object(s) for s in l['synapses']]
+            layer.connect(sources, synapses)
 
-    with open(path + '/layer_names', 'r') as in_file:
-        for i in range(len(model.layer_names)):
-            model.layer_names[i] = in_file.read().splitlines()
+            # **NOTE** replace weights allocated by connect rather
+            # than copying so memory mapped weights are read lazily
+            for s, syn in zip(l['synapses'], synapses):
+                weights = load_weights(s['weights'])
+                if weights.shape != syn.weights.shape:
+                    raise ValueError('saved weights shape {} does not match synapse weights shape {}'.format(
+                        weights.shape, syn.weights.shape))
+                syn.weights = weights
 
-    for i in range(len(model.weight_vals)):
-        model.weight_vals[i]= np.loadtxt(path + '/weight_vals_' + model.layer_names[i])
+            if layer.shape != tuple(l['shape']):
+                raise ValueError('layer <{}> shape mismatch'.format(l['name']))
 
-    for i in range(len(model.weight_conn)):
-        model.weight_conn[i]= np.loadtxt(path + '/weight_conn_' + model.layer_names[i])
+        layers[l['name']] = layer
 
-    for i in range(len(model.thresholds)):
-        model.thresholds[i]= np.loadtxt(path + '/threshold_' + model.layer_names[i])
+    return Model([layers[n] for n in description['inputs']],
+                 [layers[n] for n in description['outputs']],
+                 name=description['name'])
@@ -0,0 +1,362 @@
+"""ML GeNN inference server
+
+This module provides the ``InferenceServer`` class which collects
+single-sample prediction requests from many threads into micro-batches that
+fill the compiled batch lanes of a ML GeNN model, and the ``ml_genn serve``
+console command which converts and compiles a model once and then serves
+predictions over HTTP on a TCP port or Unix socket.
+
+Predictions are requested by POSTing JSON of the form ``{"data": sample}``
+(or ``{"data": [sample, ...]}`` with a sample for each input layer of models
+with multiple inputs) to ``/predict``. The response is JSON of the form
+``{"predictions": [class, ...]}`` with a predicted class for each output layer.
+"""
+
+import json
+import os
+import numpy as np
+from argparse import ArgumentParser
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Queue
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Event, Lock, Thread
+from time import perf_counter
+
+
+class _Request(object):
+    def __init__(self, data):
+        self.data = data
+        self.predictions = None
+        self.error = None
+        self.done = Event()
+
+
+class InferenceServer(object):
+    """Serve predictions from a compiled ML GeNN model using dynamic micro-batching
+
+    Requests are queued and a single worker thread, which owns the GeNN model,
+    gathers them into micro-batches. A micro-batch is simulated as soon as it
+    fills all of the model's batch lanes or the oldest request in it has been
+    waiting for max_delay seconds. For pipelined models, batches are kept
+    flowing through the pipeline and empty batches are only simulated to
+    flush requests still in flight. If simulation fails, every request in
+    flight or queued is failed with the error and the server stops, so
+    later requests fail immediately rather than waiting forever.
+    """
+
+    def __init__(self, mlg_model, time, max_delay=0.005):
+        """Start worker thread
+
+        Args:
+        mlg_model  --  compiled ML GeNN model
+        time       --  sample presentation time (msec)
+
+        Keyword args:
+        max_delay  --  maximum time (seconds) a request waits for a micro-batch
+                       to fill before it is simulated (default: 0.005)
+        """
+
+        self.mlg_model = mlg_model
+        self.time = time
+        self.max_delay = max_delay
+        self._queue = Queue()
+        self._lock = Lock()
+        self._error = None
+        self._thread = Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def predict(self, data):
+        """Predict the output class of a single sample (thread-safe)
+
+        Args:
+        data  --  list of a sample for each input layer
+
+        Returns:
+        list of predicted class for each output layer
+        """
+
+        if len(data) != len(self.mlg_model.inputs):
+            raise ValueError('data list length and input layer list length mismatch')
+
+        # **NOTE** lock ensures requests are never queued after the worker thread has stopped
+        request = _Request([np.asarray(x) for x in data])
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.predictions
+
+    def close(self):
+        """Stop worker thread once all queued requests are complete"""
+
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, block):
+        # Wait for first request (only briefly if there are batches to flush)
+        try:
+            first = self._queue.get(timeout=None if block else self.max_delay)
+        except Empty:
+            return []
+        if first is None:
+            return None
+
+        # Gather further requests until batch is full or deadline passes
+        requests = [first]
+        deadline = perf_counter() + self.max_delay
+        while len(requests) < self.mlg_model.g_model.batch_size:
+            timeout = deadline - perf_counter()
+            if timeout <= 0.0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except Empty:
+                break
+            if request is None:
+                self._queue.put(None)
+                break
+            requests.append(request)
+        return requests
+
+    def _serve(self):
+        mlg_model = self.mlg_model
+        pipeline_depth = mlg_model.calc_pipeline_depth()
+        n_steps = mlg_model._get_num_timesteps(self.time)
+        in_flight = deque()
+        stopping = False
+        while not stopping or any(r is not None for r in in_flight):
+            # Collect requests, blocking if nothing is in flight
+            requests = [] if stopping else self._collect(
+                not any(r is not None for r in in_flight))
+            if requests is None:
+                stopping = True
+                requests = []
+
+            # Set input from requests or, if there are none, leave the
+            # previous input in place to flush the pipeline
+            if len(requests) > 0:
+                try:
+                    mlg_model.set_input_batch(
+                        [np.stack([r.data[i] for r in requests])
+                         for i in range(len(mlg_model.inputs))])
+                except Exception as ex:
+                    self._complete(requests, error=ex)
+                    continue
+                in_flight.append(requests)
+            elif len(in_flight) > 0:
+                in_flight.append(None)
+            else:
+                continue
+
+            # Simulate batch, stopping if this fails as model state is then unknown
+            try:
+                mlg_model.reset()
+                mlg_model.step_time(n_steps)
+            except Exception as ex:
+                for r in in_flight:
+                    if r is not None:
+                        self._complete(r, error=ex)
+                self._stop(RuntimeError('inference server failed: {}'.format(ex)))
+                return
+
+            # If first batch in pipeline has passed through, complete its requests
+            if len(in_flight) > pipeline_depth:
+                done = in_flight.popleft()
+                if done is not None:
+                    try:
+                        predictions = [o.neurons.get_predictions(len(done))
+                                       for o in mlg_model.outputs]
+                    except Exception as ex:
+                        self._complete(done, error=ex)
+                    else:
+                        self._complete(done, predictions=predictions)
+
+        # Fail any requests which arrived after shutdown was requested
+        self._stop(RuntimeError('server closed'))
+
+    def _stop(self, error):
+        # Stop accepting requests and fail any which are still queued
+        with self._lock:
+            self._error = error
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except Empty:
+                break
+            if request is not None:
+                self._complete([request], error=error)
+
+    def _complete(self, requests, predictions=None, error=None):
+        for i, r in enumerate(requests):
+            if error is None:
+                r.predictions = [int(p[i]) for p in predictions]
+            else:
+                r.error = error
+            r.done.set()
+
+
+class _InferenceRequestHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path != '/predict':
+            self.send_error(404)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length))['data']
+            if len(self.server.inference.mlg_model.inputs) == 1:
+                data = [data]
+            predictions = self.server.inference.predict(data)
+        except (ValueError, KeyError, TypeError) as ex:
+            self._send_json(400, {'error': str(ex)})
+        except Exception as ex:
+            self._send_json(500, {'error': str(ex)})
+        else:
+            self._send_json(200, {'predictions': predictions})
+
+    def _send_json(self, code, body):
+        response = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def address_string(self):
+        # **NOTE** Unix socket clients have no address
+        return str(self.client_address[0]) if self.client_address else 'unix'
+
+
+class _ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(inference, host='127.0.0.1', port=8000, unix_socket=None):
+    """Serve predictions over HTTP until interrupted
+
+    Args:
+    inference    --  InferenceServer to serve predictions from
+
+    Keyword args:
+    host         --  address to listen on (default: '127.0.0.1')
+    port         --  TCP port to listen on (default: 8000)
+    unix_socket  --  path of Unix socket to listen on instead of a TCP port (default: None)
+    """
+
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        http_server = _ThreadingUnixHTTPServer(unix_socket, _InferenceRequestHandler)
+    else:
+        http_server = ThreadingHTTPServer((host, port), _InferenceRequestHandler)
+    http_server.inference = inference
+
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        http_server.server_close()
+        inference.close()
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+def main():
+    """Entry point for ml_genn console script
+
+    Currently provides a single ``serve`` subcommand, run as
+    ``ml_genn serve MODEL --time TIME``, which serves predictions
+    from a model over HTTP
+    """
+
+    from ml_genn.converters import ConverterType
+    from ml_genn.layers import ConnectivityType, InputType
+
+    parser = ArgumentParser(prog='ml_genn', description='ML GeNN command line tools')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    serve_parser = subparsers.add_parser(
+        'serve', help='serve predictions from a ML GeNN model over HTTP',
+        description='Serve predictions from a ML GeNN model')
+    serve_parser.add_argument('model', help='path to TensorFlow Keras model to convert '
+                                            'or ML GeNN model saved with save_model')
+    serve_parser.add_argument('--time', type=float, required=True,
+                              help='sample presentation time (msec)')
+    serve_parser.add_argument('--max-delay', type=float, default=0.005,
+                              help='maximum time (seconds) requests wait for a micro-batch to fill')
+
+    # compilation options
+    serve_parser.add_argument('--dt', type=float, default=1.0)
+    serve_parser.add_argument('--rng-seed', type=int, default=0)
+    serve_parser.add_argument('--batch-size', type=int, default=1)
+    serve_parser.add_argument('--input-type', default='poisson',
+                              choices=[i.value for i in InputType])
+    serve_parser.add_argument('--connectivity-type', default='procedural',
+                              choices=[i.value for i in ConnectivityType])
+
+    # ANN conversion options
+    serve_parser.add_argument('--converter', default='simple',
+                              choices=[i.value for i in ConverterType])
+    serve_parser.add_argument('--norm-data', default=None,
+                              help='path to .npy file or directory of .npy shards of normalisation data')
+    serve_parser.add_argument('--norm-time', type=float, default=500.0)
+    serve_parser.add_argument('--K', type=int, default=8)
+
+    # server options
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--unix-socket', default=None)
+
+    args = parser.parse_args()
+    if args.converter in ('data-norm', 'spike-norm') and args.norm_data is None:
+        serve_parser.error('{} converter requires --norm-data'.format(args.converter))
+
+    from ml_genn import Model
+    from ml_genn.converters import DataNorm, FewSpike, Simple, SpikeNorm
+    from ml_genn.save_load import is_saved_model, load_model
+
+    # If model was saved by ML GeNN, load and compile it without conversion
+    if is_saved_model(args.model):
+        mlg_model = load_model(args.model)
+        mlg_model.compile(dt=args.dt, batch_size=args.batch_size, rng_seed=args.rng_seed,
+                          device_readout_time=args.time)
+
+        serve(InferenceServer(mlg_model, args.time, args.max_delay),
+              host=args.host, port=args.port, unix_socket=args.unix_socket)
+        return
+
+    import tensorflow as tf
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    norm_data = None if args.norm_data is None else [args.norm_data]
+    if args.converter == 'few-spike':
+        converter = FewSpike(K=args.K, norm_data=norm_data)
+    elif args.converter == 'data-norm':
+        converter = DataNorm(norm_data=norm_data, input_type=args.input_type)
+    elif args.converter == 'spike-norm':
+        converter = SpikeNorm(norm_data=norm_data, norm_time=args.norm_time,
+                              input_type=args.input_type)
+    else:
+        converter = Simple(input_type=args.input_type)
+
+    # Convert and compile model once
+    tf_model = tf.keras.models.load_model(args.model)
+    mlg_model = Model.convert_tf_model(
+        tf_model, converter=converter, connectivity_type=args.connectivity_type,
+        dt=args.dt, batch_size=args.batch_size, rng_seed=args.rng_seed,
+        device_readout_time=args.time)
+
+    serve(InferenceServer(mlg_model, args.time, args.max_delay),
+          host=args.host, port=args.port, unix_socket=args.unix_socket)
+
+
+if __name__ == '__main__':
+    main()
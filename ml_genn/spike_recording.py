@@ -0,0 +1,204 @@
+"""ML GeNN spike recordings
+
+This module provides the ``SpikeRecording`` class which compactly stores
+the spikes emitted by each layer during the presentation of saved samples
+and decodes them into spike indices and times on demand.
+"""
+
+import numpy as np
+
+
+class SpikeRecording(object):
+    """Spikes emitted by each layer of a model for a set of samples
+
+    The spikes of each sample and layer are stored in a CSR-like layout: a
+    flat array of neuron indices ordered by timestep and an array of offsets
+    into it for each timestep, so spikes emitted in timestep j are
+    ``ids[offsets[j]:offsets[j + 1]]``.
+    """
+
+    def __init__(self, samples, layer_names, layer_sizes, dt):
+        """Create an empty spike recording
+
+        Args:
+        samples      --  list of sample indices spikes are recorded for
+        layer_names  --  list of names of each recorded layer
+        layer_sizes  --  list of number of neurons in each recorded layer
+        dt           --  simulation time step (msec)
+        """
+
+        self.samples = list(samples)
+        self.layer_names = list(layer_names)
+        self.layer_sizes = list(layer_sizes)
+        self.dt = dt
+        self._offsets = [[None] * len(self.layer_names) for s in self.samples]
+        self._ids = [[None] * len(self.layer_names) for s in self.samples]
+
+    @classmethod
+    def concatenate(cls, recordings, sample_offsets):
+        """Combine recordings of the same layers made for different samples
+
+        Args:
+        recordings      --  list of spike recordings
+        sample_offsets  --  list of offset to add to sample indices of each recording
+
+        Returns:
+        spike recording containing the samples of every recording in order
+        """
+
+        first = recordings[0]
+        samples = [s + o for r, o in zip(recordings, sample_offsets) for s in r.samples]
+        combined = cls(samples, first.layer_names, first.layer_sizes, first.dt)
+        combined._offsets = [o for r in recordings for o in r._offsets]
+        combined._ids = [i for r in recordings for i in r._ids]
+        return combined
+
+    def set_spikes(self, sample_i, layer_i, timesteps, ids, n_timesteps):
+        """Set spikes of a sample and layer from arrays of spike timesteps and indices
+
+        Args:
+        sample_i     --  index of sample within samples
+        layer_i      --  index or name of layer
+        timesteps    --  array of timestep each spike was emitted in
+        ids          --  array of index of neuron which emitted each spike
+        n_timesteps  --  number of timesteps sample was presented for
+        """
+
+        layer_i = self._get_layer_index(layer_i)
+        timesteps = np.asarray(timesteps, dtype=np.int64)
+        ids = np.asarray(ids)
+
+        # Sort spikes by timestep if required
+        if np.any(np.diff(timesteps) < 0):
+            order = np.argsort(timesteps, kind='stable')
+            timesteps = timesteps[order]
+            ids = ids[order]
+
+        counts = np.bincount(timesteps, minlength=n_timesteps)
+        self._offsets[sample_i][layer_i] = np.concatenate(([0], np.cumsum(counts)))
+        self._ids[sample_i][layer_i] = ids
+
+    def set_timestep_spikes(self, sample_i, layer_i, spikes):
+        """Set spikes of a sample and layer from a list of spike indices emitted in each timestep
+
+        Args:
+        sample_i  --  index of sample within samples
+        layer_i   --  index or name of layer
+        spikes    --  list of arrays of neuron indices which spiked in each timestep
+        """
+
+        layer_i = self._get_layer_index(layer_i)
+        counts = [len(s) for s in spikes]
+        self._offsets[sample_i][layer_i] = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self._ids[sample_i][layer_i] = (np.concatenate(spikes) if len(spikes) > 0
+                                        else np.empty(0, dtype=np.uint32))
+
+    def get_spike_indices(self, sample_i, layer_i):
+        """Get array of index of neuron which emitted each spike"""
+
+        return self._ids[sample_i][self._get_layer_index(layer_i)]
+
+    def get_spike_times(self, sample_i, layer_i):
+        """Get array of time (msec) each spike was emitted at"""
+
+        offsets = self._offsets[sample_i][self._get_layer_index(layer_i)]
+        n_timesteps = len(offsets) - 1
+        return np.repeat(np.arange(n_timesteps) * self.dt, np.diff(offsets))
+
+    def get_spike_counts(self, sample_i, layer_i):
+        """Get array of number of spikes emitted by each neuron"""
+
+        layer_i = self._get_layer_index(layer_i)
+        return np.bincount(self._ids[sample_i][layer_i],
+                           minlength=self.layer_sizes[layer_i])
+
+    def get_rates(self, sample_i, layer_i):
+        """Get array of firing rate (Hz) of each neuron"""
+
+        offsets = self._offsets[sample_i][self._get_layer_index(layer_i)]
+        duration = (len(offsets) - 1) * self.dt
+        return self.get_spike_counts(sample_i, layer_i) * (1000.0 / duration)
+
+    def get_histogram(self, sample_i, layer_i, bin_time):
+        """Get number of spikes emitted by layer in each time bin
+
+        Args:
+        sample_i  --  index of sample within samples
+        layer_i   --  index or name of layer
+        bin_time  --  width of each time bin (msec)
+
+        Returns:
+        counts    --  array of number of spikes in each bin
+        edges     --  array of start time (msec) of each bin and end time of last bin
+        """
+
+        offsets = self._offsets[sample_i][self._get_layer_index(layer_i)]
+        n_timesteps = len(offsets) - 1
+        bin_timesteps = max(1, int(round(bin_time / self.dt)))
+
+        # Sum timestep spike counts within each bin
+        bin_starts = np.arange(0, n_timesteps, bin_timesteps)
+        counts = offsets[np.minimum(bin_starts + bin_timesteps, n_timesteps)] - offsets[bin_starts]
+        edges = np.append(bin_starts, n_timesteps) * self.dt
+        return counts, edges
+
+    @property
+    def spike_i(self):
+        """Lazily decoded spike indices, indexed by sample then layer"""
+
+        return _LazySpikes(self, self.get_spike_indices)
+
+    @property
+    def spike_t(self):
+        """Lazily decoded spike times, indexed by sample then layer"""
+
+        return _LazySpikes(self, self.get_spike_times)
+
+    def _get_layer_index(self, layer_i):
+        return (self.layer_names.index(layer_i) if isinstance(layer_i, str)
+                else layer_i)
+
+
+class _LazySpikes(object):
+    """Sequence of per-sample sequences of per-layer arrays decoded on access"""
+
+    def __init__(self, recording, decode, sample_i=None):
+        self.recording = recording
+        self._decode = decode
+        self._sample_i = sample_i
+
+    def __len__(self):
+        return (len(self.recording.samples) if self._sample_i is None
+                else len(self.recording.layer_names))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError('index {} out of range'.format(i))
+
+        if self._sample_i is None:
+            return _LazySpikes(self.recording, self._decode, i)
+        else:
+            return self._decode(self._sample_i, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class EvaluateResult(tuple):
+    """Result of evaluating a model
+
+    This unpacks as an (accuracy, spike_i, spike_t) tuple for backwards
+    compatibility, with spike_i and spike_t decoded lazily from spikes.
+    """
+
+    def __new__(cls, accuracy, spikes):
+        result = super(EvaluateResult, cls).__new__(
+            cls, (accuracy, spikes.spike_i, spikes.spike_t))
+        result.accuracy = accuracy
+        result.spikes = spikes
+        return result
@@ -0,0 +1,106 @@
+"""ML GeNN native multi-timestep stepping
+
+The runner GeNN generates only exports a ``stepTime`` function which
+advances the model by a single timestep, so PyGeNN steps models one
+timestep per call from Python. This module compiles a tiny helper library
+which calls ``stepTime`` in a native loop, so many timesteps are simulated
+in a single ctypes call, during which the GIL is released.
+
+The helper doesn't depend on the model so it is only compiled and loaded
+once per process and is then passed the ``stepTime`` function of each
+loaded runner.
+"""
+
+import _ctypes
+import ctypes
+import os
+import subprocess
+import tempfile
+from functools import partial
+
+_HELPER_SOURCE = '''
+typedef void (*StepTimeFunc)(void);
+
+void stepTimeN(StepTimeFunc stepTime, unsigned long long n)
+{
+    for(unsigned long long i = 0; i < n; i++) {
+        stepTime();
+    }
+}
+'''
+
+_HELPER_NAME = 'libml_genn_step_time_n.so'
+
+# Loaded stepTimeN function (False if it couldn't be built)
+_step_time_n = None
+
+
+def _build_helper(path):
+    """Compile helper library into directory, returning path or None on failure"""
+
+    helper_path = os.path.join(path, _HELPER_NAME)
+    if os.path.isfile(helper_path):
+        return helper_path
+
+    # Compile into temporary file and move into place so
+    # other processes never load a partially written library
+    fd, source_path = tempfile.mkstemp(prefix='.step_time_n_', suffix='.c', dir=path)
+    library_path = source_path[:-2] + '.so'
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(_HELPER_SOURCE)
+        subprocess.run([os.environ.get('CC', 'cc'), '-O2', '-shared', '-fPIC',
+                        '-o', library_path, source_path],
+                       check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.replace(library_path, helper_path)
+        return helper_path
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    finally:
+        os.remove(source_path)
+        if os.path.isfile(library_path):
+            os.remove(library_path)
+
+
+def load_step_time_n(path_to_model, model_name):
+    """Get function stepping a loaded GeNN model many timesteps in a single native call
+
+    Args:
+    path_to_model  --  directory GeNN model was built in
+    model_name     --  name of GeNN model
+
+    Returns:
+    function taking number of timesteps to step or None if native
+    stepping isn't supported on this platform
+    """
+
+    global _step_time_n
+
+    # **NOTE** Windows runners are DLLs built by MSBuild without a C compiler on the path
+    if os.name == 'nt':
+        return None
+
+    code_path = os.path.join(path_to_model, model_name + '_CODE')
+    if _step_time_n is None:
+        helper_path = _build_helper(code_path)
+        if helper_path is None:
+            _step_time_n = False
+        else:
+            _step_time_n = ctypes.CDLL(helper_path).stepTimeN
+            _step_time_n.argtypes = [ctypes.c_void_p, ctypes.c_ulonglong]
+            _step_time_n.restype = None
+
+    if _step_time_n is False:
+        return None
+
+    # Get address of stepTime in runner PyGeNN has already loaded
+    # **NOTE** opening the same library again returns the already-loaded instance.
+    # It is closed again straight away so it is unloaded along with the GeNN model
+    # and, if the model is rebuilt in the same location, the new build is loaded
+    runner = ctypes.CDLL(os.path.join(code_path, 'librunner.so'))
+    try:
+        step_time = ctypes.cast(runner.stepTime, ctypes.c_void_p).value
+    finally:
+        _ctypes.dlclose(runner._handle)
+
+    return partial(_step_time_n, step_time)
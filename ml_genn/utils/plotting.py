@@ -1,7 +1,8 @@
-import matplotlib.pyplot as plt 
 import math
 
 def raster_plot(spike_ids, spike_times, neuron_pops, time=None):
+    import matplotlib.pyplot as plt
+
     for st, si in zip(spike_times, spike_ids):
         fig, ax = plt.subplots(math.ceil(len(neuron_pops) / 3.0), 3, sharex="col")
         ax = trim_ax(ax, len(neuron_pops))
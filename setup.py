@@ -3,12 +3,19 @@ from setuptools import setup, find_packages
 setup(
     name="ml_genn",
     version="1.0.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
 
     install_requires = [
-        'tensorflow>=2.0',
         'pygenn>=0.4.5',
         'enum-compat',
         'six',
-        'tqdm']
+        'tqdm'],
+
+    # **NOTE** models can be converted from Keras HDF5 files without TensorFlow
+    extras_require = {
+        'tensorflow': ['tensorflow>=2.0'],
+        'h5': ['h5py']},
+
+    entry_points = {
+        'console_scripts': ['ml_genn=ml_genn.server:main']}
 )
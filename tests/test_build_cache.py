@@ -0,0 +1,98 @@
+import os
+import tempfile
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+
+from ml_genn.build_cache import BuildCache
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+    ], dtype=np.float32)
+
+
+def test_build_cache():
+    '''
+    Test identical models share a cached build and different models do not.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_build_cache')
+    tf_model.set_weights([np.random.uniform(0.0, 1.0, size=(5, 3)).astype(np.float32)])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def convert(**kwargs):
+            return mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                              dt=1.0, build_cache_dir=cache_dir, **kwargs)
+
+        # Converting the same model twice should reuse the cached build
+        mlg_model = convert(batch_size=2)
+        predictions, _ = mlg_model.predict([x], 20.0)
+        assert len(os.listdir(cache_dir)) == 1
+
+        mlg_model = convert(batch_size=2)
+        cached_predictions, _ = mlg_model.predict([x], 20.0)
+        assert len(os.listdir(cache_dir)) == 1
+        assert np.array_equal(predictions[0], cached_predictions[0])
+
+        # Changing batch size should result in a new build
+        convert(batch_size=4)
+        assert len(os.listdir(cache_dir)) == 2
+
+        # Builds used recently should never be evicted
+        convert(batch_size=4, build_cache_size=1)
+        assert len(os.listdir(cache_dir)) == 2
+
+        # Once they are old enough, shrinking the cache should evict the least recently used build
+        for key in os.listdir(cache_dir):
+            complete_path = os.path.join(cache_dir, key, 'complete')
+            mtime = os.path.getmtime(complete_path) - 3600.0
+            os.utime(complete_path, (mtime, mtime))
+        convert(batch_size=4, build_cache_size=1)
+        assert len(os.listdir(cache_dir)) == 1
+
+
+class FakeGeNNModel(object):
+    def __init__(self, contents, build_first=None):
+        self.contents = contents
+        self.build_first = build_first
+
+    def build(self, path_to_model):
+        # Simulate another process completing the same build while this one builds
+        if self.build_first is not None:
+            self.build_first()
+        with open(os.path.join(path_to_model, 'librunner.so'), 'w') as f:
+            f.write(self.contents)
+
+
+def test_build_cache_race():
+    '''
+    Test a build completed by another process first is kept rather than replaced.
+    '''
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = BuildCache(cache_dir)
+        other_cache = BuildCache(cache_dir)
+        entry_path = cache.build('key', FakeGeNNModel(
+            'second', lambda: other_cache.build('key', FakeGeNNModel('first'))))
+
+        with open(os.path.join(entry_path, 'librunner.so')) as f:
+            assert f.read() == 'first'
+        assert os.listdir(cache_dir) == ['key']
+
+
+if __name__ == '__main__':
+    test_build_cache()
+    test_build_cache_race()
@@ -0,0 +1,117 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.callbacks import Callback, KernelTimingCallback, TimingCallback
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+    ], dtype=np.float32)
+
+
+def model_labels():
+    return np.array([0, 0, 1, 2, 0], dtype=np.int64)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+class CountingCallback(Callback):
+    def __init__(self):
+        self.n_batches = 0
+        self.n_steps = 0
+        self.eval_logs = None
+
+    def on_batch_end(self, batch, logs):
+        self.n_batches += 1
+
+    def on_step(self, timestep):
+        self.n_steps += 1
+
+    def on_eval_end(self, logs):
+        self.eval_logs = logs
+
+
+def test_callbacks():
+    '''
+    Test callbacks are called for every batch and timestep.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_callbacks')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+
+    counting = CountingCallback()
+    timing = TimingCallback()
+    acc, _, _ = mlg_model.evaluate([x], [y], 20.0, callbacks=[counting, timing])
+
+    assert counting.n_batches == 3
+    assert counting.n_steps == 3 * 20
+    assert counting.eval_logs['accuracy'] == acc
+
+    batch_times = timing.get_batch_times()
+    assert all(len(t) == 3 for t in batch_times.values())
+    assert all(np.all(t >= 0.0) for t in batch_times.values())
+
+
+def test_kernel_timing_callback():
+    '''
+    Test kernel timing timeline is recorded every interval timesteps.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_kernel_timing_callback')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2, kernel_profiling=True)
+
+    timing = KernelTimingCallback(interval=5)
+    mlg_model.evaluate([x], [y], 20.0, callbacks=[timing])
+
+    # 3 batches of 4 intervals
+    table = timing.get_table()
+    assert len(table) == 3 * 4
+    assert np.array_equal(table['end_timestep'][:4], [5, 10, 15, 20])
+    assert np.all(table['neuron_update_time'] >= 0.0)
+
+    trace = timing.get_chrome_trace()
+    assert sum(e['ph'] == 'X' and e['tid'] == 0 for e in trace['traceEvents']) == 3 * 4
+
+
+if __name__ == '__main__':
+    test_callbacks()
+    test_kernel_timing_callback()
@@ -0,0 +1,102 @@
+import numpy as np
+from ml_genn.data import array_max, load_data, BatchPrefetcher, QuantileSketch, ShardedArray
+
+
+def test_load_npy(tmp_path):
+    '''
+    Test .npy files are memory-mapped rather than loaded.
+    '''
+
+    x = np.arange(24, dtype=np.float32).reshape((6, 4))
+    np.save(tmp_path / 'x.npy', x)
+
+    data = load_data(str(tmp_path / 'x.npy'))
+    assert isinstance(data, np.memmap)
+    assert np.array_equal(data[2:5], x[2:5])
+
+
+def test_sharded_array(tmp_path):
+    '''
+    Test slicing across directories of .npy shards.
+    '''
+
+    x = np.arange(40, dtype=np.float32).reshape((10, 2, 2))
+    np.save(tmp_path / 'shard_0.npy', x[:3])
+    np.save(tmp_path / 'shard_1.npy', x[3:7])
+    np.save(tmp_path / 'shard_2.npy', x[7:])
+
+    data = load_data(str(tmp_path))
+    assert isinstance(data, ShardedArray)
+    assert data.shape == x.shape
+
+    # Slices within and across shards
+    assert np.array_equal(data[3:6], x[3:6])
+    assert np.array_equal(data[1:9], x[1:9])
+    assert np.array_equal(data[8:20], x[8:])
+    assert np.array_equal(data[5], x[5])
+    assert np.array_equal(data[-1], x[-1])
+
+    # Chunked maximum
+    assert array_max(data, chunk_size=4) == x.max()
+    assert array_max(-x, absolute=True, chunk_size=4) == x.max()
+
+
+
+def test_quantile_sketch():
+    '''
+    Test streaming percentile estimates are within relative accuracy.
+    '''
+
+    rng = np.random.default_rng(1234)
+    x = np.maximum(rng.normal(1.0, 2.0, size=(100, 1000)), 0.0)
+
+    # Update sketch in chunks
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for chunk in np.array_split(x, 7):
+        sketch.update(chunk)
+
+    assert sketch.count == x.size
+    assert sketch.percentile(100.0) == np.max(x)
+    assert sketch.percentile(10.0) == 0.0
+    for q in (50.0, 99.0, 99.9):
+        assert np.isclose(sketch.percentile(q), np.percentile(x, q), rtol=0.02)
+
+
+def test_batch_prefetcher_close():
+    '''
+    Test closing a prefetcher stops its worker when batches aren't all consumed.
+    '''
+
+    x = np.arange(40, dtype=np.float32).reshape((10, 4))
+    batches = ([[x[i:i + 1]], None] for i in range(10))
+    prefetcher = BatchPrefetcher(batches, lambda data, staging: [np.copy(d) for d in data],
+                                 num_buffers=1)
+
+    # Consume first batch without releasing its staging buffers so worker blocks
+    staging, batch_n, _ = next(iter(prefetcher))
+    assert batch_n == 1
+    assert np.array_equal(staging[0], x[:1])
+
+    prefetcher.close()
+    prefetcher._thread.join(timeout=5.0)
+    assert not prefetcher._thread.is_alive()
+
+
+def test_batch_prefetcher_buffers():
+    '''
+    Test prefetcher stages every batch into the staging buffers it is given.
+    '''
+
+    def stage(data, staging):
+        staging[0][:data[0].shape[0]] = data[0]
+        return staging
+
+    x = np.arange(40, dtype=np.float32).reshape((10, 4))
+    buffer = np.empty((2, 4), dtype=np.float32)
+    batches = ([[x[i:i + 2]], None] for i in range(0, 10, 2))
+    prefetcher = BatchPrefetcher(batches, stage, buffers=[[buffer]])
+
+    for i, (staging, batch_n, _) in enumerate(prefetcher):
+        assert staging[0] is buffer
+        assert np.array_equal(buffer, x[i * 2:(i + 1) * 2])
+        prefetcher.release(staging)
@@ -3,12 +3,12 @@ import tensorflow as tf
 import ml_genn as mlg
 
 
-def model_compare_tf_and_mlg(tf_model, x, connectivity_type='procedural'):
+def model_compare_tf_and_mlg(tf_model, x, connectivity_type='procedural', input_type='spike'):
     # Run TensorFlow model
     tf_y = tf_model(x).numpy()
 
     # Run ML GeNN model
-    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike'), 
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple(input_type), 
                                            connectivity_type=connectivity_type,
                                            dt=1.0, batch_size=1)
     mlg_model.outputs[0].neurons.set_threshold(np.float64(np.inf))
@@ -42,6 +42,12 @@ def model_input_all_off():
     ], dtype=np.float32)
 
 
+def model_input_signed():
+    return np.array([
+        [1, -1, 1, 0, -1],
+    ], dtype=np.float32)
+
+
 def model_weights_0():
     return np.array([
         [0, 4, -20, 1, 0, 0, 1],
@@ -118,7 +124,30 @@ def test_dense_all_off():
     model_compare_tf_and_mlg(tf_model, [x])
 
 
+def test_dense_signed():
+    '''
+    Test Dense with signed spike inputs.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = np.empty((1, 5), dtype=np.float32)
+    x[0, :] = model_input_signed()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(7, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_dense_signed')
+    tf_model.set_weights([model_weights_0()])
+
+    # Compare TensorFlow and ML GeNN models
+    model_compare_tf_and_mlg(tf_model, [x], input_type='spike_signed')
+
+
 if __name__ == '__main__':
     test_dense_all_on()
     test_dense_some_on()
     test_dense_all_off()
+    test_dense_signed()
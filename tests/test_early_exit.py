@@ -0,0 +1,188 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+
+from ml_genn.callbacks import Callback
+from ml_genn.layers import InputLayer, Layer, DenseSynapses
+from ml_genn.layers import FSReluInputNeurons, FSReluNeurons, IFNeurons, SpikeInputNeurons
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+    ], dtype=np.float32)
+
+
+def model_labels():
+    return np.array([0, 0, 1, 2, 0], dtype=np.int64)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+def record_predictions(mlg_model):
+    # Wrap output neurons' readout to record predictions made during evaluation
+    neurons = mlg_model.outputs[0].neurons
+    get_predictions = neurons.get_predictions
+    recorded = []
+    def record(batch_n):
+        predictions = get_predictions(batch_n)
+        recorded.append(np.copy(predictions))
+        return predictions
+    neurons.get_predictions = record
+    return recorded
+
+
+def test_early_exit():
+    '''
+    Test early exit ends presentations early without changing results.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_early_exit')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    recorded = record_predictions(mlg_model)
+
+    # Evaluate for full presentation time
+    acc, _, _ = mlg_model.evaluate([x], [y], 100.0)
+    full_predictions = np.concatenate(recorded)
+    assert mlg_model.mean_timesteps == 100
+
+    # Evaluate with early exit
+    del recorded[:]
+    acc_early_exit, _, _ = mlg_model.evaluate([x], [y], 100.0, early_exit_interval=5,
+                                              early_exit_margin=3)
+    early_exit_predictions = np.concatenate(recorded)
+
+    assert acc == acc_early_exit
+    assert np.array_equal(full_predictions, early_exit_predictions)
+    assert mlg_model.mean_timesteps < 100
+
+
+def test_early_exit_invalid():
+    '''
+    Test early exit is rejected without a criterion or for pipelined models.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='hidden', activation='relu', use_bias=False, input_shape=(5,)),
+        tf.keras.layers.Dense(3, name='output', use_bias=False),
+    ], name='test_early_exit_invalid')
+    tf_model.set_weights([model_weights(), np.eye(3, dtype=np.float32)])
+
+    # Early exit requires a margin or confidence criterion
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    try:
+        mlg_model.evaluate([x], [y], 100.0, early_exit_interval=5)
+    except ValueError:
+        pass
+    else:
+        assert False, 'ValueError not raised'
+
+    # Early exit is not supported for pipelined Few Spike models
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.FewSpike(K=8),
+                                           dt=1.0, batch_size=2)
+    assert mlg_model.calc_pipeline_depth() > 0
+    try:
+        mlg_model.evaluate([x], [y], 8.0, early_exit_interval=1, early_exit_margin=1)
+    except NotImplementedError:
+        pass
+    else:
+        assert False, 'NotImplementedError not raised'
+
+
+def test_early_exit_single_output():
+    '''
+    Test samples are always decided by an output layer with a single neuron.
+    '''
+
+    x = np.ones((4, 5), dtype=np.float32)
+    y = np.zeros(4, dtype=np.int64)
+
+    inputs = InputLayer('inputs', (5,), neurons=SpikeInputNeurons())
+    outputs = Layer('outputs', neurons=IFNeurons(threshold=1.0))
+    outputs.connect([inputs], [DenseSynapses(1)])
+    outputs.set_weights([np.ones((5, 1), dtype=np.float32)])
+
+    mlg_model = mlg.Model([inputs], [outputs], name='test_early_exit_single_output')
+    mlg_model.compile(batch_size=2)
+
+    acc, _, _ = mlg_model.evaluate([x], [y], 100.0, early_exit_interval=5,
+                                   early_exit_margin=1)
+    assert acc[0] == 100
+    assert mlg_model.mean_timesteps == 5
+
+
+class BatchCounter(Callback):
+    def __init__(self):
+        self.n_batches = 0
+
+    def on_batch_begin(self, batch, logs):
+        self.n_batches += 1
+
+
+def test_early_exit_unsupported_outputs():
+    '''
+    Test early exit is rejected before simulation for unpipelined Few Spike outputs.
+    '''
+
+    x = np.ones((4, 5), dtype=np.float32)
+    y = np.zeros(4, dtype=np.int64)
+
+    # Few Spike output layer connected directly to input isn't pipelined
+    inputs = InputLayer('inputs', (5,), neurons=FSReluInputNeurons(K=8, alpha=1.0))
+    outputs = Layer('outputs', neurons=FSReluNeurons(K=8, alpha=8.0))
+    outputs.connect([inputs], [DenseSynapses(3)])
+    outputs.set_weights([np.ones((5, 3), dtype=np.float32)])
+
+    mlg_model = mlg.Model([inputs], [outputs], name='test_early_exit_unsupported_outputs')
+    mlg_model.compile(batch_size=2)
+    assert mlg_model.calc_pipeline_depth() == 0
+
+    counter = BatchCounter()
+    try:
+        mlg_model.evaluate([x], [y], 8.0, early_exit_interval=1, early_exit_margin=1,
+                           callbacks=[counter])
+    except NotImplementedError:
+        pass
+    else:
+        assert False, 'NotImplementedError not raised'
+    assert counter.n_batches == 0
+
+
+if __name__ == '__main__':
+    test_early_exit()
+    test_early_exit_invalid()
+    test_early_exit_single_output()
+    test_early_exit_unsupported_outputs()
@@ -0,0 +1,154 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.data import batch_dataset
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+    ], dtype=np.float32)
+
+
+def model_labels():
+    return np.array([0, 0, 1, 2, 0], dtype=np.int64)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+def chunk_generator(x, y, chunk_sizes):
+    start = 0
+    for n in chunk_sizes:
+        yield x[start:start + n], y[start:start + n]
+        start += n
+
+
+def test_batch_dataset():
+    '''
+    Test re-chunking of irregular chunks into batches.
+    '''
+
+    x = model_input()
+    y = model_labels()
+
+    batches = list(batch_dataset(chunk_generator(x, y, [1, 3, 1]), 2))
+    assert [b[0][0].shape[0] for b in batches] == [2, 2, 1]
+    assert np.array_equal(np.concatenate([b[0][0] for b in batches]), x)
+    assert np.array_equal(np.concatenate([b[1][0] for b in batches]), y)
+
+
+def test_evaluate_batched():
+    '''
+    Test streaming evaluation matches array evaluation.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_evaluate_batched')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+
+    # Evaluate with arrays and with irregular chunks from a generator
+    acc, _, _ = mlg_model.evaluate([x], [y], 20.0)
+    acc_batched, _, _ = mlg_model.evaluate_batched(
+        chunk_generator(x, y, [1, 3, 1]), 20.0)
+
+    assert acc == acc_batched
+
+
+def test_evaluate_parallel():
+    '''
+    Test sharded multi-process evaluation matches single-process evaluation.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_evaluate_parallel')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+
+    acc, spk_i, spk_t = mlg_model.evaluate([x], [y], 20.0, save_samples=[1, 4])
+    acc_parallel, parallel_i, parallel_t = mlg_model.evaluate_parallel(
+        [x], [y], 20.0, num_workers=2, save_samples=[4, 1])
+
+    assert acc == acc_parallel
+    for s in range(2):
+        for l in range(len(mlg_model.layers)):
+            assert np.array_equal(spk_i[s][l], parallel_i[s][l])
+            assert np.allclose(spk_t[s][l], parallel_t[s][l])
+
+
+def test_evaluate_prefetch():
+    '''
+    Test evaluation with prefetching matches evaluation without.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+    y = model_labels()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_evaluate_prefetch')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+
+    acc, spk_i, spk_t = mlg_model.evaluate([x], [y], 20.0, save_samples=[1, 4])
+    acc_prefetch, prefetch_i, prefetch_t = mlg_model.evaluate(
+        [x], [y], 20.0, save_samples=[1, 4], prefetch=True)
+
+    assert acc == acc_prefetch
+    for s in range(2):
+        for l in range(len(mlg_model.layers)):
+            assert np.array_equal(spk_i[s][l], prefetch_i[s][l])
+            assert np.allclose(spk_t[s][l], prefetch_t[s][l])
+
+    # Streamed evaluation with prefetching
+    acc_batched, _, _ = mlg_model.evaluate_batched(
+        chunk_generator(x, y, [1, 3, 1]), 20.0, prefetch=True)
+    assert acc == acc_batched
+
+
+if __name__ == '__main__':
+    test_batch_dataset()
+    test_evaluate_batched()
+    test_evaluate_parallel()
+    test_evaluate_prefetch()
@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+
+
+def test_import_lazy():
+    '''
+    Test importing ml_genn doesn't import heavy optional dependencies or create GeNN models.
+    '''
+
+    script = '''
+import json, sys
+import ml_genn
+from ml_genn.layers.model_registry import _models
+print(json.dumps({
+    'modules': [m for m in ['tensorflow', 'matplotlib', 'tqdm'] if m in sys.modules],
+    'models': [n for n, m in _models.items() if m._model is not None],
+}))
+'''
+
+    # Import ml_genn in a fresh interpreter
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    result = json.loads(output.splitlines()[-1])
+    assert result['modules'] == []
+    assert result['models'] == []
+
+
+if __name__ == '__main__':
+    test_import_lazy()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import numpy as np
+
+import tensorflow as tf
+from tensorflow.keras import models
+from tensorflow.keras import layers
+
+import ml_genn as mlg
+
+
+def assert_models_equal(mlg_model_a, mlg_model_b):
+    assert(mlg_model_a.name == mlg_model_b.name)
+    assert(len(mlg_model_a.layers) == len(mlg_model_b.layers))
+    for layer_a, layer_b in zip(mlg_model_a.layers, mlg_model_b.layers):
+        assert(layer_a.name == layer_b.name)
+        assert(layer_a.shape == layer_b.shape)
+        assert(type(layer_a) == type(layer_b))
+        assert(type(layer_a.neurons) == type(layer_b.neurons))
+
+        synapses_a = sorted(layer_a.upstream_synapses, key=lambda s: s.source().name)
+        synapses_b = sorted(layer_b.upstream_synapses, key=lambda s: s.source().name)
+        assert(len(synapses_a) == len(synapses_b))
+        for syn_a, syn_b in zip(synapses_a, synapses_b):
+            assert(syn_a.source().name == syn_b.source().name)
+            assert(type(syn_a) == type(syn_b))
+            assert(np.array_equal(syn_a.get_weights(), syn_b.get_weights()))
+
+
+def test_keras_h5_conversion():
+    '''
+    Test converting a Keras HDF5 file produces the same model as converting the TensorFlow model.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # TensorFlow model
+    inputs = layers.Input(shape=(16, 16, 1), name='inputs')
+    c1 =     layers.Conv2D(8, 3, padding='same', activation='relu', use_bias=False, name='conv1')(inputs)
+    p1 =     layers.AveragePooling2D(2, name='pool1')(c1)
+    c2 =     layers.Conv2D(8, 3, padding='same', activation='relu', use_bias=False, name='conv2')(p1)
+    c3 =     layers.Conv2D(8, 3, padding='same', activation='relu', use_bias=False, name='conv3')(c2)
+    add =    layers.add([c2, c3])
+    gap =    layers.GlobalAveragePooling2D(name='gap')(add)
+    d1 =     layers.Dense(10, activation='relu', use_bias=False, name='dense1')(gap)
+    tf_model = models.Model(inputs, d1, name='test_keras_h5_conversion')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.h5')
+        tf_model.save(path)
+
+        # Convert TensorFlow model and HDF5 file
+        mlg_model_tf = mlg.Model.convert_tf_model(tf_model)
+        mlg_model_h5 = mlg.Model.convert_keras_h5(path)
+
+    assert_models_equal(mlg_model_tf, mlg_model_h5)
+
+
+def test_keras_h5_data_norm():
+    '''
+    Test converting a Keras HDF5 file with precomputed normalisation activations.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # TensorFlow model
+    tf_model = models.Sequential([
+        layers.Dense(16, activation='relu', use_bias=False, name='dense1', input_shape=(8,)),
+        layers.Dense(4, activation='relu', use_bias=False, name='dense2'),
+    ], name='test_keras_h5_data_norm')
+    norm_data = np.random.uniform(0.0, 1.0, size=(32, 8)).astype(np.float32)
+
+    # Precompute maximum activations of each layer
+    get_outputs = tf.keras.backend.function(
+        tf_model.inputs, [l.output for l in tf_model.layers])
+    max_activations = {l.name: np.max(out)
+                       for l, out in zip(tf_model.layers, get_outputs([norm_data]))}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.h5')
+        tf_model.save(path)
+
+        # Convert TensorFlow model and HDF5 file
+        mlg_model_tf = mlg.Model.convert_tf_model(
+            tf_model, converter=mlg.converters.DataNorm(norm_data=[norm_data]))
+        mlg_model_h5 = mlg.Model.convert_keras_h5(
+            path, converter=mlg.converters.DataNorm(max_activations=max_activations))
+
+    assert_models_equal(mlg_model_tf, mlg_model_h5)
+    for layer_tf, layer_h5 in zip(mlg_model_tf.layers[1:], mlg_model_h5.layers[1:]):
+        assert(np.isclose(layer_tf.neurons.threshold, layer_h5.neurons.threshold))
+
+
+if __name__ == '__main__':
+    test_keras_h5_conversion()
+    test_keras_h5_data_norm()
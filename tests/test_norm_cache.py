@@ -0,0 +1,72 @@
+import json
+import os
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from tensorflow.keras import models, layers
+
+from ml_genn.norm_cache import NormCache, calc_norm_key
+
+
+def test_norm_cache(tmp_path):
+    '''
+    Test normalisation cache keys and entries.
+    '''
+
+    weights = [np.arange(12, dtype=np.float32).reshape((3, 4))]
+    norm_data = [np.ones((5, 3), dtype=np.float32)]
+    key = calc_norm_key('DataNorm', {'percentile': 100.0}, weights, norm_data)
+
+    # Keys depend on converter parameters, weights and normalisation data
+    assert key == calc_norm_key('DataNorm', {'percentile': 100.0}, weights, norm_data)
+    assert key != calc_norm_key('DataNorm', {'percentile': 99.9}, weights, norm_data)
+    assert key != calc_norm_key('DataNorm', {'percentile': 100.0}, [weights[0] + 1.0], norm_data)
+    assert key != calc_norm_key('DataNorm', {'percentile': 100.0}, weights, [norm_data[0][:4]])
+
+    norm_cache = NormCache(str(tmp_path))
+    assert norm_cache.get(key) is None
+    norm_cache.put(key, 'DataNorm', {'dense': 2.5})
+    assert norm_cache.get(key) == {'dense': 2.5}
+
+    # Entries can be inspected
+    with open(norm_cache.get_entry_path(key)) as f:
+        assert json.load(f)['converter'] == 'DataNorm'
+
+
+def test_data_norm_cache(tmp_path):
+    '''
+    Test DataNorm reuses cached maximum activations.
+    '''
+
+    rng = np.random.default_rng(1234)
+    x = rng.uniform(size=(16, 8)).astype(np.float32)
+
+    tf_model = models.Sequential(name='test_data_norm_cache')
+    tf_model.add(layers.Input(shape=(8,), name='inputs'))
+    tf_model.add(layers.Dense(6, activation='relu', use_bias=False, name='dense1'))
+    tf_model.add(layers.Dense(4, activation='relu', use_bias=False, name='dense2'))
+
+    converter = mlg.converters.DataNorm(norm_data=[x], norm_cache_dir=str(tmp_path))
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter)
+    entries = os.listdir(str(tmp_path))
+    assert len(entries) == 1
+
+    # Modify cached maximum activations and check reconversion uses them
+    entry_path = os.path.join(str(tmp_path), entries[0])
+    with open(entry_path) as f:
+        entry = json.load(f)
+    entry['values'] = {'dense1': 1000.0, 'dense2': 2000.0}
+    with open(entry_path, 'w') as f:
+        json.dump(entry, f)
+
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter)
+    assert np.isclose(mlg_model.layers[1].neurons.threshold, 1000.0)
+    assert np.isclose(mlg_model.layers[2].neurons.threshold, 2.0)
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_norm_cache(tmp_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_data_norm_cache(tmp_dir)
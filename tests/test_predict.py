@@ -0,0 +1,128 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+import ml_genn.layers.if_neurons as if_neurons
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+    ], dtype=np.float32)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+def model_weights_tied():
+    # Outputs 0 and 1 have identical weights so always spike equally
+    weights = model_weights()
+    weights[:, 1] = weights[:, 0]
+    return weights
+
+
+def test_predict():
+    '''
+    Test predictions match the labels evaluate scores as correct.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_predict')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+
+    predictions, scores = mlg_model.predict([x], 20.0)
+    assert scores[0].shape == (5, 3)
+    assert np.array_equal(predictions[0], scores[0].argmax(axis=1))
+
+    # Predictions should be scored as 100% accurate
+    acc, _, _ = mlg_model.evaluate([x], [predictions[0]], 20.0)
+    assert acc[0] == 100
+
+
+def test_readout():
+    '''
+    Test on-device readout predictions match the host argmax, including ties.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_readout')
+    tf_model.set_weights([model_weights_tied()])
+
+    # Without a readout time, no readout should be compiled
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    assert mlg_model.outputs[0].neurons.readout is None
+
+    # Convert and compile ML GeNN model with on-device readout
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2, device_readout_time=20.0)
+    neurons = mlg_model.outputs[0].neurons
+    assert neurons.readout is not None
+
+    for batch_start in range(0, x.shape[0], 2):
+        x_batch = x[batch_start:batch_start + 2]
+        batch_n = x_batch.shape[0]
+
+        mlg_model.reset()
+        mlg_model.set_input_batch([x_batch])
+        mlg_model.step_time(20)
+
+        # Readout should match host argmax, which breaks ties towards lowest index
+        scores = neurons.get_scores(batch_n)
+        assert np.all(scores[:, 0] == scores[:, 1])
+        host_predictions = scores.argmax(axis=1)
+        assert not np.any(host_predictions == 1)
+        assert np.array_equal(neurons.get_predictions(batch_n), host_predictions)
+
+        # Top 1 should be the same neuron and tied samples should never be decided
+        top_k_indices, top_k_scores = neurons.get_top_k(batch_n, 2)
+        assert np.array_equal(top_k_indices[:, 0], host_predictions)
+        assert np.array_equal(top_k_scores, -np.sort(-scores, axis=1)[:, :2])
+        assert not np.any(neurons.get_decided(batch_n, margin=1))
+
+        # If encoded scores could exceed exactly-representable range,
+        # predictions should fall back to host argmax without running readout
+        def fail_custom_update(name):
+            assert False, 'readout used beyond exactly-representable range'
+
+        max_exact_score = if_neurons.MAX_EXACT_SCORE
+        try:
+            if_neurons.MAX_EXACT_SCORE = (mlg_model.g_model.timestep + 1) * scores.shape[1]
+            mlg_model.g_model.custom_update = fail_custom_update
+            assert np.array_equal(neurons.get_predictions(batch_n), host_predictions)
+        finally:
+            if_neurons.MAX_EXACT_SCORE = max_exact_score
+            del mlg_model.g_model.custom_update
+
+
+if __name__ == '__main__':
+    test_predict()
+    test_readout()
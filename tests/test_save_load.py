@@ -0,0 +1,80 @@
+import os
+import tempfile
+import numpy as np
+
+from ml_genn import Model, save_model, load_model
+from ml_genn.layers import InputLayer, Layer, IFNeurons, SpikeInputNeurons
+from ml_genn.layers import Conv2DSynapses, AvePool2DDenseSynapses, DenseSynapses
+
+
+def create_model():
+    inputs = InputLayer('inputs', (8, 8, 1), neurons=SpikeInputNeurons())
+    conv = Layer('conv', neurons=IFNeurons(threshold=2.0))
+    conv.connect([inputs], [Conv2DSynapses(4, 3, conv_padding='same', connectivity_type='sparse')])
+    dense = Layer('dense', neurons=IFNeurons(threshold=1.0))
+    dense.connect([conv, inputs], [AvePool2DDenseSynapses(10, 2), DenseSynapses(10)])
+
+    for layer in (conv, dense):
+        layer.set_weights([np.random.uniform(-1.0, 1.0, size=s.weights.shape)
+                           for s in layer.upstream_synapses])
+
+    return Model([inputs], [dense], name='test_save_load')
+
+
+def assert_models_equal(model_a, model_b):
+    assert(model_a.name == model_b.name)
+    assert([l.name for l in model_a.inputs] == [l.name for l in model_b.inputs])
+    assert([l.name for l in model_a.outputs] == [l.name for l in model_b.outputs])
+    assert(len(model_a.layers) == len(model_b.layers))
+    for layer_a, layer_b in zip(model_a.layers, model_b.layers):
+        assert(layer_a.name == layer_b.name)
+        assert(layer_a.shape == layer_b.shape)
+        assert(type(layer_a.neurons) == type(layer_b.neurons))
+        assert(vars(layer_a.neurons) == vars(layer_b.neurons))
+        for syn_a, syn_b in zip(layer_a.upstream_synapses, layer_b.upstream_synapses):
+            assert(type(syn_a) == type(syn_b))
+            assert(syn_a.source().name == syn_b.source().name)
+            assert(np.array_equal(syn_a.get_weights(), syn_b.get_weights()))
+            assert({k: v for k, v in vars(syn_a).items() if k not in ('source', 'target', 'weights')} ==
+                   {k: v for k, v in vars(syn_b).items() if k not in ('source', 'target', 'weights')})
+
+
+def test_save_load():
+    '''
+    Test models saved as directories and archives are loaded identically.
+    '''
+
+    model = create_model()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_model(model, os.path.join(tmp_dir, 'model'))
+        save_model(model, os.path.join(tmp_dir, 'model.zip'), archive=True)
+
+        for path in ('model', 'model.zip'):
+            for mmap in (True, False):
+                assert_models_equal(model, load_model(os.path.join(tmp_dir, path), mmap=mmap))
+
+
+def test_save_load_compile():
+    '''
+    Test loaded models produce the same predictions as the saved model.
+    '''
+
+    model = create_model()
+    x = (np.random.uniform(size=(4, 8, 8, 1)) < 0.5).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        save_model(model, os.path.join(tmp_dir, 'model.zip'), archive=True)
+        loaded_model = load_model(os.path.join(tmp_dir, 'model.zip'))
+
+        model.compile(batch_size=4)
+        loaded_model.compile(batch_size=4)
+
+        _, scores = model.predict([x], 10)
+        _, loaded_scores = loaded_model.predict([x], 10)
+        assert(np.array_equal(scores[0], loaded_scores[0]))
+
+
+if __name__ == '__main__':
+    test_save_load()
+    test_save_load_compile()
@@ -0,0 +1,99 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from concurrent.futures import ThreadPoolExecutor
+from ml_genn.server import InferenceServer
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+        [0, 0, 1, 1, 1],
+        [1, 1, 0, 0, 0],
+    ], dtype=np.float32)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+def test_inference_server():
+    '''
+    Test micro-batched concurrent requests match batch predictions.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_inference_server')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    predictions, _ = mlg_model.predict([x], 20.0)
+
+    # Issue single-sample requests concurrently
+    server = InferenceServer(mlg_model, 20.0, max_delay=0.01)
+    with ThreadPoolExecutor(max_workers=x.shape[0]) as executor:
+        served = list(executor.map(lambda s: server.predict([s])[0], x))
+    server.close()
+
+    assert np.array_equal(served, predictions[0])
+
+
+def test_inference_server_failure():
+    '''
+    Test simulation errors fail pending and later requests rather than hanging.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    x = model_input()
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_inference_server_failure')
+    tf_model.set_weights([model_weights()])
+
+    # Convert and compile ML GeNN model whose simulation fails
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    def step_time(iterations=1):
+        raise RuntimeError('simulation error')
+    mlg_model.step_time = step_time
+
+    # Issue concurrent requests which should all fail
+    server = InferenceServer(mlg_model, 20.0, max_delay=0.01)
+    def predict(s):
+        try:
+            server.predict([s])
+        except RuntimeError:
+            return True
+        return False
+    with ThreadPoolExecutor(max_workers=x.shape[0]) as executor:
+        assert all(executor.map(predict, x))
+
+    # Later requests fail immediately and server can still be closed
+    assert predict(x[0])
+    server.close()
+
+
+if __name__ == '__main__':
+    test_inference_server()
+    test_inference_server_failure()
@@ -0,0 +1,183 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.layers import InputLayer, Layer, IFNeurons, SpikeInputNeurons
+from ml_genn.layers import Conv2DSynapses, AvePool2DConv2DSynapses, DenseSynapses
+
+
+def model_compare_tf_and_mlg(mlg_model, tf_model, x):
+    # Run TensorFlow model
+    tf_y = tf_model(x).numpy()
+
+    # Run ML GeNN model
+    mlg_model.outputs[0].neurons.set_threshold(np.float64(np.inf))
+    mlg_model.reset()
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(2)
+
+    nrn = mlg_model.outputs[0].neurons.nrn
+    nrn.pull_var_from_device('Vmem')
+    mlg_y = nrn.vars['Vmem'].view.reshape(tf_y.shape)
+
+    assert np.allclose(mlg_y, tf_y, rtol=0.0, atol=1.0e-5)
+
+
+def create_tf_model(name):
+    return tf.keras.models.Sequential([
+        tf.keras.layers.Conv2D(2, 3, name='conv', padding='same', use_bias=False,
+                               input_shape=(8, 8, 1)),
+        tf.keras.layers.AveragePooling2D(2),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(4, name='output', use_bias=False),
+    ], name=name)
+
+
+def reuse_compiled_model(connectivity_type):
+    x = np.random.randint(0, 2, size=(1, 8, 8, 1)).astype(np.float32)
+
+    # Convert model with initial weights
+    tf_model = create_tf_model('test_set_weights_{}'.format(connectivity_type))
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike'),
+                                           connectivity_type=connectivity_type,
+                                           dt=1.0, batch_size=1)
+    model_compare_tf_and_mlg(mlg_model, tf_model, x)
+
+    # Retrain model and convert again, reusing compiled model
+    tf_model.set_weights([np.random.uniform(-1.0, 1.0, size=w.shape).astype(np.float32)
+                          for w in tf_model.get_weights()])
+    reused_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike'),
+                                              connectivity_type=connectivity_type,
+                                              reuse_mlg_model=mlg_model)
+    assert reused_model is mlg_model
+    model_compare_tf_and_mlg(reused_model, tf_model, x)
+
+    # Set weights directly
+    tf_model.set_weights([np.random.uniform(-1.0, 1.0, size=w.shape).astype(np.float32)
+                          for w in tf_model.get_weights()])
+    mlg_model.set_weights({'conv': [tf_model.get_layer('conv').get_weights()[0]],
+                           'output': [tf_model.get_layer('output').get_weights()[0]]})
+    model_compare_tf_and_mlg(mlg_model, tf_model, x)
+
+
+def test_set_weights_procedural():
+    '''
+    Test updating weights of a loaded model with procedural connectivity.
+    '''
+
+    reuse_compiled_model('procedural')
+
+
+def test_set_weights_sparse():
+    '''
+    Test updating weights of a loaded model with sparse connectivity.
+    '''
+
+    reuse_compiled_model('sparse')
+
+
+def test_set_weights_shape_mismatch():
+    '''
+    Test setting weights with the wrong shape is rejected.
+    '''
+
+    tf_model = create_tf_model('test_set_weights_shape_mismatch')
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('spike'),
+                                           dt=1.0, batch_size=1)
+    try:
+        mlg_model.set_weights({'output': [np.zeros((4, 4))]})
+    except ValueError:
+        pass
+    else:
+        assert False, 'ValueError not raised'
+
+
+def create_branch_model(name, connectivity_type):
+    # Conv2D, AvePool2DConv2D and Dense synapses all driven directly by the input
+    inputs = InputLayer('inputs', (8, 8, 1), neurons=SpikeInputNeurons())
+    conv = Layer('conv', neurons=IFNeurons(threshold=np.inf))
+    conv.connect([inputs], [Conv2DSynapses(2, 3, conv_padding='same',
+                                           connectivity_type=connectivity_type)])
+    pool_conv = Layer('pool_conv', neurons=IFNeurons(threshold=np.inf))
+    pool_conv.connect([inputs], [AvePool2DConv2DSynapses(2, 2, 3, conv_padding='same',
+                                                         connectivity_type=connectivity_type)])
+    dense = Layer('dense', neurons=IFNeurons(threshold=np.inf))
+    dense.connect([inputs], [DenseSynapses(4)])
+    return mlg.Model([inputs], [conv, pool_conv, dense], name=name)
+
+
+def random_weights(mlg_model, names):
+    return {n: [np.random.uniform(-1.0, 1.0, size=w.shape).astype(np.float32)
+                for w in mlg_model.get_weights()[n]]
+            for n in names}
+
+
+def branch_model_compare(mlg_model, weights, x):
+    # Calculate expected output of each layer
+    expected = {
+        'conv': tf.nn.conv2d(x, weights['conv'][0], 1, 'SAME').numpy(),
+        'pool_conv': tf.nn.conv2d(tf.nn.avg_pool2d(x, 2, 2, 'VALID'),
+                                  weights['pool_conv'][0], 1, 'SAME').numpy(),
+        'dense': x.reshape((1, -1)) @ weights['dense'][0]}
+
+    # Run ML GeNN model
+    mlg_model.reset()
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(2)
+
+    for layer in mlg_model.outputs:
+        nrn = layer.neurons.nrn
+        nrn.pull_var_from_device('Vmem')
+        mlg_y = nrn.vars['Vmem'].view.reshape(expected[layer.name].shape)
+        assert np.allclose(mlg_y, expected[layer.name], rtol=0.0, atol=1.0e-5)
+
+
+def set_weights_mixed(connectivity_type):
+    x = np.random.randint(0, 2, size=(1, 8, 8, 1)).astype(np.float32)
+
+    mlg_model = create_branch_model('test_set_weights_mixed_{}'.format(connectivity_type),
+                                    connectivity_type)
+    weights = random_weights(mlg_model, ['conv', 'pool_conv', 'dense'])
+    mlg_model.set_weights(weights)
+    mlg_model.compile(dt=1.0, batch_size=1)
+    branch_model_compare(mlg_model, weights, x)
+
+    # Update all layers together
+    weights = random_weights(mlg_model, ['conv', 'pool_conv', 'dense'])
+    mlg_model.set_weights(weights)
+    branch_model_compare(mlg_model, weights, x)
+
+    # Update only convolutional layers and check dense weights are unaffected
+    weights.update(random_weights(mlg_model, ['conv', 'pool_conv']))
+    mlg_model.set_weights({'conv': weights['conv'], 'pool_conv': weights['pool_conv']})
+    branch_model_compare(mlg_model, weights, x)
+
+    # Update individual layers
+    weights.update(random_weights(mlg_model, ['dense']))
+    mlg_model.outputs[2].set_weights(weights['dense'])
+    weights.update(random_weights(mlg_model, ['pool_conv']))
+    mlg_model.outputs[1].set_weights(weights['pool_conv'])
+    branch_model_compare(mlg_model, weights, x)
+
+
+def test_set_weights_mixed_procedural():
+    '''
+    Test updating Conv2D, AvePool2DConv2D and Dense weights with procedural connectivity.
+    '''
+
+    set_weights_mixed('procedural')
+
+
+def test_set_weights_mixed_sparse():
+    '''
+    Test updating Dense weights alongside sparse weights which require reinitialisation.
+    '''
+
+    set_weights_mixed('sparse')
+
+
+if __name__ == '__main__':
+    test_set_weights_procedural()
+    test_set_weights_sparse()
+    test_set_weights_shape_mismatch()
+    test_set_weights_mixed_procedural()
+    test_set_weights_mixed_sparse()
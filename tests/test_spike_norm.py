@@ -0,0 +1,120 @@
+import os
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from tensorflow.keras import models, layers
+
+from ml_genn.converters import SpikeNorm
+from ml_genn.layers import InputLayer, Layer, IFNeurons, SpikeInputNeurons, DenseSynapses
+
+
+def test_if_max_input():
+    '''
+    Test IF neurons track maximum input on device.
+    '''
+
+    rng = np.random.default_rng(1234)
+    x = (rng.uniform(size=(2, 8)) < 0.5).astype(np.float32)
+    w = rng.uniform(-1.0, 1.0, size=(8, 4)).astype(np.float32)
+
+    inputs = InputLayer('inputs', (8,), neurons=SpikeInputNeurons())
+    outputs = Layer('outputs', neurons=IFNeurons(threshold=np.inf, track_max_input=True))
+    outputs.connect([inputs], [DenseSynapses(4)])
+    outputs.set_weights([w])
+
+    mlg_model = mlg.Model([inputs], [outputs], name='test_if_max_input')
+    mlg_model.compile(batch_size=2)
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(5)
+
+    assert np.allclose(outputs.neurons.get_max_input(2),
+                       np.maximum(x @ w, 0.0), rtol=0.0, atol=1.0e-5)
+
+
+def test_spike_norm():
+    '''
+    Test SpikeNorm calibrates first layer threshold to maximum input.
+    '''
+
+    rng = np.random.default_rng(1234)
+    x = (rng.uniform(size=(5, 8)) < 0.5).astype(np.float32)
+
+    tf_model = models.Sequential(name='test_spike_norm')
+    tf_model.add(layers.Input(shape=(8,), name='inputs'))
+    tf_model.add(layers.Dense(6, activation='relu', use_bias=False, name='dense1'))
+    tf_model.add(layers.Dense(4, activation='relu', use_bias=False, name='dense2'))
+
+    converter = mlg.converters.SpikeNorm(norm_data=[x], norm_time=5, input_type='spike')
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=converter, batch_size=2)
+
+    # Converted model uses plain IF neurons for inference
+    assert not any(l.neurons.track_max_input for l in mlg_model.layers[1:])
+
+    # Calibration model is built in a temporary directory
+    assert not os.path.exists('test_spike_norm_spike_norm_CODE')
+
+    w = tf_model.get_layer('dense1').get_weights()[0]
+    assert np.isclose(mlg_model.layers[1].neurons.threshold,
+                      max(np.max(x @ w), 0.0), rtol=0.0, atol=1.0e-5)
+
+
+def test_if_inactive():
+    '''
+    Test gated IF neurons ignore their input and don't spike.
+    '''
+
+    x = np.ones((1, 8), dtype=np.float32)
+
+    inputs = InputLayer('inputs', (8,), neurons=SpikeInputNeurons())
+    outputs = Layer('outputs', neurons=IFNeurons(threshold=1.0, track_max_input=True))
+    outputs.connect([inputs], [DenseSynapses(4)])
+    outputs.set_weights([np.ones((8, 4), dtype=np.float32)])
+
+    mlg_model = mlg.Model([inputs], [outputs], name='test_if_inactive')
+    mlg_model.compile()
+    outputs.neurons.set_active(False)
+    mlg_model.set_input_batch([x])
+    mlg_model.step_time(5)
+
+    assert np.all(outputs.neurons.get_max_input(1) == 0.0)
+    assert np.all(outputs.neurons.get_scores(1) == 0)
+
+    # Re-enable neurons and check they spike
+    outputs.neurons.set_active(True)
+    mlg_model.reset()
+    mlg_model.step_time(5)
+
+    assert np.all(outputs.neurons.get_scores(1) > 0)
+
+
+def test_spike_norm_calibration_model():
+    '''
+    Test SpikeNorm calibration model copies every layer, tracking maximum input.
+    '''
+
+    inputs = InputLayer('inputs', (8,), neurons=SpikeInputNeurons())
+    dense1 = Layer('dense1', neurons=IFNeurons(threshold=2.0))
+    dense1.connect([inputs], [DenseSynapses(6)])
+    dense2 = Layer('dense2', neurons=IFNeurons(threshold=1.0))
+    dense2.connect([dense1], [DenseSynapses(4)])
+    mlg_model = mlg.Model([inputs], [dense2], name='test_spike_norm_calibration_model')
+
+    calib_model, calib_layers = SpikeNorm._create_calibration_model(mlg_model)
+    assert [l.name for l in calib_model.layers] == ['inputs', 'dense1', 'dense2']
+    assert calib_model.inputs == [calib_layers[inputs]]
+    assert calib_model.outputs == [calib_layers[dense2]]
+    for l in (dense1, dense2):
+        assert calib_layers[l].neurons.track_max_input
+        assert calib_layers[l].neurons.threshold == np.inf
+        assert calib_layers[l].upstream_synapses[0].weights is l.upstream_synapses[0].weights
+
+    # Only layers providing input to a layer are upstream of it
+    upstream = SpikeNorm._get_upstream_layers(calib_layers[dense1])
+    assert upstream == {calib_layers[inputs], calib_layers[dense1]}
+
+
+if __name__ == '__main__':
+    test_if_max_input()
+    test_if_inactive()
+    test_spike_norm()
+    test_spike_norm_calibration_model()
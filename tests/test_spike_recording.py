@@ -0,0 +1,88 @@
+import numpy as np
+import tensorflow as tf
+import ml_genn as mlg
+from ml_genn.spike_recording import SpikeRecording
+
+
+def model_input():
+    return np.array([
+        [1, 1, 1, 1, 1],
+        [1, 0, 1, 0, 1],
+        [0, 1, 0, 1, 0],
+    ], dtype=np.float32)
+
+
+def model_weights():
+    return np.array([
+        [0.5, 0.1, 0.0],
+        [0.2, 0.3, 0.1],
+        [0.1, 0.0, 0.4],
+        [0.0, 0.2, 0.3],
+        [0.3, 0.1, 0.0],
+    ], dtype=np.float32)
+
+
+def test_spike_recording():
+    '''
+    Test spikes saved from on-device recording buffers match spikes pulled every timestep.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # Inputs
+    x = model_input()
+    y = np.zeros(x.shape[0], dtype=np.int64)
+
+    # Create TensorFlow model
+    tf_model = tf.keras.models.Sequential([
+        tf.keras.layers.Dense(3, name='output', use_bias=False, input_shape=(5,)),
+    ], name='test_spike_recording')
+    tf_model.set_weights([model_weights()])
+
+    # Evaluate without spike recording
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2)
+    _, pulled_i, pulled_t = mlg_model.evaluate([x], [y], 20.0, save_samples=[0, 2])
+
+    # Evaluate with spike recording
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.Simple('if'),
+                                           dt=1.0, batch_size=2, spike_recording_time=20.0)
+    _, recorded_i, recorded_t = mlg_model.evaluate([x], [y], 20.0, save_samples=[0, 2])
+
+    for s in range(2):
+        for l in range(len(mlg_model.layers)):
+            pulled_order = np.lexsort((pulled_i[s][l], pulled_t[s][l]))
+            recorded_order = np.lexsort((recorded_i[s][l], recorded_t[s][l]))
+            assert np.array_equal(pulled_i[s][l][pulled_order], recorded_i[s][l][recorded_order])
+            assert np.allclose(pulled_t[s][l][pulled_order], recorded_t[s][l][recorded_order])
+
+
+def test_spike_recording_decode():
+    '''
+    Test spikes set per timestep and from timestep arrays decode identically.
+    '''
+
+    spikes = SpikeRecording([0, 1], ['input', 'output'], [4, 3], 0.5)
+    spikes.set_timestep_spikes(0, 0, [np.array([0, 2], dtype=np.uint32),
+                                      np.array([], dtype=np.uint32),
+                                      np.array([3], dtype=np.uint32),
+                                      np.array([0], dtype=np.uint32)])
+    spikes.set_spikes(0, 'output', [3, 0, 0], [1, 2, 0], 4)
+
+    assert np.array_equal(spikes.spike_i[0][0], [0, 2, 3, 0])
+    assert np.allclose(spikes.spike_t[0][0], [0.0, 0.0, 1.0, 1.5])
+    assert np.array_equal(spikes.spike_i[0][1], [2, 0, 1])
+    assert np.allclose(spikes.spike_t[0][1], [0.0, 0.0, 1.5])
+
+    assert np.array_equal(spikes.get_spike_counts(0, 0), [2, 0, 1, 1])
+    assert np.allclose(spikes.get_rates(0, 'output'), [500.0, 500.0, 500.0])
+
+    counts, edges = spikes.get_histogram(0, 0, 1.0)
+    assert np.array_equal(counts, [2, 2])
+    assert np.allclose(edges, [0.0, 1.0, 2.0])
+
+
+if __name__ == '__main__':
+    test_spike_recording()
+    test_spike_recording_decode()
@@ -0,0 +1,71 @@
+import ctypes
+import os
+import subprocess
+import tempfile
+import numpy as np
+import ml_genn as mlg
+
+from ml_genn.layers import InputLayer, Layer, IFNeurons, SpikeInputNeurons, DenseSynapses
+from ml_genn.stepping import load_step_time_n
+
+
+def test_step_time_n():
+    '''
+    Test native stepping calls the loaded runner's stepTime the requested number of times.
+    '''
+
+    with tempfile.TemporaryDirectory() as path:
+        # Build fake runner which counts timesteps
+        code_path = os.path.join(path, 'test_step_time_n_CODE')
+        os.makedirs(code_path)
+        source_path = os.path.join(path, 'runner.c')
+        with open(source_path, 'w') as f:
+            f.write('unsigned long long iT = 0;\nvoid stepTime(void) { iT++; }\n')
+        subprocess.run(['cc', '-shared', '-fPIC', '-o', os.path.join(code_path, 'librunner.so'),
+                        source_path], check=True)
+
+        # Load runner, as PyGeNN would, and step it natively
+        runner = ctypes.CDLL(os.path.join(code_path, 'librunner.so'))
+        step_time_n = load_step_time_n(path, 'test_step_time_n')
+        assert step_time_n is not None
+
+        step_time_n(1000)
+        assert ctypes.c_ulonglong.in_dll(runner, 'iT').value == 1000
+
+
+def test_step_time():
+    '''
+    Test stepping many timesteps at once matches stepping one timestep at a time.
+    '''
+
+    rng = np.random.default_rng(1234)
+    x = (rng.uniform(size=(1, 8)) < 0.5).astype(np.float32)
+    w = rng.uniform(0.0, 0.5, size=(8, 4)).astype(np.float32)
+
+    inputs = InputLayer('inputs', (8,), neurons=SpikeInputNeurons())
+    outputs = Layer('outputs', neurons=IFNeurons(threshold=1.0))
+    outputs.connect([inputs], [DenseSynapses(4)])
+    outputs.set_weights([w])
+
+    mlg_model = mlg.Model([inputs], [outputs], name='test_step_time')
+    mlg_model.compile()
+    mlg_model.set_input_batch([x])
+
+    # Step one timestep at a time
+    mlg_model.reset()
+    for i in range(20):
+        mlg_model.step_time()
+    assert mlg_model.g_model.timestep == 20
+    scores = outputs.neurons.get_scores(1)
+
+    # Step all timesteps at once
+    mlg_model.reset()
+    mlg_model.step_time(20)
+    assert mlg_model.g_model.timestep == 20
+    assert np.isclose(mlg_model.g_model.t, 20.0)
+    assert np.array_equal(outputs.neurons.get_scores(1), scores)
+
+
+if __name__ == '__main__':
+    test_step_time_n()
+    test_step_time()
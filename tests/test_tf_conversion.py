@@ -262,6 +262,89 @@ def test_functional_tf_conversion():
     assert(isinstance(synapses[0], DenseSynapses))
 
 
+def test_few_spike_branch_pipeline():
+    '''
+    Test pipeline stages and delays of FewSpike model with branches of different depth.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    # TensorFlow model
+    inputs =  layers.Input(shape=(4,), name='inputs')
+
+    short =   layers.Dense(4, activation='relu', use_bias=False, name='short')(inputs)
+    long1 =   layers.Dense(4, activation='relu', use_bias=False, name='long1')(inputs)
+    long2 =   layers.Dense(4, activation='relu', use_bias=False, name='long2')(long1)
+    add =     layers.add([short, long2])
+
+    outputs = layers.Dense(2, activation='relu', use_bias=False, name='outputs')(add)
+
+    tf_model = models.Model(inputs, outputs, name='test_few_spike_branch_pipeline')
+
+    # ML GeNN model
+    mlg_model = mlg.Model.convert_tf_model(tf_model, converter=mlg.converters.FewSpike(K=8))
+
+    # Pipeline depth is set by the longest branch
+    assert(mlg_model.calc_pipeline_depth() == 2)
+
+    # Synapses from shorter branch are delayed by one presentation
+    delays = {s.source().name: s.delay for s in mlg_model.outputs[0].upstream_synapses}
+    assert(delays == {'short': 8, 'long2': 0})
+
+
+def test_few_spike_branch_accuracy():
+    '''
+    Test pipelined FewSpike model with branches of different depth matches TensorFlow.
+    '''
+
+    for gpu in tf.config.experimental.list_physical_devices('GPU'):
+        tf.config.experimental.set_memory_growth(gpu, True)
+
+    rng = np.random.default_rng(1234)
+    x = rng.uniform(0.0, 1.0, size=(20, 4)).astype(np.float32)
+
+    # TensorFlow model
+    inputs =  layers.Input(shape=(4,), name='inputs')
+
+    short =   layers.Dense(8, activation='relu', use_bias=False, name='short')(inputs)
+    long1 =   layers.Dense(8, activation='relu', use_bias=False, name='long1')(inputs)
+    long2 =   layers.Dense(8, activation='relu', use_bias=False, name='long2')(long1)
+    add =     layers.add([short, long2])
+
+    outputs = layers.Dense(3, use_bias=False, name='outputs')(add)
+
+    tf_model = models.Model(inputs, outputs, name='test_few_spike_branch_accuracy')
+
+    # Give branches very different ranges of activation
+    tf_model.get_layer('short').set_weights([rng.uniform(0.0, 2.0, size=(4, 8))])
+    tf_model.get_layer('long1').set_weights([rng.uniform(0.0, 0.5, size=(4, 8))])
+    tf_model.get_layer('long2').set_weights([rng.uniform(0.0, 0.5, size=(8, 8))])
+    tf_model.get_layer('outputs').set_weights([rng.uniform(-1.0, 1.0, size=(8, 3))])
+    tf_out = tf_model.predict(x)
+
+    # ML GeNN model with alphas calculated from normalisation data
+    mlg_model = mlg.Model.convert_tf_model(
+        tf_model, converter=mlg.converters.FewSpike(K=10, norm_data=[x]),
+        dt=1.0, batch_size=4)
+
+    # Layers feeding the same layer share alpha
+    mlg_layers = {l.name: l for l in mlg_model.layers}
+    assert(mlg_layers['short'].neurons.alpha == mlg_layers['long2'].neurons.alpha)
+    assert(mlg_layers['short'].neurons.alpha > mlg_layers['long1'].neurons.alpha)
+
+    # Outputs and predictions should match TensorFlow, other than where
+    # the top two outputs are within the precision of the FewSpike code
+    predictions, scores = mlg_model.predict([x], 10.0)
+    assert(np.allclose(scores[0], tf_out, atol=0.15))
+
+    top_two = np.sort(tf_out, axis=1)[:, -2:]
+    decisive = (top_two[:, 1] - top_two[:, 0]) > 0.3
+    assert(np.array_equal(predictions[0][decisive], tf_out.argmax(axis=1)[decisive]))
+
+
 if __name__ == '__main__':
     test_sequential_tf_conversion()
     test_functional_tf_conversion()
+    test_few_spike_branch_pipeline()
+    test_few_spike_branch_accuracy()